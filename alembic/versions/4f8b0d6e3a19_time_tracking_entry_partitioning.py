@@ -0,0 +1,106 @@
+"""time tracking entry partitioning
+
+Revision ID: 4f8b0d6e3a19
+Revises: e2a7c9d41b85
+Create Date: 2026-10-19 17:03:21.648102
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f8b0d6e3a19'
+down_revision: Union[str, Sequence[str], None] = 'e2a7c9d41b85'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Partitioning is PostgreSQL-only, SQLite keeps the plain table.
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_time_tracking_entry_task_id_employee_id', table_name='time_tracking_entry')
+    op.drop_index('ix_time_tracking_entry_created_at', table_name='time_tracking_entry')
+    op.rename_table('time_tracking_entry', 'time_tracking_entry_old')
+    op.execute('ALTER TABLE time_tracking_entry_old RENAME CONSTRAINT time_tracking_entry_pkey TO time_tracking_entry_old_pkey')
+    op.execute('ALTER SEQUENCE time_tracking_entry_id_seq OWNED BY NONE')
+
+    op.execute(
+        """
+        CREATE TABLE time_tracking_entry (
+            id INTEGER NOT NULL DEFAULT nextval('time_tracking_entry_id_seq'),
+            task_id INTEGER NOT NULL REFERENCES task (id) ON DELETE CASCADE,
+            employee_id INTEGER NOT NULL REFERENCES employee (id) ON DELETE CASCADE,
+            duration_minutes INTEGER NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            CONSTRAINT time_tracking_entry_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute('ALTER SEQUENCE time_tracking_entry_id_seq OWNED BY time_tracking_entry.id')
+    op.create_index('ix_time_tracking_entry_task_id_employee_id', 'time_tracking_entry', ['task_id', 'employee_id'])
+    op.create_index('ix_time_tracking_entry_created_at', 'time_tracking_entry', ['created_at'])
+
+    first = bind.execute(sa.text('SELECT min(created_at) FROM time_tracking_entry_old')).scalar()
+    month = (first.date() if first else date.today()).replace(day=1)
+    last = add_months(date.today().replace(day=1), MONTHS_AHEAD)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE time_tracking_entry_y{month.year:04d}m{month.month:02d} "
+            f"PARTITION OF time_tracking_entry "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+        )
+        month = add_months(month, 1)
+    op.execute('CREATE TABLE time_tracking_entry_default PARTITION OF time_tracking_entry DEFAULT')
+
+    op.execute(
+        'INSERT INTO time_tracking_entry (id, task_id, employee_id, duration_minutes, created_at) '
+        'SELECT id, task_id, employee_id, duration_minutes, created_at FROM time_tracking_entry_old'
+    )
+    op.drop_table('time_tracking_entry_old')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.rename_table('time_tracking_entry', 'time_tracking_entry_partitioned')
+    op.execute('ALTER TABLE time_tracking_entry_partitioned RENAME CONSTRAINT time_tracking_entry_pkey TO time_tracking_entry_partitioned_pkey')
+    op.drop_index('ix_time_tracking_entry_task_id_employee_id', table_name='time_tracking_entry_partitioned')
+    op.drop_index('ix_time_tracking_entry_created_at', table_name='time_tracking_entry_partitioned')
+    op.execute('ALTER SEQUENCE time_tracking_entry_id_seq OWNED BY NONE')
+
+    op.create_table('time_tracking_entry',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('time_tracking_entry_id_seq')"), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('duration_minutes', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['employee_id'], ['employee.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['task_id'], ['task.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute('ALTER SEQUENCE time_tracking_entry_id_seq OWNED BY time_tracking_entry.id')
+    op.create_index('ix_time_tracking_entry_task_id_employee_id', 'time_tracking_entry', ['task_id', 'employee_id'])
+    op.create_index('ix_time_tracking_entry_created_at', 'time_tracking_entry', ['created_at'])
+    op.execute(
+        'INSERT INTO time_tracking_entry (id, task_id, employee_id, duration_minutes, created_at) '
+        'SELECT id, task_id, employee_id, duration_minutes, created_at FROM time_tracking_entry_partitioned'
+    )
+    op.execute('DROP TABLE time_tracking_entry_partitioned CASCADE')
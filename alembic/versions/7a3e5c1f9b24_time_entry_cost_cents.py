@@ -0,0 +1,140 @@
+"""time entry cost cents and salary rate history
+
+Revision ID: 7a3e5c1f9b24
+Revises: 4f8b0d6e3a19
+Create Date: 2026-10-19 19:26:09.571930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a3e5c1f9b24'
+down_revision: Union[str, Sequence[str], None] = '4f8b0d6e3a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def create_aggregate_tables(cost_type: sa.types.TypeEngine, cost_suffix: str) -> None:
+    op.create_table('project_cost_rollup',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('total_minutes', sa.Integer(), nullable=False),
+    sa.Column(f'total_cost{cost_suffix}', cost_type, nullable=False),
+    sa.Column('entry_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['project.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id')
+    )
+    op.create_table('time_tracking_daily_bucket',
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('total_minutes', sa.Integer(), nullable=False),
+    sa.Column(f'total_cost{cost_suffix}', cost_type, nullable=False),
+    sa.Column('entry_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['employee_id'], ['employee.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['task_id'], ['task.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('employee_id', 'task_id', 'day')
+    )
+    op.create_index('ix_time_tracking_daily_bucket_day', 'time_tracking_daily_bucket', ['day'])
+    op.create_table('time_tracking_bucket_delta',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('minutes', sa.Integer(), nullable=False),
+    sa.Column(f'cost{cost_suffix}', cost_type, nullable=False),
+    sa.Column('entry_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['employee_id'], ['employee.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['task_id'], ['task.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def drop_aggregate_tables() -> None:
+    op.drop_table('time_tracking_bucket_delta')
+    op.drop_index('ix_time_tracking_daily_bucket_day', table_name='time_tracking_daily_bucket')
+    op.drop_table('time_tracking_daily_bucket')
+    op.drop_table('project_cost_rollup')
+
+
+def fill_aggregate_tables(cost_expression: str, cost_suffix: str, cost_join: str) -> None:
+    op.execute(
+        f"""
+        INSERT INTO project_cost_rollup (project_id, total_minutes, total_cost{cost_suffix}, entry_count)
+        SELECT task.project_id, SUM(time_tracking_entry.duration_minutes), SUM({cost_expression}), COUNT(*)
+        FROM time_tracking_entry
+        JOIN task ON time_tracking_entry.task_id = task.id
+        {cost_join}
+        GROUP BY task.project_id
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO time_tracking_daily_bucket
+            (employee_id, task_id, day, total_minutes, total_cost{cost_suffix}, entry_count)
+        SELECT time_tracking_entry.employee_id,
+               time_tracking_entry.task_id,
+               date(time_tracking_entry.created_at),
+               SUM(time_tracking_entry.duration_minutes),
+               SUM({cost_expression}),
+               COUNT(*)
+        FROM time_tracking_entry
+        {cost_join}
+        GROUP BY time_tracking_entry.employee_id, time_tracking_entry.task_id, date(time_tracking_entry.created_at)
+        """
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('employee_salary_rate',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('salary_per_hour', sa.Float(), nullable=False),
+    sa.Column('effective_from', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['employee_id'], ['employee.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_employee_salary_rate_employee_id_effective_from', 'employee_salary_rate', ['employee_id', 'effective_from']
+    )
+    # Earlier rates are unknown, the current one is taken as effective since the employee was created
+    op.execute(
+        'INSERT INTO employee_salary_rate (employee_id, salary_per_hour, effective_from) '
+        'SELECT id, salary_per_hour, created_at FROM employee'
+    )
+
+    op.add_column('time_tracking_entry', sa.Column('cost_cents', sa.BigInteger(), server_default='0', nullable=False))
+    op.execute(
+        """
+        UPDATE time_tracking_entry SET cost_cents = CAST(ROUND(
+            time_tracking_entry.duration_minutes * 100 / 60.0
+            * (SELECT employee.salary_per_hour FROM employee WHERE employee.id = time_tracking_entry.employee_id)
+        ) AS BIGINT)
+        """
+    )
+    with op.batch_alter_table('time_tracking_entry') as batch_op:
+        batch_op.alter_column('cost_cents', server_default=None)
+
+    drop_aggregate_tables()
+    create_aggregate_tables(sa.BigInteger(), '_cents')
+    fill_aggregate_tables('time_tracking_entry.cost_cents', '_cents', '')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_aggregate_tables()
+    create_aggregate_tables(sa.Float(), '')
+    fill_aggregate_tables(
+        '(time_tracking_entry.duration_minutes / 60.0) * employee.salary_per_hour',
+        '',
+        'JOIN employee ON time_tracking_entry.employee_id = employee.id',
+    )
+
+    with op.batch_alter_table('time_tracking_entry') as batch_op:
+        batch_op.drop_column('cost_cents')
+    op.drop_index('ix_employee_salary_rate_employee_id_effective_from', table_name='employee_salary_rate')
+    op.drop_table('employee_salary_rate')
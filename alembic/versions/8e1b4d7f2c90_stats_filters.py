@@ -0,0 +1,56 @@
+"""stats filters
+
+Revision ID: 8e1b4d7f2c90
+Revises: d3c8a5e27f61
+Create Date: 2026-10-20 14:21:47.310582
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e1b4d7f2c90'
+down_revision: Union[str, Sequence[str], None] = 'd3c8a5e27f61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE_JOB = sa.text("status IN ('queued', 'running')")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Employee-filtered stats over a date range
+    op.create_index(
+        'ix_time_tracking_entry_employee_id_created_at', 'time_tracking_entry', ['employee_id', 'created_at']
+    )
+
+    op.add_column('report_job', sa.Column('start_date', sa.Date(), nullable=True))
+    op.add_column('report_job', sa.Column('end_date', sa.Date(), nullable=True))
+
+    # Unbounded ranges are NULL, coalesce them so whole-history jobs are still deduplicated
+    op.drop_index('ux_report_job_active', table_name='report_job')
+    op.create_index(
+        'ux_report_job_active', 'report_job',
+        [
+            'company_id', 'report_type', 'data_version',
+            sa.text("coalesce(start_date, '0001-01-01')"), sa.text("coalesce(end_date, '0001-01-01')"),
+        ],
+        unique=True, postgresql_where=ACTIVE_JOB, sqlite_where=ACTIVE_JOB,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ux_report_job_active', table_name='report_job')
+    with op.batch_alter_table('report_job') as batch_op:
+        batch_op.drop_column('end_date')
+        batch_op.drop_column('start_date')
+    op.create_index(
+        'ux_report_job_active', 'report_job', ['company_id', 'report_type', 'data_version'],
+        unique=True, postgresql_where=ACTIVE_JOB, sqlite_where=ACTIVE_JOB,
+    )
+
+    op.drop_index('ix_time_tracking_entry_employee_id_created_at', table_name='time_tracking_entry')
@@ -0,0 +1,48 @@
+"""project cost rollup
+
+Revision ID: 9d4f1a7c2e60
+Revises: 5b8e2c41d7a3
+Create Date: 2026-10-19 12:40:05.118734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4f1a7c2e60'
+down_revision: Union[str, Sequence[str], None] = '5b8e2c41d7a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('project_cost_rollup',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('total_minutes', sa.Integer(), nullable=False),
+    sa.Column('total_cost', sa.Float(), nullable=False),
+    sa.Column('entry_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['project.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id')
+    )
+    op.execute(
+        """
+        INSERT INTO project_cost_rollup (project_id, total_minutes, total_cost, entry_count)
+        SELECT task.project_id,
+               SUM(time_tracking_entry.duration_minutes),
+               SUM((time_tracking_entry.duration_minutes / 60.0) * employee.salary_per_hour),
+               COUNT(*)
+        FROM time_tracking_entry
+        JOIN employee ON time_tracking_entry.employee_id = employee.id
+        JOIN task ON time_tracking_entry.task_id = task.id
+        GROUP BY task.project_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('project_cost_rollup')
@@ -0,0 +1,33 @@
+"""company data version
+
+Revision ID: b6d1f08e4c37
+Revises: 7a3e5c1f9b24
+Create Date: 2026-10-19 21:44:52.120378
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d1f08e4c37'
+down_revision: Union[str, Sequence[str], None] = '7a3e5c1f9b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('company_data_version',
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['company_id'], ['company.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('company_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('company_data_version')
@@ -0,0 +1,39 @@
+"""open task indexes
+
+Revision ID: c4b8d2f6a317
+Revises: a6f3e9b27d14
+Create Date: 2026-10-24 09:41:18.530912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4b8d2f6a317'
+down_revision: Union[str, Sequence[str], None] = 'a6f3e9b27d14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN_TASK = sa.text("status NOT IN ('done', 'canceled')")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Open-only task lists (/my_tasks, project tasks) never walk closed tasks
+    op.create_index(
+        'ix_task_assignee_user_id_open', 'task', ['assignee_user_id', sa.text('id DESC')],
+        postgresql_where=OPEN_TASK, sqlite_where=OPEN_TASK,
+    )
+    op.create_index(
+        'ix_task_project_id_open', 'task', ['project_id', sa.text('id DESC')],
+        postgresql_where=OPEN_TASK, sqlite_where=OPEN_TASK,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_project_id_open', table_name='task')
+    op.drop_index('ix_task_assignee_user_id_open', table_name='task')
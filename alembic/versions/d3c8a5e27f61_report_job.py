@@ -0,0 +1,53 @@
+"""report job
+
+Revision ID: d3c8a5e27f61
+Revises: b6d1f08e4c37
+Create Date: 2026-10-20 10:08:33.904125
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3c8a5e27f61'
+down_revision: Union[str, Sequence[str], None] = 'b6d1f08e4c37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE_JOB = sa.text("status IN ('queued', 'running')")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('report_job',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.Column('report_type', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('data_version', sa.BigInteger(), nullable=False),
+    sa.Column('requested_by_tg_id', sa.BigInteger(), nullable=False),
+    sa.Column('chat_id', sa.BigInteger(), nullable=False),
+    sa.Column('progress_message_id', sa.BigInteger(), nullable=True),
+    sa.Column('rows_done', sa.Integer(), nullable=False),
+    sa.Column('error', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['company_id'], ['company.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_report_job_status_id', 'report_job', ['status', 'id'])
+    op.create_index(
+        'ux_report_job_active', 'report_job', ['company_id', 'report_type', 'data_version'],
+        unique=True, postgresql_where=ACTIVE_JOB, sqlite_where=ACTIVE_JOB,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ux_report_job_active', table_name='report_job')
+    op.drop_index('ix_report_job_status_id', table_name='report_job')
+    op.drop_table('report_job')
@@ -0,0 +1,67 @@
+"""time tracking daily bucket
+
+Revision ID: e2a7c9d41b85
+Revises: 9d4f1a7c2e60
+Create Date: 2026-10-19 15:12:47.302611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7c9d41b85'
+down_revision: Union[str, Sequence[str], None] = '9d4f1a7c2e60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('time_tracking_daily_bucket',
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('total_minutes', sa.Integer(), nullable=False),
+    sa.Column('total_cost', sa.Float(), nullable=False),
+    sa.Column('entry_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['employee_id'], ['employee.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['task_id'], ['task.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('employee_id', 'task_id', 'day')
+    )
+    op.create_index('ix_time_tracking_daily_bucket_day', 'time_tracking_daily_bucket', ['day'])
+    op.create_table('time_tracking_bucket_delta',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('minutes', sa.Integer(), nullable=False),
+    sa.Column('cost', sa.Float(), nullable=False),
+    sa.Column('entry_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['employee_id'], ['employee.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['task_id'], ['task.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(
+        """
+        INSERT INTO time_tracking_daily_bucket (employee_id, task_id, day, total_minutes, total_cost, entry_count)
+        SELECT time_tracking_entry.employee_id,
+               time_tracking_entry.task_id,
+               date(time_tracking_entry.created_at),
+               SUM(time_tracking_entry.duration_minutes),
+               SUM((time_tracking_entry.duration_minutes / 60.0) * employee.salary_per_hour),
+               COUNT(*)
+        FROM time_tracking_entry
+        JOIN employee ON time_tracking_entry.employee_id = employee.id
+        GROUP BY time_tracking_entry.employee_id, time_tracking_entry.task_id, date(time_tracking_entry.created_at)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('time_tracking_bucket_delta')
+    op.drop_index('ix_time_tracking_daily_bucket_day', table_name='time_tracking_daily_bucket')
+    op.drop_table('time_tracking_daily_bucket')
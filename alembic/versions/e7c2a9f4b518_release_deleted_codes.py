@@ -0,0 +1,53 @@
+"""release deleted codes
+
+Revision ID: e7c2a9f4b518
+Revises: c4b8d2f6a317
+Create Date: 2026-10-25 11:20:43.907215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c2a9f4b518'
+down_revision: Union[str, Sequence[str], None] = 'c4b8d2f6a317'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LIVE = sa.text("deleted_at IS NULL")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Codes of deleted companies and projects are free again before the purger removes the rows
+    op.drop_constraint('company_code_key', 'company', type_='unique')
+    op.create_index('ux_company_code', 'company', ['code'], unique=True, postgresql_where=LIVE, sqlite_where=LIVE)
+    op.drop_constraint('project_code_key', 'project', type_='unique')
+    op.create_index('ux_project_code', 'project', ['code'], unique=True, postgresql_where=LIVE, sqlite_where=LIVE)
+
+    op.alter_column('company_shard', 'code', existing_type=sa.String(length=3), nullable=True)
+    op.execute(
+        "UPDATE company_shard SET code = NULL "
+        "WHERE company_id IN (SELECT id FROM company WHERE deleted_at IS NOT NULL)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fails while a deleted company or project shares its code with a live one: purge first
+    op.execute(
+        "UPDATE company_shard SET code = "
+        "(SELECT company.code FROM company WHERE company.id = company_shard.company_id) "
+        "WHERE code IS NULL"
+    )
+    # Deleted companies of other shards are only purged there, their entries are no longer needed
+    op.execute("DELETE FROM company_shard WHERE code IS NULL")
+    op.alter_column('company_shard', 'code', existing_type=sa.String(length=3), nullable=False)
+
+    op.drop_index('ux_project_code', table_name='project')
+    op.create_unique_constraint('project_code_key', 'project', ['code'])
+    op.drop_index('ux_company_code', table_name='company')
+    op.create_unique_constraint('company_code_key', 'company', ['code'])
@@ -0,0 +1,41 @@
+"""company shard
+
+Revision ID: f5a2c8e3d416
+Revises: 8e1b4d7f2c90
+Create Date: 2026-10-21 10:12:36.451920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5a2c8e3d416'
+down_revision: Union[str, Sequence[str], None] = '8e1b4d7f2c90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('company_shard',
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.Column('code', sa.String(length=3), nullable=False),
+    sa.Column('shard', sa.String(length=64), nullable=False),
+    sa.PrimaryKeyConstraint('company_id'),
+    sa.UniqueConstraint('code')
+    )
+    # Existing companies stay on the default shard, new ids continue after theirs
+    op.execute("INSERT INTO company_shard (company_id, code, shard) SELECT id, code, 'default' FROM company")
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            "SELECT setval(pg_get_serial_sequence('company_shard', 'company_id'), "
+            "COALESCE((SELECT max(company_id) FROM company_shard), 0) + 1, false)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('company_shard')
@@ -1,36 +1,113 @@
-from sqlalchemy import select
+from datetime import datetime
+from typing import Sequence
+
+from sqlalchemy import and_, select
 
 from app.core.crud_base import CrudBase
 from app.core.repo_base import RepoBase
 from app.core.serializer import Serializer, DataclassSerializer
 from app.core.types import DTO, PageData, PaginationParameters
 from app.company.models import Company
-from app.company.tables import company_table
+from app.company.tables import company_data_version_table, company_table
+from app.project.tables import project_table
+from app.task.tables import task_table
 from app.company.exceptions import CompanyAlreadyExistsError, CompanyNotFoundError
-from app.core.database import database
 
 
 class CompanyCrud(CrudBase[int, DTO]):
+    """Companies live on their own shard, their ids are handed out by the shard directory."""
     table = company_table
+    deleted_column = "deleted_at"
+
+    async def get_by_id(self, id_: int) -> DTO | None:
+        await self.shards.use_company(id_)
+        return await super().get_by_id(id_)
+
+    async def create(self, obj: DTO) -> int:
+        company_id = await self.shards.register_company(obj["code"])
+        try:
+            await super().create({**obj, "id": company_id})
+        except Exception:
+            await self.shards.forget_company(company_id)
+            raise
+        return company_id
+
+    async def delete(self, id_: int) -> None:
+        await self.shards.use_company(id_)
+        await super().delete(id_)
+        await self.shards.forget_company(id_)
+
+    async def mark_deleted(self, id_: int) -> None:
+        """Hides the company and its projects, which hides their tasks and statistics as well, and frees its code."""
+        await self.shards.use_company(id_)
+        projects = (
+            project_table.update()
+            .where(and_(project_table.c.company_id == id_, project_table.c.deleted_at.is_(None)))
+            .values(deleted_at=datetime.now())
+        )
+        self.log_query(projects)
+        async with self.database.transaction():
+            await self.database.execute(projects)
+            await super().mark_deleted(id_)
+        await self.shards.release_company_code(id_)
 
     async def get_by_code(self, code: str) -> DTO | None:
-        query = select(self.table).where(self.table.c.code == code)
-        return await database.fetch_one(query)
+        await self.shards.use_company_code(code)
+        query = self.exclude_deleted(select(self.table).where(self.table.c.code == code))
+        return await self.database.fetch_one(query)
 
     async def get_by_owner_tg_id(
-        self, owner_tg_id: int, pagination: PaginationParameters | None = None
+        self,
+        owner_tg_id: int,
+        pagination: PaginationParameters | None = None,
+        columns: Sequence[str] | None = None,
     ) -> PageData[DTO]:
         filters = {"owner_tg_id": owner_tg_id}
-        return await self.get_page(filters=filters, pagination=pagination)
+        return await self.get_page_across_shards(filters=filters, pagination=pagination, columns=columns)
+
+
+class CompanyDataVersionCrud(CrudBase[int, DTO]):
+    """Counter bumped on every change that affects a company's statistics."""
+    table = company_data_version_table
+
+    async def get_version(self, company_id: int) -> int:
+        await self.shards.use_company(company_id)
+        query = select(self.table.c.version).where(self.table.c.company_id == company_id)
+        self.log_query(query)
+        # Read where the stats are read, so a replica never pairs a newer version with older rows.
+        return await self.database.reader().fetch_val(query) or 0
+
+    async def bump(self, company_id) -> None:
+        if isinstance(company_id, int):
+            await self.shards.use_company(company_id)
+        await self.upsert_increment({"company_id": company_id}, {"version": 1})
+
+    async def bump_for_project(self, project_id: int) -> None:
+        company_id = select(project_table.c.company_id).where(project_table.c.id == project_id)
+        await self.bump(company_id.scalar_subquery())
+
+    async def bump_for_task(self, task_id: int) -> None:
+        company_id = (
+            select(project_table.c.company_id)
+            .select_from(task_table.join(project_table, task_table.c.project_id == project_table.c.id))
+            .where(task_table.c.id == task_id)
+        )
+        await self.bump(company_id.scalar_subquery())
 
 
 class CompanyRepo(RepoBase[int, Company]):
     crud: CompanyCrud
 
-    def __init__(self, crud: CompanyCrud, serializer: Serializer[Company, DTO]):
+    def __init__(
+        self,
+        crud: CompanyCrud,
+        serializer: Serializer[Company, DTO],
+        data_version_crud: CompanyDataVersionCrud | None = None,
+    ):
         super().__init__(crud, serializer, Company)
         self.not_found_exception_cls = CompanyNotFoundError
         self.unique_violation_exception_cls = CompanyAlreadyExistsError
+        self.data_version_crud = data_version_crud or CompanyDataVersionCrud()
 
     async def get_by_code(self, code: str) -> Company | None:
         dto = await self.crud.get_by_code(code)
@@ -38,14 +115,26 @@ class CompanyRepo(RepoBase[int, Company]):
             return None
         return self.serializer.deserialize(dto)
 
-    async def get_by_owner_tg_id(
-        self, owner_tg_id: int, pagination: PaginationParameters | None = None
-    ) -> PageData[Company]:
-        page_data = await self.crud.get_by_owner_tg_id(owner_tg_id, pagination)
-        return PageData(
-            data=list(self.serializer.flat.deserialize(page_data.data)),
-            total=page_data.total,
-        )
+    async def get_by_owner_tg_id[M](
+        self,
+        owner_tg_id: int,
+        pagination: PaginationParameters | None = None,
+        read_model: type[M] | None = None,
+    ) -> PageData[Company] | PageData[M]:
+        page_data = await self.crud.get_by_owner_tg_id(owner_tg_id, pagination, self.projection(read_model))
+        return self.deserialize_page(page_data, read_model)
+
+    async def get_data_version(self, company_id: int) -> int:
+        return await self.data_version_crud.get_version(company_id)
+
+    async def bump_data_version(self, company_id: int) -> None:
+        await self.data_version_crud.bump(company_id)
+
+    async def bump_data_version_for_project(self, project_id: int) -> None:
+        await self.data_version_crud.bump_for_project(project_id)
+
+    async def bump_data_version_for_task(self, task_id: int) -> None:
+        await self.data_version_crud.bump_for_task(task_id)
 
 
 company_repo = CompanyRepo(CompanyCrud(), DataclassSerializer(Company))
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from datetime import datetime
 
 from app.core.models import Entity
 
@@ -8,3 +9,11 @@ class Company(Entity):
     name: str
     code: str
     owner_tg_id: int
+    deleted_at: datetime | None = None
+
+
+@dataclass(kw_only=True)
+class CompanyListItem(Entity):
+    """Columns shown in company lists."""
+    code: str
+    name: str
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+
+from sqlalchemy import Table, select, tuple_
+
+from app.company.relocation import company_rows, of_tasks
+from app.company.tables import company_table
+from app.core.database import get_database, metadata
+from app.core.settings import settings
+from app.core.sharding import get_shard_map
+from app.project.tables import project_table
+from app.task.tables import task_archive_table, task_deadline_reminder_table, task_table
+from app.time_tracking.tables import (
+    project_cost_rollup_table,
+    time_tracking_bucket_delta_table,
+    time_tracking_daily_bucket_table,
+    time_tracking_entry_archive_table,
+    time_tracking_entry_table,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def project_rows(project_id: int) -> dict[Table, object]:
+    """The condition selecting the rows of every table that belong to the project."""
+    tasks = select(task_table.c.id).where(task_table.c.project_id == project_id)
+    archived_tasks = select(task_archive_table.c.id).where(task_archive_table.c.project_id == project_id)
+    return {
+        project_table: project_table.c.id == project_id,
+        project_cost_rollup_table: project_cost_rollup_table.c.project_id == project_id,
+        task_table: task_table.c.project_id == project_id,
+        task_archive_table: task_archive_table.c.project_id == project_id,
+        task_deadline_reminder_table: task_deadline_reminder_table.c.task_id.in_(tasks),
+        time_tracking_bucket_delta_table: of_tasks(time_tracking_bucket_delta_table, tasks, archived_tasks),
+        time_tracking_daily_bucket_table: of_tasks(time_tracking_daily_bucket_table, tasks, archived_tasks),
+        time_tracking_entry_table: time_tracking_entry_table.c.task_id.in_(tasks),
+        time_tracking_entry_archive_table: time_tracking_entry_archive_table.c.task_id.in_(archived_tasks),
+    }
+
+
+class DeletedDataPurger:
+    """Removes the rows of deleted companies and projects in small batches.
+
+    Deleting only sets ``deleted_at``, which hides the company or project right away. The
+    purger then deletes its rows children first (time entries, then tasks, then projects),
+    at most ``batch_size`` rows per statement with ``batch_pause`` seconds between
+    statements, so no transaction holds many locks. Nothing but the remaining rows records
+    the progress: after a crash the next run simply continues with what is left.
+    """
+
+    def __init__(self, batch_size: int = 1000, batch_pause: float = 0.1):
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+
+    async def purge(self) -> dict[str, int]:
+        """Purges everything deleted on the current shard, returns the rows removed per table."""
+        database = get_database()
+        purged: dict[str, int] = {}
+        deleted_projects = select(project_table.c.id).where(project_table.c.deleted_at.is_not(None))
+        for row in await database.primary.fetch_all(deleted_projects.order_by(project_table.c.id)):
+            self._add(purged, await self.purge_rows(project_rows(row["id"]), f"project {row['id']}"))
+
+        deleted_companies = select(company_table.c.id).where(company_table.c.deleted_at.is_not(None))
+        for row in await database.primary.fetch_all(deleted_companies.order_by(company_table.c.id)):
+            self._add(purged, await self.purge_rows(company_rows(row["id"]), f"company {row['id']}"))
+            await get_shard_map().forget_company(row["id"])
+        return purged
+
+    async def purge_rows(self, conditions: dict[Table, object], label: str) -> dict[str, int]:
+        tables = [table for table in reversed(metadata.sorted_tables) if table in conditions]
+        purged = {}
+        for table in tables:
+            purged[table.name] = 0
+            while True:
+                deleted = await self._delete_batch(table, conditions[table])
+                purged[table.name] += deleted
+                if deleted < self.batch_size:
+                    break
+                logger.info("Purging %s: %s rows of %s deleted so far", label, purged[table.name], table.name)
+                await asyncio.sleep(self.batch_pause)
+        logger.info("Purged %s: %s", label, {name: count for name, count in purged.items() if count})
+        return purged
+
+    async def _delete_batch(self, table: Table, condition) -> int:
+        primary_key = list(table.primary_key.columns)
+        key = primary_key[0] if len(primary_key) == 1 else tuple_(*primary_key)
+        batch = select(*primary_key).where(condition).limit(self.batch_size)
+        query = table.delete().where(key.in_(batch)).returning(primary_key[0])
+        return len(await get_database().primary.fetch_all(query))
+
+    @staticmethod
+    def _add(total: dict[str, int], purged: dict[str, int]) -> None:
+        for name, count in purged.items():
+            total[name] = total.get(name, 0) + count
+
+
+deleted_data_purger = DeletedDataPurger(settings.PURGE_BATCH_SIZE, settings.PURGE_BATCH_PAUSE_SECONDS)
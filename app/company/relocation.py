@@ -0,0 +1,100 @@
+import logging
+
+from sqlalchemy import Table, or_, select
+
+from app.company.tables import company_data_version_table, company_table
+from app.core.database import DatabaseRouter, metadata
+from app.core.settings import settings
+from app.core.sharding import ShardMap, get_shard_map
+from app.employee.tables import employee_salary_rate_table, employee_table
+from app.project.tables import project_table
+from app.report.tables import report_job_table
+from app.task.tables import task_archive_table, task_deadline_reminder_table, task_table
+from app.time_tracking.tables import (
+    project_cost_rollup_table,
+    time_tracking_bucket_delta_table,
+    time_tracking_daily_bucket_table,
+    time_tracking_entry_archive_table,
+    time_tracking_entry_table,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def company_rows(company_id: int) -> dict[Table, object]:
+    """The condition selecting the rows of every table that belong to the company."""
+    projects = select(project_table.c.id).where(project_table.c.company_id == company_id)
+    employees = select(employee_table.c.id).where(employee_table.c.company_id == company_id)
+    tasks = select(task_table.c.id).where(task_table.c.project_id.in_(projects))
+    archived_tasks = select(task_archive_table.c.id).where(task_archive_table.c.project_id.in_(projects))
+    return {
+        company_table: company_table.c.id == company_id,
+        company_data_version_table: company_data_version_table.c.company_id == company_id,
+        employee_table: employee_table.c.company_id == company_id,
+        project_table: project_table.c.company_id == company_id,
+        report_job_table: report_job_table.c.company_id == company_id,
+        employee_salary_rate_table: employee_salary_rate_table.c.employee_id.in_(employees),
+        project_cost_rollup_table: project_cost_rollup_table.c.project_id.in_(projects),
+        task_table: task_table.c.project_id.in_(projects),
+        task_archive_table: task_archive_table.c.project_id.in_(projects),
+        task_deadline_reminder_table: task_deadline_reminder_table.c.task_id.in_(tasks),
+        time_tracking_bucket_delta_table: of_tasks(time_tracking_bucket_delta_table, tasks, archived_tasks),
+        time_tracking_daily_bucket_table: of_tasks(time_tracking_daily_bucket_table, tasks, archived_tasks),
+        time_tracking_entry_table: time_tracking_entry_table.c.task_id.in_(tasks),
+        time_tracking_entry_archive_table: time_tracking_entry_archive_table.c.task_id.in_(archived_tasks),
+    }
+
+
+def of_tasks(table: Table, tasks, archived_tasks):
+    """Rows of ``table`` whose ``task_id`` is one of the hot or archived tasks."""
+    return or_(table.c.task_id.in_(tasks), table.c.task_id.in_(archived_tasks))
+
+
+async def _copy_rows(table: Table, condition, source: DatabaseRouter, target: DatabaseRouter) -> int:
+    copied = 0
+    batch = []
+    async for row in source.primary.iterate(table.select().where(condition)):
+        batch.append(dict(row._mapping))
+        if len(batch) == settings.DB_ITER_FETCH_SIZE:
+            await target.execute(table.insert().values(batch))
+            copied += len(batch)
+            batch = []
+    if batch:
+        await target.execute(table.insert().values(batch))
+        copied += len(batch)
+    return copied
+
+
+async def move_company(company_id: int, target_shard: str, shards: ShardMap | None = None) -> dict[str, int]:
+    """Moves all rows of a company to ``target_shard`` and points the directory at it.
+
+    Rows are copied in one transaction on the target, then the directory is switched and the
+    rows are deleted from the source. Ids are kept, so they have to be free on the target: see
+    ``ShardMap.reserve_ids``. Writes to the company while it moves are not carried over; other
+    processes follow the directory once their shard cache expires.
+
+    Returns the number of rows moved per table.
+    """
+    shards = shards or get_shard_map()
+    target = shards.shard(target_shard)
+    source_shard = await shards.shard_of(company_id)
+    if source_shard == target_shard:
+        return {}
+    source = shards.shard(source_shard)
+    code = await source.primary.fetch_val(select(company_table.c.code).where(company_table.c.id == company_id))
+    if code is None:
+        raise ValueError(f"Company {company_id} is not on shard '{source_shard}'")
+
+    conditions = company_rows(company_id)
+    tables = [table for table in metadata.sorted_tables if table in conditions]
+    moved = {}
+    async with target.transaction():
+        for table in tables:
+            moved[table.name] = await _copy_rows(table, conditions[table], source, target)
+    await shards.assign_company(company_id, code, target_shard)
+
+    async with source.transaction():
+        for table in reversed(tables):
+            await source.execute(table.delete().where(conditions[table]))
+    logger.info("Moved company %s from shard %s to %s: %s", company_id, source_shard, target_shard, moved)
+    return moved
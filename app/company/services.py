@@ -4,7 +4,7 @@ from app.company.exceptions import (
     CompanyNotFoundError,
     InvalidCompanyCodeError,
 )
-from app.company.models import Company
+from app.company.models import Company, CompanyListItem
 from app.core.serializer import DataclassSerializer
 from app.core.types import PageData, PaginationParameters
 
@@ -28,17 +28,30 @@ class CompanyService:
         if company.owner_tg_id != user_tg_id:
             raise CompanyAccessDeniedError("Only company owner can delete the company")
 
-        await self.company_repo.delete(company_id)
+        await self.company_repo.mark_deleted(company_id)
 
     async def get_my_companies(
         self, user_tg_id: int, pagination: PaginationParameters | None = None
-    ) -> PageData[Company]:
-        return await self.company_repo.get_by_owner_tg_id(user_tg_id, pagination)
+    ) -> PageData[CompanyListItem]:
+        return await self.company_repo.get_by_owner_tg_id(user_tg_id, pagination, CompanyListItem)
 
     async def get_company_details(self, company_id: int) -> Company:
         company = await self.company_repo.get_by_id(company_id)
         return company
 
+    async def get_data_version(self, company_id: int) -> int:
+        return await self.company_repo.get_data_version(company_id)
+
+    async def bump_data_version(self, company_id: int) -> None:
+        """Invalidates cached statistics of the company."""
+        await self.company_repo.bump_data_version(company_id)
+
+    async def bump_data_version_for_project(self, project_id: int) -> None:
+        await self.company_repo.bump_data_version_for_project(project_id)
+
+    async def bump_data_version_for_task(self, task_id: int) -> None:
+        await self.company_repo.bump_data_version_for_task(task_id)
+
     async def verify_user_is_owner(self, company_id: int, user_tg_id: int) -> bool:
         try:
             company = await self.company_repo.get_by_id(company_id)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Table, BigInteger
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Table, BigInteger, text
 
 from app.core.database import metadata
 
@@ -7,6 +7,19 @@ company_table = Table(
     metadata,
     Column('id', Integer, primary_key=True),
     Column('name', String, nullable=False),
-    Column('code', String(3), unique=True, nullable=False),
+    Column('code', String(3), nullable=False),
     Column('owner_tg_id', BigInteger, nullable=False),
+    Column('deleted_at', DateTime, nullable=True),
+)
+
+# The code of a deleted company is free again right away, not only once it is purged
+# (migration e7c2a9f4b518).
+Index('ux_company_code', company_table.c.code, unique=True,
+      postgresql_where=text("deleted_at IS NULL"), sqlite_where=text("deleted_at IS NULL"))
+
+company_data_version_table = Table(
+    'company_data_version',
+    metadata,
+    Column('company_id', Integer, ForeignKey('company.id', ondelete='CASCADE'), primary_key=True),
+    Column('version', BigInteger, nullable=False),
 )
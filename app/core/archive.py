@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Table, select, union_all
+from sqlalchemy.sql import Subquery
+
+
+def archive_table(table: Table) -> Table:
+    """``<name>_archive`` with the columns of ``table``, for rows that are no longer changed.
+
+    Only the primary key is kept: archived rows are moved in with their ids and are not
+    protected by foreign keys, so whoever deletes their parents deletes them explicitly.
+    """
+    return Table(
+        f"{table.name}_archive",
+        table.metadata,
+        *(
+            Column(
+                column.name, column.type, primary_key=column.primary_key, nullable=column.nullable, autoincrement=False
+            )
+            for column in table.columns
+        ),
+    )
+
+
+def with_archive(table: Table, archive: Table) -> Subquery:
+    """The rows of ``table`` and of its archive, as one selectable with the same columns."""
+    return union_all(select(table), select(archive)).subquery(f"{table.name}_all")
@@ -1,11 +1,18 @@
+import asyncio
+import heapq
 import logging
 from copy import deepcopy
-from typing import ClassVar, Optional, Sequence
+from datetime import datetime
+from typing import AsyncIterator, Callable, ClassVar, Optional, Sequence
 
-from sqlalchemy import Table, and_, asc, desc, func, select
-from sqlalchemy.dialects import postgresql
+from sqlalchemy import Table, and_, any_, asc, bindparam, desc, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.sql import Executable
 
-from app.core.database import database
+from app.core.database import DatabaseRouter, get_database
+from app.core.settings import settings
+from app.core.sharding import ShardMap, get_shard_map
+from app.core.statements import Statement, statements
 from app.core.types import PageData, PaginationParameters
 
 logger = logging.getLogger(__name__)
@@ -13,6 +20,19 @@ logger = logging.getLogger(__name__)
 
 class CrudBase[ID, DTO]:
     table: ClassVar[Table]
+    # Integer column bumped on every update, for optimistic concurrency control; None opts out.
+    version_column: ClassVar[str | None] = None
+    # Nullable timestamp of a deletion that has not been purged yet; such rows are left out of
+    # every query (see ``live_condition``). None means rows are deleted right away.
+    deleted_column: ClassVar[str | None] = None
+
+    @property
+    def database(self) -> DatabaseRouter:
+        return get_database()
+
+    @property
+    def shards(self) -> ShardMap:
+        return get_shard_map()
 
     @staticmethod
     def log_query(query):
@@ -26,20 +46,38 @@ class CrudBase[ID, DTO]:
             logger.info(str(query))
         logger.info('-' * 50)
 
+    def live_condition(self):
+        """Condition that leaves out deleted rows, ``None`` when nothing is hidden."""
+        if self.deleted_column is None:
+            return None
+        return self.table.c[self.deleted_column].is_(None)
+
+    def exclude_deleted(self, query):
+        condition = self.live_condition()
+        return query if condition is None else query.where(condition)
+
+    @classmethod
+    def statement(cls, name: str, build: Callable[[], Executable]) -> Statement:
+        """Pre-compiled statement for a hot query shape, ``build`` runs once per class."""
+        return statements.get((cls, name), f"{cls.__name__}.{name}", build)
+
     async def get_by_id(self, id_: ID) -> Optional[DTO]:
-        query = self.table.select().where(self.table.c.id == id_)
-        self.log_query(query)
-        return await database.fetch_one(query)
+        if self.shards.needs_lookup():
+            return await self.shards.locate(lambda: self.get_by_id(id_))
+        statement = self.statement(
+            "get_by_id", lambda: self.exclude_deleted(self.table.select().where(self.table.c.id == bindparam("id")))
+        )
+        return await statement.fetch_one(self.database.reader(), id=id_)
 
     async def create(self, obj: DTO) -> ID:
         query = self.table.insert().values(**obj)
         self.log_query(query)
-        return await database.execute(query)
+        return await self.database.execute(query)
 
     async def create_and_get(self, obj: DTO) -> DTO:
         query = self.table.insert().values(**obj).returning(self.table)
         self.log_query(query)
-        return await database.fetch_one(query)
+        return await self.database.fetch_one(query)
 
     async def create_many(self, objs: Sequence[DTO]) -> list[ID]:
         objs = list(objs)
@@ -47,7 +85,7 @@ class CrudBase[ID, DTO]:
             return []
         query = self.table.insert().values(objs).returning(self.table.c.id)
         self.log_query(query)
-        rows = await database.fetch_all(query)
+        rows = await self.database.fetch_all(query)
         return [row[0] for row in rows]
 
     async def create_and_get_many(self, objs: Sequence[DTO]) -> Sequence[DTO]:
@@ -56,64 +94,190 @@ class CrudBase[ID, DTO]:
             return []
         query = self.table.insert().values(objs).returning(self.table)
         self.log_query(query)
-        return await database.fetch_all(query)
+        return await self.database.fetch_all(query)
 
-    async def update(self, values: DTO) -> ID:
-        id_ = values["id"]
-        query = (
-            self.table.update()
-            .where(self.table.c.id == id_)
-            .values(values)
-            .returning(self.table.c.id)
-        )
+    def _update_query(self, values: DTO):
+        """UPDATE of the row ``values["id"]``.
+
+        On versioned tables the row is only written while its version is still the one in
+        ``values``, and the version is bumped. Deleted rows are not written.
+        """
+        query = self.exclude_deleted(self.table.update().where(self.table.c.id == values["id"]))
+        if self.version_column is None or values.get(self.version_column) is None:
+            return query.values(values)
+        version = self.table.c[self.version_column]
+        query = query.where(version == values[self.version_column])
+        return query.values({**values, self.version_column: version + 1})
+
+    async def update(self, values: DTO) -> Optional[ID]:
+        """Rewrites the row, ``None`` when it is missing or its version has moved on."""
+        query = self._update_query(values).returning(self.table.c.id)
         self.log_query(query)
-        row = await database.fetch_one(query)
-        return row[0]
+        row = await self.database.fetch_one(query)
+        return None if row is None else row[0]
 
-    async def update_and_get(self, values: DTO) -> DTO:
-        id_ = values["id"]
-        query = (
-            self.table.update()
-            .where(self.table.c.id == id_)
-            .values(values)
-            .returning(self.table)
+    async def update_and_get(self, values: DTO) -> Optional[DTO]:
+        query = self._update_query(values).returning(self.table)
+        self.log_query(query)
+        return await self.database.fetch_one(query)
+
+    async def patch(self, id_: ID, expected_version: int | None = None, **fields) -> Optional[DTO]:
+        """Sets only ``fields`` on the row and returns it, ``None`` when there is no such (live) row.
+
+        Unlike ``update`` no other column is rewritten. One statement is compiled per set of columns.
+        On versioned tables the version is bumped, and with ``expected_version`` the row is only
+        written while it still has that version (``None`` is returned otherwise).
+        """
+        names = tuple(sorted(fields))
+        checked = expected_version is not None and self.version_column is not None
+
+        def build():
+            query = self.exclude_deleted(self.table.update().where(self.table.c.id == bindparam("id")))
+            values = {name: bindparam(f"set_{name}", type_=self.table.c[name].type) for name in names}
+            if self.version_column is not None:
+                version = self.table.c[self.version_column]
+                values[self.version_column] = version + 1
+                if checked:
+                    query = query.where(version == bindparam("expected_version"))
+            return query.values(values).returning(self.table)
+
+        statement = self.statement(f"patch({', '.join(names)}){' if version' if checked else ''}", build)
+        self.database.pin_primary()
+        values = {f"set_{name}": value for name, value in fields.items()}
+        if checked:
+            values["expected_version"] = expected_version
+        return await statement.fetch_one(self.database.primary, id=id_, **values)
+
+    async def update_many(self, objs: Sequence[DTO]) -> list[Optional[ID]]:
+        return [await self.update(obj) for obj in objs]
+
+    async def upsert_increment(self, key: DTO, deltas: DTO) -> None:
+        dialect_insert = postgresql.insert if self.database.url.dialect == "postgresql" else sqlite.insert
+        query = dialect_insert(self.table).values({**key, **deltas})
+        query = query.on_conflict_do_update(
+            index_elements=list(key),
+            set_={name: self.table.c[name] + query.excluded[name] for name in deltas},
         )
         self.log_query(query)
-        return await database.fetch_one(query)
+        await self.database.execute(query)
 
-    async def update_many(self, objs: Sequence[DTO]) -> None:
-        for obj in objs:
-            await self.update(obj)
+    def _ids_conditions(self, ids: Sequence[ID]) -> list:
+        """Splits ``ids`` into ``IN`` chunks of ``DB_IN_CHUNK_SIZE`` bound parameters.
+
+        Very large sets on PostgreSQL are bound as a single array (``= ANY($1)``) instead.
+        """
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return []
+        if self.database.url.dialect == "postgresql" and len(ids) > settings.DB_ANY_ARRAY_THRESHOLD:
+            array = bindparam("ids", ids, type_=postgresql.ARRAY(self.table.c.id.type))
+            return [self.table.c.id == any_(array)]
+        size = settings.DB_IN_CHUNK_SIZE
+        return [self.table.c.id.in_(ids[start:start + size]) for start in range(0, len(ids), size)]
+
+    def _can_run_concurrently(self, db) -> bool:
+        # Concurrent queries run on separate pooled connections, which SQLite does not have
+        # and which would not see the uncommitted writes of the caller's transaction.
+        return db.url.dialect == "postgresql" and not self.database.in_transaction()
 
     async def get_many_by_ids(self, ids: Sequence[ID]) -> Sequence[DTO]:
-        query = self.table.select().where(self.table.c.id.in_(ids))
-        self.log_query(query)
-        return await database.fetch_all(query)
+        """Rows for ``ids`` in input order; ids without a row are left out."""
+        queries = [
+            self.exclude_deleted(self.table.select().where(condition)) for condition in self._ids_conditions(ids)
+        ]
+        for query in queries:
+            self.log_query(query)
+        reader = self.database.reader()
+        if len(queries) > 1 and self._can_run_concurrently(reader):
+            batches = await asyncio.gather(*(reader.fetch_all(query) for query in queries))
+        else:
+            batches = [await reader.fetch_all(query) for query in queries]
+        rows = {row["id"]: row for batch in batches for row in batch}
+        return [rows[id_] for id_ in ids if id_ in rows]
 
     async def delete(self, id_: ID) -> None:
         query = self.table.delete().where(self.table.c.id == id_)
         self.log_query(query)
-        await database.execute(query)
+        await self.database.execute(query)
 
-    async def delete_many(self, ids: Sequence[ID]) -> None:
-        query = self.table.delete().where(self.table.c.id.in_(ids))
+    async def mark_deleted(self, id_: ID) -> None:
+        """Hides the row at once, its data is removed later by the purger."""
+        query = (
+            self.table.update()
+            .where(and_(self.table.c.id == id_, self.table.c[self.deleted_column].is_(None)))
+            .values({self.deleted_column: datetime.now()})
+        )
         self.log_query(query)
-        await database.execute(query)
+        await self.database.execute(query)
+
+    async def delete_many(self, ids: Sequence[ID]) -> None:
+        conditions = self._ids_conditions(ids)
+        if not conditions:
+            return
+        async with self.database.transaction():
+            for condition in conditions:
+                query = self.table.delete().where(condition)
+                self.log_query(query)
+                await self.database.execute(query)
 
     async def count(self) -> int:
-        query = func.count().select_from(self.table)
+        query = self.exclude_deleted(select(func.count()).select_from(self.table))
         self.log_query(query)
-        return await database.fetch_val(query)
+        return await self.database.reader().fetch_val(query)
 
     async def get_all(self) -> Sequence[DTO]:
-        query = self.table.select()
+        query = self.exclude_deleted(self.table.select())
         self.log_query(query)
-        return await database.fetch_all(query)
+        return await self.database.reader().fetch_all(query)
+
+    async def iter_query(
+        self, query, fetch_size: int | None = None, key=None, primary: bool = False
+    ) -> AsyncIterator[DTO]:
+        """Streams the rows of ``query`` without building a list, from the replica unless ``primary``.
+
+        Without ``key`` the rows come from one server-side cursor (``self.database.iterate``), which
+        holds the task's connection until the iterator is exhausted, so the caller must not run
+        other queries while consuming it. With a unique ``key`` column the rows are read in ``key``
+        order by separate keyset queries of ``fetch_size`` rows, and the connection is free
+        between them.
+        """
+        reader = self.database.primary if primary else self.database.reader()
+        if key is None:
+            self.log_query(query)
+            async for row in reader.iterate(query):
+                yield row
+            return
+
+        fetch_size = fetch_size or settings.DB_ITER_FETCH_SIZE
+        last_key = None
+        while True:
+            batch_query = query.order_by(None).order_by(key).limit(fetch_size)
+            if last_key is not None:
+                batch_query = batch_query.where(key > last_key)
+            self.log_query(batch_query)
+            rows = await reader.fetch_all(batch_query)
+            for row in rows:
+                yield row
+            if len(rows) < fetch_size:
+                return
+            last_key = rows[-1][key.name]
+
+    async def iter_all(self, fetch_size: int | None = None) -> AsyncIterator[DTO]:
+        async for row in self.iter_filtered(fetch_size=fetch_size):
+            yield row
+
+    async def iter_filtered(self, filters: dict | None = None, fetch_size: int | None = None) -> AsyncIterator[DTO]:
+        query = self.apply_filters(select(self.table), filters)
+        primary_key = list(self.table.primary_key.columns)
+        key = primary_key[0] if len(primary_key) == 1 else None
+        async for row in self.iter_query(query, fetch_size, key):
+            yield row
 
     def _get_column_by_name(self, column_name: str):
         return self.table.c.get(column_name)
 
     def apply_filters(self, query, filters: dict | None = None):
+        query = self.exclude_deleted(query)
         if not filters:
             return query
         sqla_filters = []
@@ -139,29 +303,79 @@ class CrudBase[ID, DTO]:
             query = query.order_by(order(order_column))
         return query
 
+    def select_columns(self, columns: Sequence[str] | None = None):
+        if not columns:
+            return select(self.table)
+        return select(*(self.table.c[name] for name in columns))
+
     async def count_filtered(self, filters: dict | None = None) -> int:
         query = select(func.count()).select_from(self.table)
         query = self.apply_filters(query, filters)
         self.log_query(query)
-        return await database.fetch_val(query)
+        return await self.database.reader().fetch_val(query)
 
     async def list(
         self,
         filters: dict | None = None,
         pagination: PaginationParameters | None = None,
+        columns: Sequence[str] | None = None,
     ) -> Sequence[DTO]:
-        query = select(self.table)
+        """Selects whole rows, or only ``columns`` when a list view does not need the rest."""
+        query = self.select_columns(columns)
         query = self.apply_filters(query, filters)
         query = self.apply_pagination(query, pagination)
         self.log_query(query)
-        return await database.fetch_all(query)
+        return await self.database.reader().fetch_all(query)
 
     async def get_page(
         self,
         filters: dict | None = None,
         pagination: PaginationParameters | None = None,
+        columns: Sequence[str] | None = None,
     ) -> PageData[DTO]:
         return PageData(
-            data=list(await self.list(deepcopy(filters), pagination=pagination)),
+            data=list(await self.list(deepcopy(filters), pagination=pagination, columns=columns)),
             total=await self.count_filtered(deepcopy(filters)),
         )
+
+    async def get_page_across_shards(
+        self,
+        filters: dict | None = None,
+        pagination: PaginationParameters | None = None,
+        columns: Sequence[str] | None = None,
+    ) -> PageData[DTO]:
+        """``get_page`` over every shard, for lists that are not scoped to one company.
+
+        Each shard returns its first ``page * page_size`` rows in the requested order, which are
+        merged and cut to the page.
+        """
+        if not self.shards.enabled:
+            return await self.get_page(filters, pagination, columns)
+        window = None
+        order_by = None
+        shard_columns = columns
+        if pagination is not None:
+            window = PaginationParameters(
+                page=1,
+                page_size=pagination.page * pagination.page_size,
+                order_by=pagination.order_by,
+                ascending=pagination.ascending,
+            )
+            if self._get_column_by_name(pagination.order_by) is not None:
+                order_by = pagination.order_by
+                if columns and order_by not in columns:
+                    shard_columns = [*columns, order_by]
+
+        pages = (await self.shards.fan_out(lambda: self.get_page(filters, window, shard_columns))).values()
+        rows = [page.data for page in pages]
+        if order_by is not None:
+            rows = list(heapq.merge(
+                *rows, key=lambda row: (row[order_by] is None, row[order_by]), reverse=not pagination.ascending
+            ))
+        else:
+            rows = [row for shard_rows in rows for row in shard_rows]
+        if pagination is not None:
+            rows = rows[(pagination.page - 1) * pagination.page_size:][:pagination.page_size]
+        if shard_columns is not columns:
+            rows = [{name: row[name] for name in columns} for row in rows]
+        return PageData(data=rows, total=sum(page.total for page in pages))
@@ -1,8 +1,317 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Iterator
+
 from databases import Database
-from sqlalchemy import MetaData
+from databases.interfaces import ConnectionBackend, DatabaseBackend
+from sqlalchemy import MetaData, select
 
+from app.core.exceptions import DatabaseBusyError
 from app.core.settings import settings
 
+logger = logging.getLogger(__name__)
+
 metadata = MetaData()
 
-database = Database(settings.DB_URI)
+
+@dataclass
+class PoolStats:
+    max_size: int
+    in_use: int
+    idle: int
+    waiters: int
+    acquired: int
+    timeouts: int
+    acquire_wait_total: float
+    acquire_wait_max: float
+
+    @property
+    def acquire_wait_avg(self) -> float:
+        return self.acquire_wait_total / self.acquired if self.acquired else 0.0
+
+
+class ConnectionGate:
+    """Bounds the connections in use at ``max_size`` and records how long acquiring one waits."""
+
+    def __init__(self, max_size: int, acquire_timeout: float | None = None):
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self._semaphore = asyncio.Semaphore(max_size)
+        self._in_use = 0
+        self._waiters = 0
+        self._acquired = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    async def acquire(self) -> None:
+        started = time.perf_counter()
+        self._waiters += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.acquire_timeout)
+        except TimeoutError as e:
+            self._timeouts += 1
+            raise DatabaseBusyError(f"No database connection free after {self.acquire_timeout}s") from e
+        finally:
+            self._waiters -= 1
+        waited = time.perf_counter() - started
+        self._in_use += 1
+        self._acquired += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+
+    def release(self) -> None:
+        self._in_use -= 1
+        self._semaphore.release()
+
+    def stats(self, idle: int = 0) -> PoolStats:
+        return PoolStats(
+            max_size=self.max_size,
+            in_use=self._in_use,
+            idle=idle,
+            waiters=self._waiters,
+            acquired=self._acquired,
+            timeouts=self._timeouts,
+            acquire_wait_total=self._wait_total,
+            acquire_wait_max=self._wait_max,
+        )
+
+
+class _GatedConnection:
+    def __init__(self, connection: ConnectionBackend, gate: ConnectionGate):
+        self._connection = connection
+        self._gate = gate
+
+    async def acquire(self) -> None:
+        await self._gate.acquire()
+        try:
+            await self._connection.acquire()
+        except BaseException:
+            self._gate.release()
+            raise
+
+    async def release(self) -> None:
+        try:
+            await self._connection.release()
+        finally:
+            self._gate.release()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._connection, name)
+
+
+class _GatedBackend(DatabaseBackend):
+    def __init__(self, backend: DatabaseBackend, gate: ConnectionGate):
+        self._backend = backend
+        self._gate = gate
+
+    async def connect(self) -> None:
+        await self._backend.connect()
+
+    async def disconnect(self) -> None:
+        await self._backend.disconnect()
+
+    def connection(self) -> ConnectionBackend:
+        return _GatedConnection(self._backend.connection(), self._gate)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._backend, name)
+
+
+class PooledDatabase(Database):
+    """``Database`` that hands out at most ``max_connections`` at once and reports pool metrics.
+
+    Handlers beyond ``max_connections`` wait for a free connection, for at most ``acquire_timeout``
+    seconds before ``DatabaseBusyError`` is raised.
+    """
+
+    def __init__(self, url: str, *, max_connections: int, acquire_timeout: float | None = None, **options: Any):
+        super().__init__(url, **options)
+        self.gate = ConnectionGate(max_connections, acquire_timeout)
+        self._backend = _GatedBackend(self._backend, self.gate)
+
+    def pool_stats(self) -> PoolStats:
+        pool = getattr(self._backend, "_pool", None)
+        get_idle_size = getattr(pool, "get_idle_size", None)
+        return self.gate.stats(idle=get_idle_size() if get_idle_size else 0)
+
+    async def prewarm(self, size: int) -> None:
+        """Opens ``size`` connections at once, so the first handlers do not pay for connecting."""
+        size = min(size, self.gate.max_size)
+        if size < 1:
+            return
+        all_open = asyncio.Barrier(size)
+
+        async def open_connection() -> None:
+            async with self.connection() as connection:
+                await connection.fetch_val(select(1))
+                await all_open.wait()
+
+        await asyncio.gather(*(open_connection() for _ in range(size)))
+
+    async def log_pool_stats(self) -> None:
+        stats = self.pool_stats()
+        logger.info(
+            "Database pool: %d/%d in use, %d idle, %d waiting, acquire wait avg %.1fms max %.1fms, %d timeouts",
+            stats.in_use, stats.max_size, stats.idle, stats.waiters,
+            stats.acquire_wait_avg * 1000, stats.acquire_wait_max * 1000, stats.timeouts,
+        )
+
+
+_primary_pinned: ContextVar[bool] = ContextVar("primary_pinned", default=False)
+_in_transaction: ContextVar[bool] = ContextVar("in_transaction", default=False)
+
+
+class DatabaseRouter:
+    """Sends writes and transactions to ``primary`` and read-only queries to ``replica`` when one is set.
+
+    Queries and transactions issued through the router itself go to the primary; read-only paths
+    ask for ``reader()`` explicitly. Any write pins the current context to the primary, so the rest
+    of the update reads its own writes. ``read_your_writes()`` opens a fresh, unpinned scope.
+    Everything else is delegated to the primary.
+    """
+
+    def __init__(self, primary: Database, replica: Database | None = None):
+        self.primary = primary
+        self.replica = replica
+
+    def reader(self) -> Database:
+        if self.replica is None or _primary_pinned.get():
+            return self.primary
+        return self.replica
+
+    @staticmethod
+    def pin_primary() -> None:
+        _primary_pinned.set(True)
+
+    @staticmethod
+    @asynccontextmanager
+    async def read_your_writes() -> AsyncIterator[None]:
+        token = _primary_pinned.set(False)
+        try:
+            yield
+        finally:
+            _primary_pinned.reset(token)
+
+    async def connect(self) -> None:
+        await self.primary.connect()
+        if self.replica is not None:
+            await self.replica.connect()
+
+    async def disconnect(self) -> None:
+        if self.replica is not None:
+            await self.replica.disconnect()
+        await self.primary.disconnect()
+
+    def _track(self, query) -> None:
+        if self.replica is None:
+            return
+        if isinstance(query, str):
+            is_read = query.lstrip()[:6].upper() == "SELECT"
+        else:
+            is_read = getattr(query, "is_select", False) and getattr(query, "_for_update_arg", None) is None
+        if not is_read:
+            self.pin_primary()
+
+    async def fetch_all(self, query, values: dict | None = None) -> list:
+        self._track(query)
+        return await self.primary.fetch_all(query, values)
+
+    async def fetch_one(self, query, values: dict | None = None):
+        self._track(query)
+        return await self.primary.fetch_one(query, values)
+
+    async def fetch_val(self, query, values: dict | None = None, column: Any = 0) -> Any:
+        self._track(query)
+        return await self.primary.fetch_val(query, values, column)
+
+    async def execute(self, query, values: dict | None = None) -> Any:
+        self._track(query)
+        return await self.primary.execute(query, values)
+
+    async def execute_many(self, query, values: list) -> None:
+        self._track(query)
+        await self.primary.execute_many(query, values)
+
+    async def iterate(self, query, values: dict | None = None) -> AsyncIterator:
+        self._track(query)
+        async for row in self.primary.iterate(query, values):
+            yield row
+
+    async def prewarm(self, size: int) -> None:
+        await self.primary.prewarm(size)
+        if self.replica is not None:
+            await self.replica.prewarm(size)
+
+    @asynccontextmanager
+    async def transaction(self, **kwargs: Any) -> AsyncIterator[Any]:
+        if self.replica is not None:
+            self.pin_primary()
+        token = _in_transaction.set(True)
+        try:
+            async with self.primary.transaction(**kwargs) as transaction:
+                yield transaction
+        finally:
+            _in_transaction.reset(token)
+
+    @staticmethod
+    def in_transaction() -> bool:
+        """Whether the current context is inside ``transaction()``."""
+        return _in_transaction.get()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.primary, name)
+
+
+def pool_options(url: str) -> dict[str, Any]:
+    """asyncpg pool arguments from settings, SQLite connections are not pooled."""
+    if not url.startswith("postgresql"):
+        return {}
+    return {
+        "min_size": settings.DB_POOL_MIN_SIZE,
+        "max_size": settings.DB_POOL_MAX_SIZE,
+        "max_inactive_connection_lifetime": settings.DB_POOL_MAX_INACTIVE_CONNECTION_LIFETIME,
+        "max_queries": settings.DB_POOL_MAX_QUERIES,
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+
+
+def create_database(url: str) -> PooledDatabase:
+    return PooledDatabase(
+        url,
+        max_connections=settings.DB_POOL_MAX_SIZE,
+        acquire_timeout=settings.DB_POOL_ACQUIRE_TIMEOUT,
+        **pool_options(url),
+    )
+
+
+database = DatabaseRouter(
+    create_database(settings.DB_URI),
+    create_database(settings.DB_REPLICA_URI) if settings.DB_REPLICA_URI else None,
+)
+
+_current_database: ContextVar[DatabaseRouter | None] = ContextVar("current_database", default=None)
+
+
+def get_database() -> DatabaseRouter:
+    """The database of the current context, ``database`` unless ``use_database`` set another one."""
+    return _current_database.get() or database
+
+
+@contextmanager
+def use_database(db: DatabaseRouter) -> Iterator[DatabaseRouter]:
+    """Runs the enclosed code, and every task it starts, against ``db``."""
+    token = _current_database.set(db)
+    try:
+        yield db
+    finally:
+        _current_database.reset(token)
+
+
+def pin_database(db: DatabaseRouter) -> None:
+    """Routes the rest of the current ``use_database`` scope to ``db``."""
+    _current_database.set(db)
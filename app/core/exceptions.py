@@ -6,7 +6,19 @@ class NotFoundError(ApplicationError):
     pass
 
 
+class DatabaseBusyError(ApplicationError):
+    pass
+
+
 class UniqueViolationError(ApplicationError):
     def __init__(self, constraint_name: str):
         super().__init__()
         self.constraint_name = constraint_name
+
+
+class ShardRoutingError(ApplicationError):
+    pass
+
+
+class ConcurrentUpdateError(ApplicationError):
+    """The row was changed by someone else since it was read."""
@@ -0,0 +1,16 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodically(job: Callable[[], Awaitable[object]], interval: float, name: str) -> None:
+    while True:
+        try:
+            await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Periodic job '%s' failed", name)
+        await asyncio.sleep(interval)
@@ -1,11 +1,14 @@
-from typing import Sequence, Type
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import fields
+from typing import AsyncIterator, Iterator, Sequence, Type
 
 import asyncpg
 
 from app.core.crud_base import CrudBase
-from app.core.exceptions import UniqueViolationError
+from app.core.exceptions import ConcurrentUpdateError, UniqueViolationError
 from app.core.models import Entity
-from app.core.serializer import Serializer
+from app.core.serializer import DataclassSerializer, Serializer
 from app.core.types import DTO, PageData, PaginationParameters
 
 
@@ -18,6 +21,22 @@ class RepoBase[ID, E: Entity]:
         self.serializer = serializer
         self.entity_cls = entity_cls
 
+    @contextmanager
+    def _unique_violations(self) -> Iterator[None]:
+        """Raises ``unique_violation_exception_cls`` for a duplicate key, on PostgreSQL and on SQLite."""
+        try:
+            yield
+        except asyncpg.UniqueViolationError as e:
+            raise self.unique_violation_exception_cls(e.constraint_name) from e
+        except sqlite3.IntegrityError as e:
+            # "UNIQUE constraint failed: index 'ux_name'" or "...: table.column, ..."
+            prefix, _, constraint = str(e).partition(": ")
+            if prefix != "UNIQUE constraint failed":
+                raise
+            if constraint.startswith("index '"):
+                constraint = constraint.removeprefix("index '").removesuffix("'")
+            raise self.unique_violation_exception_cls(constraint) from e
+
     async def get_by_id(self, id_: ID) -> E:
         dto = await self.crud.get_by_id(id_)
         if dto is None:
@@ -26,63 +45,78 @@ class RepoBase[ID, E: Entity]:
 
     async def create(self, model: E) -> ID:
         dto = self.serializer.serialize(model)
-        try:
+        with self._unique_violations():
             return await self.crud.create(dto)
-        except asyncpg.UniqueViolationError as e:
-            raise self.unique_violation_exception_cls(e.constraint_name) from e
 
     async def create_and_get(self, model: E) -> E:
         dto = self.serializer.serialize(model)
-        try:
+        with self._unique_violations():
             dto = await self.crud.create_and_get(dto)
             return self.serializer.deserialize(dto)
-        except asyncpg.UniqueViolationError as e:
-            raise self.unique_violation_exception_cls(e.constraint_name) from e
 
     async def create_many(self, models: Sequence[E]) -> list[ID]:
         dtos = self.serializer.flat.serialize(models)
-        try:
+        with self._unique_violations():
             return await self.crud.create_many(dtos)
-        except asyncpg.UniqueViolationError as e:
-            raise self.unique_violation_exception_cls(e.constraint_name) from e
 
     async def create_and_get_many(self, models: Sequence[E]) -> Sequence[E]:
         dtos = self.serializer.flat.serialize(models)
-        try:
+        with self._unique_violations():
             dtos = await self.crud.create_and_get_many(dtos)
             return self.serializer.flat.deserialize(dtos)
-        except asyncpg.UniqueViolationError as e:
-            raise self.unique_violation_exception_cls(e.constraint_name) from e
+
+    async def _update_failed(self, id_: ID) -> Exception:
+        """Why an update of ``id_`` hit no row: it is gone, or someone else changed it first."""
+        if await self.crud.get_by_id(id_) is None:
+            return self.not_found_exception_cls()
+        return ConcurrentUpdateError()
 
     async def update(self, values: E) -> None:
         dto = self.serializer.serialize(values)
-        try:
-            await self.crud.update(dto)
-        except asyncpg.UniqueViolationError as e:
-            raise self.unique_violation_exception_cls(e.constraint_name) from e
+        with self._unique_violations():
+            updated = await self.crud.update(dto)
+        if updated is None:
+            raise await self._update_failed(dto["id"])
 
     async def update_and_get(self, values: E) -> E:
         dto = self.serializer.serialize(values)
-        try:
-            dto = await self.crud.update_and_get(dto)
-            return self.serializer.deserialize(dto)
-        except asyncpg.UniqueViolationError as e:
-            raise self.unique_violation_exception_cls(e.constraint_name) from e
+        with self._unique_violations():
+            updated = await self.crud.update_and_get(dto)
+        if updated is None:
+            raise await self._update_failed(dto["id"])
+        return self.serializer.deserialize(updated)
+
+    async def patch(self, id_: ID, expected_version: int | None = None, **fields) -> E:
+        """Sets ``fields``; with ``expected_version`` raises ``ConcurrentUpdateError`` if the row has moved on."""
+        with self._unique_violations():
+            dto = await self.crud.patch(id_, expected_version, **fields)
+        if dto is None:
+            raise await self._update_failed(id_)
+        return self.serializer.deserialize(dto)
 
     async def update_many(self, models: Sequence[E]) -> None:
         dtos = self.serializer.flat.serialize(models)
-        try:
-            await self.crud.update_many(dtos)
-        except asyncpg.UniqueViolationError as e:
-            raise self.unique_violation_exception_cls(e.constraint_name) from e
+        with self._unique_violations():
+            updated = await self.crud.update_many(dtos)
+        for dto, id_ in zip(dtos, updated):
+            if id_ is None:
+                raise await self._update_failed(dto["id"])
 
-    async def get_many_by_ids(self, ids: Sequence[ID]) -> Sequence[E]:
+    async def get_many_by_ids(self, ids: Sequence[ID], missing_ok: bool = True) -> Sequence[E]:
         dtos = await self.crud.get_many_by_ids(ids)
+        if not missing_ok and len(dtos) < len(ids):
+            found = {dto["id"] for dto in dtos}
+            missing = [id_ for id_ in ids if id_ not in found]
+            if missing:
+                raise self.not_found_exception_cls(f"Not found: {missing}")
         return self.serializer.flat.deserialize(dtos)
 
     async def delete(self, id_: ID) -> None:
         await self.crud.delete(id_)
 
+    async def mark_deleted(self, id_: ID) -> None:
+        await self.crud.mark_deleted(id_)
+
     async def delete_many(self, ids: Sequence[ID]) -> None:
         await self.crud.delete_many(ids)
 
@@ -93,20 +127,49 @@ class RepoBase[ID, E: Entity]:
         dto = await self.crud.get_all()
         return self.serializer.flat.deserialize(dto)
 
+    async def iter_all(self, fetch_size: int | None = None) -> AsyncIterator[E]:
+        async for dto in self.crud.iter_all(fetch_size):
+            yield self.serializer.deserialize(dto)
+
+    async def iter_filtered(self, filters: dict | None = None, fetch_size: int | None = None) -> AsyncIterator[E]:
+        async for dto in self.crud.iter_filtered(filters, fetch_size):
+            yield self.serializer.deserialize(dto)
+
     async def count_filtered(self, filters: dict | None = None) -> int:
         return await self.crud.count_filtered(filters)
 
-    async def list(
-        self, filters: dict | None = None, pagination: PaginationParameters | None = None
-    ) -> Sequence[E]:
-        dtos = await self.crud.list(filters, pagination)
-        return self.serializer.flat.deserialize(dtos)
+    @staticmethod
+    def projection(read_model: type | None) -> list[str] | None:
+        """Columns to select for a read model: the names of its dataclass fields."""
+        if read_model is None:
+            return None
+        return [field.name for field in fields(read_model)]
 
-    async def get_page(
-        self, filters: dict | None = None, pagination: PaginationParameters | None = None
-    ) -> PageData[E]:
-        page_data = await self.crud.get_page(filters, pagination)
+    def read_serializer(self, read_model: type | None) -> Serializer:
+        if read_model is None:
+            return self.serializer
+        return DataclassSerializer(read_model)
+
+    def deserialize_page(self, page_data: PageData[DTO], read_model: type | None = None) -> PageData:
         return PageData(
-            data=list(self.serializer.flat.deserialize(page_data.data)),
+            data=list(self.read_serializer(read_model).flat.deserialize(page_data.data)),
             total=page_data.total,
         )
+
+    async def list[M](
+        self,
+        filters: dict | None = None,
+        pagination: PaginationParameters | None = None,
+        read_model: type[M] | None = None,
+    ) -> Sequence[E] | Sequence[M]:
+        dtos = await self.crud.list(filters, pagination, self.projection(read_model))
+        return self.read_serializer(read_model).flat.deserialize(dtos)
+
+    async def get_page[M](
+        self,
+        filters: dict | None = None,
+        pagination: PaginationParameters | None = None,
+        read_model: type[M] | None = None,
+    ) -> PageData[E] | PageData[M]:
+        page_data = await self.crud.get_page(filters, pagination, self.projection(read_model))
+        return self.deserialize_page(page_data, read_model)
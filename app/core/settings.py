@@ -7,7 +7,56 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=f'{os.path.dirname(__file__)}/../../.env')
 
     DB_URI: str = "sqlite+aiosqlite:///./database.sqlite"
+    DB_REPLICA_URI: str | None = None
     TG_BOT_TOKEN: str
+    TG_GLOBAL_RATE_LIMIT: float = 30.0
+    TG_CHAT_RATE_LIMIT: float = 1.0
+    TG_MAX_RETRIES: int = 3
+
+    DB_POOL_MIN_SIZE: int = 2
+    DB_POOL_MAX_SIZE: int = 10
+    DB_POOL_ACQUIRE_TIMEOUT: float | None = 10
+    DB_POOL_MAX_INACTIVE_CONNECTION_LIFETIME: float = 300
+    DB_POOL_MAX_QUERIES: int = 50000
+    DB_POOL_PREWARM: bool = True
+    DB_POOL_METRICS_INTERVAL_SECONDS: float = 60
+    DB_STATEMENT_CACHE_SIZE: int = 100
+
+    DB_ITER_FETCH_SIZE: int = 1000
+    DB_IN_CHUNK_SIZE: int = 500
+    DB_ANY_ARRAY_THRESHOLD: int = 5000
+
+    DB_SHARDS: dict[str, str] = {}
+    DB_NEW_COMPANY_SHARD: str = "default"
+    DB_SHARD_MAP_CACHE_SECONDS: float = 60
+
+    EXPORT_GZIP: bool = False
+    EXPORT_CACHE_MAX_MEMORY_BYTES: int = 32 * 1024 * 1024
+    EXPORT_CACHE_MAX_DISK_BYTES: int = 512 * 1024 * 1024
+    EXPORT_CACHE_DIR: str | None = None
+
+    REPORT_WORKERS: int = 2
+    REPORT_PROCESS_POOL_WORKERS: int = 2
+    REPORT_POLL_INTERVAL_SECONDS: float = 5
+
+    DEADLINE_REMINDER_DAYS: int = 1
+    DEADLINE_REMINDER_INTERVAL_SECONDS: float = 600
+    DEADLINE_REMINDER_BATCH_SIZE: int = 500
+
+    TIME_BUCKET_COMPACTION_INTERVAL_SECONDS: float = 60
+
+    PURGE_INTERVAL_SECONDS: float = 60
+    PURGE_BATCH_SIZE: int = 1000
+    PURGE_BATCH_PAUSE_SECONDS: float = 0.1
+
+    ARCHIVE_AFTER_DAYS: int = 90
+    ARCHIVE_INTERVAL_SECONDS: float = 60 * 60
+    ARCHIVE_BATCH_SIZE: int = 100
+    ARCHIVE_BATCH_PAUSE_SECONDS: float = 0.5
+
+    TIME_ENTRY_PARTITION_MONTHS_AHEAD: int = 3
+    TIME_ENTRY_PARTITION_RETENTION_MONTHS: int | None = None
+    TIME_ENTRY_PARTITION_MAINTENANCE_INTERVAL_SECONDS: float = 24 * 60 * 60
 
 
 settings = Settings()  # noqa
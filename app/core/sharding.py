@@ -0,0 +1,264 @@
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterator
+
+from sqlalchemy import Column, Integer, String, Table, select, text
+
+from app.core.database import DatabaseRouter, create_database, database, metadata, pin_database, use_database
+from app.core.exceptions import ShardRoutingError
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHARD = "default"
+
+# Shard of every company, stored on the default shard. The code of a deleted company is
+# cleared, the row itself stays until the company is purged.
+company_shard_table = Table(
+    'company_shard',
+    metadata,
+    Column('company_id', Integer, primary_key=True),
+    Column('code', String(3), unique=True, nullable=True),
+    Column('shard', String(64), nullable=False),
+)
+
+_shard_resolved: ContextVar[bool] = ContextVar("shard_resolved", default=False)
+
+
+class ShardMap:
+    """Routes company-scoped queries to the database holding the company.
+
+    The ``company_shard`` directory on the default shard maps companies to shard names and hands
+    out company ids, so ids stay unique across shards; companies missing from it live on the
+    default shard. It is kept up to date with a single shard too, so more shards can be added
+    later, but nothing is looked up then.
+
+    Routing goes through the ``use_database`` provider: resolving a company pins the rest of the
+    current scope to its shard. ``scope()`` opens a fresh, unresolved scope, in which lookups by
+    id alone are sent to every shard and pin the one that has the row.
+    """
+
+    def __init__(
+        self,
+        shards: dict[str, DatabaseRouter],
+        new_company_shard: str = DEFAULT_SHARD,
+        cache_seconds: float = 60,
+    ):
+        if DEFAULT_SHARD not in shards:
+            raise ValueError(f"Shard map needs a '{DEFAULT_SHARD}' shard")
+        if new_company_shard not in shards:
+            raise ValueError(f"Unknown shard '{new_company_shard}'")
+        self.shards = shards
+        self.new_company_shard = new_company_shard
+        self.cache_seconds = cache_seconds
+        self._cache: dict[int, tuple[str, float]] = {}
+        self._next_first = 0
+
+    @property
+    def enabled(self) -> bool:
+        return len(self.shards) > 1
+
+    @property
+    def directory(self) -> DatabaseRouter:
+        return self.shards[DEFAULT_SHARD]
+
+    def shard(self, name: str) -> DatabaseRouter:
+        try:
+            return self.shards[name]
+        except KeyError:
+            raise ShardRoutingError(f"Unknown shard '{name}'") from None
+
+    @contextmanager
+    def scope(self) -> Iterator[None]:
+        """Runs the enclosed code against the default shard until a company or row resolves another one."""
+        resolved = _shard_resolved.set(False)
+        with use_database(self.directory):
+            try:
+                yield
+            finally:
+                _shard_resolved.reset(resolved)
+
+    @contextmanager
+    def use_shard(self, name: str) -> Iterator[DatabaseRouter]:
+        resolved = _shard_resolved.set(True)
+        with use_database(self.shard(name)) as db:
+            try:
+                yield db
+            finally:
+                _shard_resolved.reset(resolved)
+
+    def needs_lookup(self) -> bool:
+        """Whether a query by id alone has to look for its row on every shard."""
+        return self.enabled and not _shard_resolved.get()
+
+    @staticmethod
+    def _pin(db: DatabaseRouter) -> None:
+        pin_database(db)
+        _shard_resolved.set(True)
+
+    async def shard_of(self, company_id: int) -> str:
+        if not self.enabled:
+            return DEFAULT_SHARD
+        cached = self._cache.get(company_id)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+        query = select(company_shard_table.c.shard).where(company_shard_table.c.company_id == company_id)
+        name = await self.directory.primary.fetch_val(query) or DEFAULT_SHARD
+        self._cache[company_id] = (name, time.monotonic() + self.cache_seconds)
+        return name
+
+    async def shard_of_code(self, code: str) -> str:
+        if not self.enabled:
+            return DEFAULT_SHARD
+        query = select(company_shard_table.c.shard).where(company_shard_table.c.code == code)
+        return await self.directory.primary.fetch_val(query) or DEFAULT_SHARD
+
+    async def use_company(self, company_id: int) -> None:
+        """Pins the current scope to the shard of ``company_id``."""
+        if self.enabled:
+            self._pin(self.shard(await self.shard_of(company_id)))
+
+    async def use_company_code(self, code: str) -> None:
+        if self.enabled:
+            self._pin(self.shard(await self.shard_of_code(code)))
+
+    async def register_company(self, code: str, shard: str | None = None) -> int:
+        """Allocates the id of a new company and pins the current scope to the shard it goes to."""
+        shard = shard or self.new_company_shard
+        target = self.shard(shard)
+        company_id = await self.directory.execute(company_shard_table.insert().values(code=code, shard=shard))
+        self._cache[company_id] = (shard, time.monotonic() + self.cache_seconds)
+        if self.enabled:
+            self._pin(target)
+        return company_id
+
+    async def assign_company(self, company_id: int, code: str, shard: str) -> None:
+        self.shard(shard)
+        table = company_shard_table
+        async with self.directory.transaction():
+            await self.directory.execute(table.delete().where(table.c.company_id == company_id))
+            await self.directory.execute(table.insert().values(company_id=company_id, code=code, shard=shard))
+        self._cache.pop(company_id, None)
+
+    async def release_company_code(self, company_id: int) -> None:
+        """Frees the code of a deleted company; its id keeps routing to its shard until it is forgotten."""
+        await self.directory.execute(
+            company_shard_table.update().where(company_shard_table.c.company_id == company_id).values(code=None)
+        )
+
+    async def forget_company(self, company_id: int) -> None:
+        await self.directory.execute(
+            company_shard_table.delete().where(company_shard_table.c.company_id == company_id)
+        )
+        self._cache.pop(company_id, None)
+
+    async def fan_out[T](self, call: Callable[[], Awaitable[T]]) -> dict[str, T]:
+        """Runs ``call`` on every shard concurrently, each in its own resolved scope."""
+        async def on_shard(name: str) -> T:
+            with self.use_shard(name):
+                return await call()
+
+        names = list(self.shards)
+        results = await asyncio.gather(*(on_shard(name) for name in names))
+        return dict(zip(names, results))
+
+    async def locate[T](self, call: Callable[[], Awaitable[T | None]]) -> T | None:
+        """The single non-``None`` result of ``call`` across shards; pins the shard it came from."""
+        found = {name: result for name, result in (await self.fan_out(call)).items() if result is not None}
+        if len(found) > 1:
+            raise ShardRoutingError(f"Row found on several shards: {', '.join(found)}")
+        if not found:
+            return None
+        name, result = found.popitem()
+        self._pin(self.shards[name])
+        return result
+
+    async def for_each[T](self, call: Callable[[], Awaitable[T]]) -> list[T]:
+        """Runs ``call`` on one shard after another, for background jobs that scan whole tables."""
+        results = []
+        for name in self.shards:
+            with self.use_shard(name):
+                results.append(await call())
+        return results
+
+    async def first[T](self, call: Callable[[], Awaitable[T | None]]) -> T | None:
+        """The first non-``None`` result of ``call`` trying one shard after another; pins its shard.
+
+        Every call starts at the next shard, so no shard is always tried last.
+        """
+        names = list(self.shards)
+        start = self._next_first % len(names)
+        self._next_first += 1
+        for name in names[start:] + names[:start]:
+            db = self.shards[name]
+            with self.use_shard(name):
+                result = await call()
+            if result is not None:
+                self._pin(db)
+                return result
+        return None
+
+    async def reserve_ids(self, shard: str, start: int) -> None:
+        """Starts the id sequences of ``shard`` at ``start``, so rows get ids no other shard hands out.
+
+        Only PostgreSQL sequences can be moved; SQLite shards keep allocating ``max(id) + 1``.
+        """
+        db = self.shard(shard)
+        if db.url.dialect != "postgresql":
+            logger.info("Id ranges are only reserved on PostgreSQL")
+            return
+        for table in metadata.sorted_tables:
+            id_column = table.c.get("id")
+            if id_column is None or not id_column.primary_key or table is company_shard_table:
+                continue
+            await db.execute(
+                text("SELECT setval(pg_get_serial_sequence(:table, 'id'), :start, false)"),
+                {"table": table.name, "start": start},
+            )
+
+    async def connect(self) -> None:
+        for db in self.shards.values():
+            await db.connect()
+
+    async def disconnect(self) -> None:
+        for db in self.shards.values():
+            await db.disconnect()
+
+    async def prewarm(self, size: int) -> None:
+        for db in self.shards.values():
+            await db.prewarm(size)
+
+    async def log_pool_stats(self) -> None:
+        for name, db in self.shards.items():
+            if self.enabled:
+                logger.info("Shard %s:", name)
+            await db.log_pool_stats()
+
+
+shard_map = ShardMap(
+    {
+        DEFAULT_SHARD: database,
+        **{name: DatabaseRouter(create_database(uri)) for name, uri in settings.DB_SHARDS.items()},
+    },
+    new_company_shard=settings.DB_NEW_COMPANY_SHARD,
+    cache_seconds=settings.DB_SHARD_MAP_CACHE_SECONDS,
+)
+
+_current_shard_map: ContextVar[ShardMap | None] = ContextVar("current_shard_map", default=None)
+
+
+def get_shard_map() -> ShardMap:
+    """The shard map of the current context, ``shard_map`` unless ``use_shard_map`` set another one."""
+    return _current_shard_map.get() or shard_map
+
+
+@contextmanager
+def use_shard_map(shards: ShardMap) -> Iterator[ShardMap]:
+    token = _current_shard_map.set(shards)
+    try:
+        yield shards
+    finally:
+        _current_shard_map.reset(token)
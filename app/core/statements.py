@@ -0,0 +1,91 @@
+import logging
+from typing import Any, Callable, Hashable
+
+from databases import Database
+from sqlalchemy import bindparam
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.sql import Executable
+from sqlalchemy.sql.elements import BindParameter
+from sqlalchemy.sql.visitors import replacement_traverse
+
+logger = logging.getLogger(__name__)
+
+_ASYNCPG_DIALECT = asyncpg.dialect()
+
+
+class Statement:
+    """A query built and compiled once, with ``bindparam`` placeholders filled on every call.
+
+    On PostgreSQL the compiled SQL goes straight to the task's asyncpg connection, whose statement
+    cache keeps it prepared on the server. Other backends run the pre-built query through
+    ``databases``, which still compiles it per call.
+    """
+
+    def __init__(self, name: str, query: Executable):
+        self.name = name
+        self.query = query
+        self._sql: str | None = None
+        self._param_names: tuple[str, ...] = ()
+        self._defaults: dict[str, Any] = {}
+
+    def compile(self) -> str:
+        if self._sql is None:
+            compiled = self.query.compile(dialect=_ASYNCPG_DIALECT)
+            self._param_names = tuple(compiled.positiontup)
+            self._defaults = dict(compiled.params)
+            self._sql = str(compiled)
+        return self._sql
+
+    def args(self, values: dict[str, Any]) -> list[Any]:
+        self.compile()
+        return [values[name] if name in values else self._defaults[name] for name in self._param_names]
+
+    def bind(self, values: dict[str, Any]) -> Executable:
+        """The query with ``values`` filled in, for backends that run it through ``databases``."""
+        if not getattr(self.query, "is_dml", False):
+            return self.query.params(**values)
+
+        # INSERT/UPDATE/DELETE do not support params(), their placeholders are replaced one by one.
+        def replace(element):
+            if isinstance(element, BindParameter) and element.key in values:
+                return bindparam(element.key, values[element.key], type_=element.type)
+            return None
+
+        return replacement_traverse(self.query, {}, replace)
+
+    async def fetch_one(self, database: Database, **values: Any):
+        if database.url.dialect != "postgresql":
+            return await database.fetch_one(self.bind(values))
+        logger.debug("Prepared statement %s %s", self.name, values)
+        async with database.connection() as connection:
+            return await connection.raw_connection.fetchrow(self.compile(), *self.args(values))
+
+    async def fetch_all(self, database: Database, **values: Any) -> list:
+        if database.url.dialect != "postgresql":
+            return await database.fetch_all(self.bind(values))
+        logger.debug("Prepared statement %s %s", self.name, values)
+        async with database.connection() as connection:
+            return await connection.raw_connection.fetch(self.compile(), *self.args(values))
+
+    async def fetch_val(self, database: Database, **values: Any) -> Any:
+        row = await self.fetch_one(database, **values)
+        return None if row is None else row[0]
+
+
+class StatementRegistry:
+    """Process-wide ``Statement`` cache, each statement is built on its first use."""
+
+    def __init__(self):
+        self._statements: dict[Hashable, Statement] = {}
+
+    def get(self, key: Hashable, name: str, build: Callable[[], Executable]) -> Statement:
+        statement = self._statements.get(key)
+        if statement is None:
+            statement = self._statements[key] = Statement(name, build())
+        return statement
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+
+statements = StatementRegistry()
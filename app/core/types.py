@@ -10,6 +10,12 @@ class PageData[T]:
     total: int
 
 
+@dataclass
+class CursorPageData[T]:
+    data: list[T]
+    next_cursor: Any | None
+
+
 @dataclass
 class PaginationParameters:
     page: int = 1
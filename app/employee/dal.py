@@ -1,63 +1,65 @@
-from sqlalchemy import and_, select
+from datetime import datetime
+from typing import Sequence
+
+from sqlalchemy import and_, bindparam, select
 
 from app.core.crud_base import CrudBase
 from app.core.repo_base import RepoBase
 from app.core.serializer import Serializer, DataclassSerializer
 from app.core.types import DTO, PageData, PaginationParameters
 from app.employee.models import Employee
-from app.employee.tables import employee_table
+from app.employee.tables import employee_salary_rate_table, employee_table
 from app.employee.exceptions import EmployeeAlreadyExistsError, EmployeeNotFoundError
-from app.core.database import database
 
 
 class EmployeeCrud(CrudBase[int, DTO]):
     table = employee_table
+    version_column = "version"
 
     async def get_by_telegram_id_and_company_id(self, telegram_id: int, company_id: int) -> DTO | None:
-        query = select(self.table).where(
+        await self.shards.use_company(company_id)
+        statement = self.statement("get_by_telegram_id_and_company_id", lambda: select(self.table).where(
             and_(
-                self.table.c.telegram_id == telegram_id,
-                self.table.c.company_id == company_id
+                self.table.c.telegram_id == bindparam("telegram_id"),
+                self.table.c.company_id == bindparam("company_id")
             )
-        )
-        self.log_query(query)
-        return await database.fetch_one(query)
+        ))
+        return await statement.fetch_one(self.database, telegram_id=telegram_id, company_id=company_id)
 
     async def get_by_company_id(
-        self, company_id: int, pagination: PaginationParameters | None = None
+        self,
+        company_id: int,
+        pagination: PaginationParameters | None = None,
+        columns: Sequence[str] | None = None,
     ) -> PageData[DTO]:
+        await self.shards.use_company(company_id)
         filters = {"company_id": company_id}
-        return await self.get_page(filters=filters, pagination=pagination)
-
-    async def update_display_name(self, employee_id: int, display_name: str) -> DTO:
-        query = (
-            self.table.update()
-            .where(self.table.c.id == employee_id)
-            .values(display_name=display_name)
-            .returning(self.table)
-        )
-        self.log_query(query)
-        return await database.fetch_one(query)
+        return await self.get_page(filters=filters, pagination=pagination, columns=columns)
 
-    async def update_salary_per_hour(self, employee_id: int, salary_per_hour: float) -> DTO:
-        query = (
-            self.table.update()
-            .where(self.table.c.id == employee_id)
-            .values(salary_per_hour=salary_per_hour)
-            .returning(self.table)
+    async def add_salary_rate(self, employee_id: int, salary_per_hour: float, effective_from: datetime) -> None:
+        query = employee_salary_rate_table.insert().values(
+            employee_id=employee_id,
+            salary_per_hour=salary_per_hour,
+            effective_from=effective_from,
         )
         self.log_query(query)
-        return await database.fetch_one(query)
+        await self.database.execute(query)
 
-    async def update_is_active(self, employee_id: int, is_active: bool) -> DTO:
+    async def get_salary_rate_at(self, employee_id: int, at: datetime) -> float | None:
+        rates = employee_salary_rate_table
         query = (
-            self.table.update()
-            .where(self.table.c.id == employee_id)
-            .values(is_active=is_active)
-            .returning(self.table)
+            select(rates.c.salary_per_hour)
+            .where(
+                and_(
+                    rates.c.employee_id == employee_id,
+                    rates.c.effective_from <= at
+                )
+            )
+            .order_by(rates.c.effective_from.desc(), rates.c.id.desc())
+            .limit(1)
         )
         self.log_query(query)
-        return await database.fetch_one(query)
+        return await self.database.fetch_val(query)
 
 
 class EmployeeRepo(RepoBase[int, Employee]):
@@ -76,26 +78,20 @@ class EmployeeRepo(RepoBase[int, Employee]):
             return None
         return self.serializer.deserialize(dto)
 
-    async def get_by_company_id(
-        self, company_id: int, pagination: PaginationParameters | None = None
-    ) -> PageData[Employee]:
-        page_data = await self.crud.get_by_company_id(company_id, pagination)
-        return PageData(
-            data=list(self.serializer.flat.deserialize(page_data.data)),
-            total=page_data.total,
-        )
+    async def get_by_company_id[M](
+        self,
+        company_id: int,
+        pagination: PaginationParameters | None = None,
+        read_model: type[M] | None = None,
+    ) -> PageData[Employee] | PageData[M]:
+        page_data = await self.crud.get_by_company_id(company_id, pagination, self.projection(read_model))
+        return self.deserialize_page(page_data, read_model)
 
-    async def update_display_name(self, employee_id: int, display_name: str) -> Employee:
-        dto = await self.crud.update_display_name(employee_id, display_name)
-        return self.serializer.deserialize(dto)
+    async def add_salary_rate(self, employee_id: int, salary_per_hour: float, effective_from: datetime) -> None:
+        await self.crud.add_salary_rate(employee_id, salary_per_hour, effective_from)
 
-    async def update_salary_per_hour(self, employee_id: int, salary_per_hour: float) -> Employee:
-        dto = await self.crud.update_salary_per_hour(employee_id, salary_per_hour)
-        return self.serializer.deserialize(dto)
-
-    async def update_is_active(self, employee_id: int, is_active: bool) -> Employee:
-        dto = await self.crud.update_is_active(employee_id, is_active)
-        return self.serializer.deserialize(dto)
+    async def get_salary_rate_at(self, employee_id: int, at: datetime) -> float | None:
+        return await self.crud.get_salary_rate_at(employee_id, at)
 
 
 employee_repo = EmployeeRepo(EmployeeCrud(), DataclassSerializer(Employee))
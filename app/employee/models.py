@@ -13,3 +13,11 @@ class Employee(Entity):
     created_at: datetime
     salary_per_hour: float
     display_name: str
+    version: int = 1
+
+
+@dataclass(kw_only=True)
+class EmployeeListItem(Entity):
+    """Columns shown in employee lists."""
+    telegram_id: int
+    display_name: str
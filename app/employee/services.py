@@ -1,9 +1,11 @@
 from datetime import datetime
 
 from app.employee.dal import EmployeeCrud, EmployeeRepo
-from app.employee.models import Employee
+from app.employee.models import Employee, EmployeeListItem
 from app.employee.exceptions import EmployeeAccessDeniedError, EmployeeAlreadyExistsError
 from app.company.services import company_service
+from app.time_tracking.services import time_tracking_entry_service
+from app.core.database import get_database
 from app.core.serializer import DataclassSerializer
 from app.core.types import PageData, PaginationParameters
 
@@ -49,7 +51,9 @@ class EmployeeService:
             salary_per_hour=salary_per_hour,
             display_name=display_name,
         )
-        employee_id = await self.employee_repo.create(employee)
+        async with get_database().transaction():
+            employee_id = await self.employee_repo.create(employee)
+            await self.employee_repo.add_salary_rate(employee_id, salary_per_hour, employee.created_at)
         return await self.employee_repo.get_by_id(employee_id)
 
     async def delete_employee(self, employee_id: int, user_tg_id: int) -> None:
@@ -59,12 +63,16 @@ class EmployeeService:
         if not is_authorized:
             raise EmployeeAccessDeniedError("Only company owner or admin can delete employees")
 
-        await self.employee_repo.delete(employee_id)
+        async with get_database().transaction():
+            await time_tracking_entry_service.remove_employee_entries_from_rollup(employee_id)
+            await time_tracking_entry_service.delete_archived_employee_entries(employee_id)
+            await company_service.bump_data_version(employee.company_id)
+            await self.employee_repo.delete(employee_id)
 
     async def get_employees(
         self, company_id: int, pagination: PaginationParameters | None = None
-    ) -> PageData[Employee]:
-        return await self.employee_repo.get_by_company_id(company_id, pagination)
+    ) -> PageData[EmployeeListItem]:
+        return await self.employee_repo.get_by_company_id(company_id, pagination, EmployeeListItem)
 
     async def get_employee_details(self, employee_id: int) -> Employee:
         return await self.employee_repo.get_by_id(employee_id)
@@ -75,7 +83,7 @@ class EmployeeService:
         return await self.employee_repo.get_by_telegram_id_and_company_id(telegram_id, company_id)
 
     async def set_display_name(
-        self, employee_id: int, display_name: str, user_tg_id: int
+        self, employee_id: int, display_name: str, user_tg_id: int, expected_version: int | None = None
     ) -> Employee:
         employee = await self.employee_repo.get_by_id(employee_id)
 
@@ -83,10 +91,12 @@ class EmployeeService:
         if not is_authorized:
             raise EmployeeAccessDeniedError("Only company owner or admin can set display name")
 
-        return await self.employee_repo.update_display_name(employee_id, display_name)
+        async with get_database().transaction():
+            await company_service.bump_data_version(employee.company_id)
+            return await self.employee_repo.patch(employee_id, expected_version, display_name=display_name)
 
     async def set_salary_per_hour(
-        self, employee_id: int, salary_per_hour: float, user_tg_id: int
+        self, employee_id: int, salary_per_hour: float, user_tg_id: int, expected_version: int | None = None
     ) -> Employee:
         employee = await self.employee_repo.get_by_id(employee_id)
 
@@ -94,10 +104,21 @@ class EmployeeService:
         if not is_authorized:
             raise EmployeeAccessDeniedError("Only company owner or admin can set salary")
 
-        return await self.employee_repo.update_salary_per_hour(employee_id, salary_per_hour)
+        async with get_database().transaction():
+            await self.employee_repo.add_salary_rate(employee_id, salary_per_hour, datetime.now())
+            await company_service.bump_data_version(employee.company_id)
+            return await self.employee_repo.patch(employee_id, expected_version, salary_per_hour=salary_per_hour)
+
+    async def get_salary_rate_at(self, employee_id: int, at: datetime) -> float:
+        """Hourly rate that was in effect for the employee at ``at``."""
+        rate = await self.employee_repo.get_salary_rate_at(employee_id, at)
+        if rate is None:
+            employee = await self.employee_repo.get_by_id(employee_id)
+            rate = employee.salary_per_hour
+        return rate
 
     async def set_is_active(
-        self, employee_id: int, is_active: bool, user_tg_id: int
+        self, employee_id: int, is_active: bool, user_tg_id: int, expected_version: int | None = None
     ) -> Employee:
         employee = await self.employee_repo.get_by_id(employee_id)
 
@@ -105,7 +126,7 @@ class EmployeeService:
         if not is_authorized:
             raise EmployeeAccessDeniedError("Only company owner or admin can change employee status")
 
-        return await self.employee_repo.update_is_active(employee_id, is_active)
+        return await self.employee_repo.patch(employee_id, expected_version, is_active=is_active)
 
 
 employee_service = EmployeeService(EmployeeRepo(EmployeeCrud(), DataclassSerializer(Employee)))
@@ -13,4 +13,14 @@ employee_table = Table(
     Column('created_at', DateTime, nullable=False),
     Column('salary_per_hour', Float, nullable=False),
     Column('display_name', String, nullable=False),
+    Column('version', Integer, nullable=False, server_default='1'),
+)
+
+employee_salary_rate_table = Table(
+    'employee_salary_rate',
+    metadata,
+    Column('id', Integer, primary_key=True),
+    Column('employee_id', Integer, ForeignKey('employee.id', ondelete='CASCADE'), nullable=False),
+    Column('salary_per_hour', Float, nullable=False),
+    Column('effective_from', DateTime, nullable=False),
 )
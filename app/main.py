@@ -1,8 +1,14 @@
 import asyncio
 import logging
 
-from app.core.database import database
-from app.tg_bot.tg_bot import dp, bot
+from app.company.purge import deleted_data_purger
+from app.core.periodic import run_periodically
+from app.core.settings import settings
+from app.core.sharding import shard_map
+from app.task.archive import task_archiver
+from app.tg_bot.tg_bot import dp, bot, deadline_reminder_scheduler, report_worker_pool
+from app.tg_bot.utils.export_cache import stats_export_cache
+from app.time_tracking.services import time_tracking_entry_partition_manager, time_tracking_entry_service
 
 logging.basicConfig(
     level=logging.INFO,
@@ -14,8 +20,45 @@ logging.basicConfig(
 
 
 async def main():
-    await database.connect()
-    await dp.start_polling(bot)
+    await shard_map.connect()
+    if settings.DB_POOL_PREWARM:
+        await shard_map.prewarm(settings.DB_POOL_MIN_SIZE)
+    background_jobs = [
+        asyncio.create_task(deadline_reminder_scheduler.run()),
+        asyncio.create_task(report_worker_pool.run()),
+        asyncio.create_task(run_periodically(
+            lambda: shard_map.for_each(time_tracking_entry_service.compact_time_buckets),
+            settings.TIME_BUCKET_COMPACTION_INTERVAL_SECONDS,
+            "time bucket compaction",
+        )),
+        asyncio.create_task(run_periodically(
+            lambda: shard_map.for_each(time_tracking_entry_partition_manager.maintain),
+            settings.TIME_ENTRY_PARTITION_MAINTENANCE_INTERVAL_SECONDS,
+            "time tracking partition maintenance",
+        )),
+        asyncio.create_task(run_periodically(
+            lambda: shard_map.for_each(deleted_data_purger.purge),
+            settings.PURGE_INTERVAL_SECONDS,
+            "deleted data purge",
+        )),
+        asyncio.create_task(run_periodically(
+            lambda: shard_map.for_each(task_archiver.archive),
+            settings.ARCHIVE_INTERVAL_SECONDS,
+            "task archival",
+        )),
+        asyncio.create_task(run_periodically(
+            shard_map.log_pool_stats,
+            settings.DB_POOL_METRICS_INTERVAL_SECONDS,
+            "database pool metrics",
+        )),
+    ]
+    try:
+        await dp.start_polling(bot)
+    finally:
+        for job in background_jobs:
+            job.cancel()
+        stats_export_cache.close()
+        await shard_map.disconnect()
 
 
 if __name__ == '__main__':
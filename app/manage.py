@@ -0,0 +1,146 @@
+import argparse
+import asyncio
+import logging
+import sys
+from datetime import date
+
+from app.company.purge import deleted_data_purger
+from app.company.relocation import move_company
+from app.core.sharding import shard_map
+from app.task.archive import task_archiver
+from app.time_tracking.dal import TimeTrackingEntryWithArchiveCrud
+from app.time_tracking.models import StatsFilter
+from app.time_tracking.partitions import partitions_between
+from app.time_tracking.services import time_tracking_entry_partition_manager, time_tracking_entry_service
+
+
+async def rebuild_project_rollup(args: argparse.Namespace) -> None:
+    if args.company_id is not None:
+        await time_tracking_entry_service.rebuild_project_rollup(args.company_id)
+        return
+    await shard_map.for_each(time_tracking_entry_service.rebuild_project_rollup)
+
+
+async def rebuild_time_buckets(args: argparse.Namespace) -> None:
+    await shard_map.for_each(time_tracking_entry_service.rebuild_time_buckets)
+
+
+async def compact_time_buckets(args: argparse.Namespace) -> None:
+    merged = sum(await shard_map.for_each(time_tracking_entry_service.compact_time_buckets))
+    logging.info("Merged %s time bucket deltas", merged)
+
+
+async def maintain_partitions(args: argparse.Namespace) -> None:
+    if not time_tracking_entry_partition_manager.is_supported():
+        logging.info("Time tracking partitions are only used on PostgreSQL")
+        return
+    await shard_map.for_each(time_tracking_entry_partition_manager.maintain)
+
+
+async def check_partition_pruning(args: argparse.Namespace) -> None:
+    crud = TimeTrackingEntryWithArchiveCrud()
+    await shard_map.use_company(args.company_id)
+    expected = set(partitions_between(args.start, args.end))
+    stats_filter = StatsFilter(start=args.start, end=args.end)
+    reports = {
+        "employee minutes": crud._employee_minutes_query(args.company_id, args.start, args.end),
+        "project costs": crud._project_costs_query(args.company_id, args.start, args.end),
+        "project stats export": crud._project_stats_query(args.company_id, stats_filter),
+        "employee stats export": crud._employee_stats_query(args.company_id, stats_filter),
+    }
+    pruned = True
+    for name, query in reports.items():
+        scanned = await time_tracking_entry_partition_manager.scanned_partitions(query)
+        extra = sorted(set(scanned) - expected)
+        print(f"{name}: scans {', '.join(scanned) or 'no partitions'}")
+        if extra:
+            print(f"{name}: not pruned {', '.join(extra)}")
+            pruned = False
+    if not pruned:
+        sys.exit(1)
+
+
+async def move_company_to_shard(args: argparse.Namespace) -> None:
+    moved = await move_company(args.company_id, args.shard)
+    if not moved:
+        logging.info("Company %s is already on shard %s", args.company_id, args.shard)
+
+
+async def purge_deleted(args: argparse.Namespace) -> None:
+    for purged in await shard_map.for_each(deleted_data_purger.purge):
+        logging.info("Purged %s", purged or "nothing")
+
+
+async def archive_tasks(args: argparse.Namespace) -> None:
+    archived = sum(await shard_map.for_each(task_archiver.archive))
+    logging.info("Archived %s tasks", archived)
+
+
+async def reserve_shard_ids(args: argparse.Namespace) -> None:
+    await shard_map.reserve_ids(args.shard, args.start)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.manage")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rollup = subparsers.add_parser("rebuild-project-rollup", help="Recompute project_cost_rollup from time entries")
+    rollup.add_argument("--company-id", type=int, default=None)
+    rollup.set_defaults(handler=rebuild_project_rollup)
+
+    buckets = subparsers.add_parser("rebuild-time-buckets", help="Recompute daily time buckets from time entries")
+    buckets.set_defaults(handler=rebuild_time_buckets)
+
+    compact = subparsers.add_parser("compact-time-buckets", help="Fold pending time bucket deltas into daily buckets")
+    compact.set_defaults(handler=compact_time_buckets)
+
+    partitions = subparsers.add_parser(
+        "maintain-partitions", help="Create upcoming and detach expired time_tracking_entry partitions"
+    )
+    partitions.set_defaults(handler=maintain_partitions)
+
+    pruning = subparsers.add_parser(
+        "check-partition-pruning", help="EXPLAIN date-ranged reports and list the partitions they scan"
+    )
+    pruning.add_argument("--company-id", type=int, required=True)
+    pruning.add_argument("--start", type=date.fromisoformat, required=True)
+    pruning.add_argument("--end", type=date.fromisoformat, required=True)
+    pruning.set_defaults(handler=check_partition_pruning)
+
+    move = subparsers.add_parser("move-company", help="Move a company with all its data to another shard")
+    move.add_argument("--company-id", type=int, required=True)
+    move.add_argument("--shard", required=True)
+    move.set_defaults(handler=move_company_to_shard)
+
+    reserve = subparsers.add_parser(
+        "reserve-shard-ids", help="Start the id sequences of a shard at a range no other shard uses"
+    )
+    reserve.add_argument("--shard", required=True)
+    reserve.add_argument("--start", type=int, required=True)
+    reserve.set_defaults(handler=reserve_shard_ids)
+
+    purge = subparsers.add_parser(
+        "purge-deleted", help="Delete the rows of deleted companies and projects in batches"
+    )
+    purge.set_defaults(handler=purge_deleted)
+
+    archive = subparsers.add_parser(
+        "archive-tasks", help="Move closed tasks without recent time entries to the archive tables"
+    )
+    archive.set_defaults(handler=archive_tasks)
+
+    return parser
+
+
+async def main() -> None:
+    args = build_parser().parse_args()
+    await shard_map.connect()
+    try:
+        await args.handler(args)
+    finally:
+        await shard_map.disconnect()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
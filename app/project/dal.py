@@ -1,3 +1,5 @@
+from typing import Sequence
+
 from sqlalchemy import select
 
 from app.core.crud_base import CrudBase
@@ -7,22 +9,27 @@ from app.core.types import DTO, PageData, PaginationParameters
 from app.project.models import Project
 from app.project.tables import project_table
 from app.project.exceptions import ProjectAlreadyExistsError, ProjectNotFoundError
-from app.core.database import database
 
 
 class ProjectCrud(CrudBase[int, DTO]):
     table = project_table
+    version_column = "version"
+    deleted_column = "deleted_at"
 
     async def get_by_code(self, code: str) -> DTO | None:
-        query = select(self.table).where(self.table.c.code == code)
+        query = self.exclude_deleted(select(self.table).where(self.table.c.code == code))
         self.log_query(query)
-        return await database.fetch_one(query)
+        return await self.database.fetch_one(query)
 
     async def get_by_company_id(
-        self, company_id: int, pagination: PaginationParameters | None = None
+        self,
+        company_id: int,
+        pagination: PaginationParameters | None = None,
+        columns: Sequence[str] | None = None,
     ) -> PageData[DTO]:
+        await self.shards.use_company(company_id)
         filters = {"company_id": company_id}
-        return await self.get_page(filters=filters, pagination=pagination)
+        return await self.get_page(filters=filters, pagination=pagination, columns=columns)
 
 
 class ProjectRepo(RepoBase[int, Project]):
@@ -39,14 +46,14 @@ class ProjectRepo(RepoBase[int, Project]):
             return None
         return self.serializer.deserialize(dto)
 
-    async def get_by_company_id(
-        self, company_id: int, pagination: PaginationParameters | None = None
-    ) -> PageData[Project]:
-        page_data = await self.crud.get_by_company_id(company_id, pagination)
-        return PageData(
-            data=list(self.serializer.flat.deserialize(page_data.data)),
-            total=page_data.total,
-        )
+    async def get_by_company_id[M](
+        self,
+        company_id: int,
+        pagination: PaginationParameters | None = None,
+        read_model: type[M] | None = None,
+    ) -> PageData[Project] | PageData[M]:
+        page_data = await self.crud.get_by_company_id(company_id, pagination, self.projection(read_model))
+        return self.deserialize_page(page_data, read_model)
 
 
 project_repo = ProjectRepo(ProjectCrud(), DataclassSerializer(Project))
@@ -10,3 +10,12 @@ class Project(Entity):
     name: str
     code: str
     created_at: datetime
+    version: int = 1
+    deleted_at: datetime | None = None
+
+
+@dataclass(kw_only=True)
+class ProjectListItem(Entity):
+    """Columns shown in project lists."""
+    code: str
+    name: str
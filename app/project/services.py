@@ -1,7 +1,7 @@
 from datetime import datetime
 
 from app.project.dal import ProjectCrud, ProjectRepo
-from app.project.models import Project
+from app.project.models import Project, ProjectListItem
 from app.project.exceptions import (
     InvalidProjectCodeError,
     ProjectAccessDeniedError,
@@ -47,12 +47,13 @@ class ProjectService:
         if not is_owner:
             raise ProjectAccessDeniedError("Only company owner can delete projects")
 
-        await self.project_repo.delete(project_id)
+        await company_service.bump_data_version(project.company_id)
+        await self.project_repo.mark_deleted(project_id)
 
     async def get_projects(
         self, company_id: int, pagination: PaginationParameters | None = None
-    ) -> PageData[Project]:
-        return await self.project_repo.get_by_company_id(company_id, pagination)
+    ) -> PageData[ProjectListItem]:
+        return await self.project_repo.get_by_company_id(company_id, pagination, ProjectListItem)
 
     async def get_project_details(self, project_id: int) -> Project:
         return await self.project_repo.get_by_id(project_id)
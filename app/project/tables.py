@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Table
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Table, text
 
 from app.core.database import metadata
 
@@ -8,6 +8,13 @@ project_table = Table(
     Column('id', Integer, primary_key=True),
     Column('company_id', Integer, ForeignKey('company.id', ondelete='CASCADE'), nullable=False),
     Column('name', String, nullable=False),
-    Column('code', String(3), unique=True, nullable=False),
+    Column('code', String(3), nullable=False),
     Column('created_at', DateTime, nullable=False),
+    Column('version', Integer, nullable=False, server_default='1'),
+    Column('deleted_at', DateTime, nullable=True),
 )
+
+# The code of a deleted project is free again right away, not only once it is purged
+# (migration e7c2a9f4b518).
+Index('ux_project_code', project_table.c.code, unique=True,
+      postgresql_where=text("deleted_at IS NULL"), sqlite_where=text("deleted_at IS NULL"))
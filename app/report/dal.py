@@ -0,0 +1,121 @@
+from datetime import date, datetime
+
+from sqlalchemy import and_, select
+
+from app.core.crud_base import CrudBase
+from app.core.repo_base import RepoBase
+from app.core.serializer import Serializer, DataclassSerializer
+from app.core.types import DTO
+from app.report.exceptions import ReportJobAlreadyExistsError, ReportJobNotFoundError
+from app.report.models import ACTIVE_REPORT_JOB_STATUSES, ReportJob, ReportJobStatus
+from app.report.tables import report_job_table
+
+
+class ReportJobCrud(CrudBase[int, DTO]):
+    table = report_job_table
+
+    async def get_active(
+        self,
+        company_id: int,
+        report_type: str,
+        data_version: int,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> DTO | None:
+        await self.shards.use_company(company_id)
+        query = (
+            select(self.table)
+            .where(
+                and_(
+                    self.table.c.company_id == company_id,
+                    self.table.c.report_type == report_type,
+                    self.table.c.data_version == data_version,
+                    self.table.c.start_date.is_not_distinct_from(start_date),
+                    self.table.c.end_date.is_not_distinct_from(end_date),
+                    self.table.c.status.in_(ACTIVE_REPORT_JOB_STATUSES)
+                )
+            )
+            .order_by(self.table.c.id)
+            .limit(1)
+        )
+        self.log_query(query)
+        return await self.database.fetch_one(query)
+
+    async def claim_next(self) -> DTO | None:
+        """Moves the oldest queued job to running, so that concurrent workers never pick the same job."""
+        oldest_queued = (
+            select(self.table.c.id)
+            .where(self.table.c.status == ReportJobStatus.QUEUED.value)
+            .order_by(self.table.c.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        query = (
+            self.table.update()
+            .where(
+                and_(
+                    self.table.c.id == oldest_queued,
+                    self.table.c.status == ReportJobStatus.QUEUED.value
+                )
+            )
+            .values(status=ReportJobStatus.RUNNING.value, started_at=datetime.now())
+            .returning(self.table)
+        )
+        self.log_query(query)
+        return await self.database.fetch_one(query)
+
+    async def finish(self, job_id: int, status: str, rows_done: int = 0, error: str | None = None) -> None:
+        query = (
+            self.table.update()
+            .where(self.table.c.id == job_id)
+            .values(status=status, rows_done=rows_done, error=error, finished_at=datetime.now())
+        )
+        self.log_query(query)
+        await self.database.execute(query)
+
+    async def requeue_running(self) -> int:
+        query = (
+            self.table.update()
+            .where(self.table.c.status == ReportJobStatus.RUNNING.value)
+            .values(status=ReportJobStatus.QUEUED.value, started_at=None, rows_done=0)
+            .returning(self.table.c.id)
+        )
+        self.log_query(query)
+        return len(await self.database.fetch_all(query))
+
+
+class ReportJobRepo(RepoBase[int, ReportJob]):
+    crud: ReportJobCrud
+
+    def __init__(self, crud: ReportJobCrud, serializer: Serializer[ReportJob, DTO]):
+        super().__init__(crud, serializer, ReportJob)
+        self.not_found_exception_cls = ReportJobNotFoundError
+        self.unique_violation_exception_cls = ReportJobAlreadyExistsError
+
+    async def get_active(
+        self,
+        company_id: int,
+        report_type: str,
+        data_version: int,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> ReportJob | None:
+        dto = await self.crud.get_active(company_id, report_type, data_version, start_date, end_date)
+        if dto is None:
+            return None
+        return self.serializer.deserialize(dto)
+
+    async def claim_next(self) -> ReportJob | None:
+        dto = await self.crud.claim_next()
+        if dto is None:
+            return None
+        return self.serializer.deserialize(dto)
+
+    async def finish(self, job_id: int, status: str, rows_done: int = 0, error: str | None = None) -> None:
+        await self.crud.finish(job_id, status, rows_done, error)
+
+    async def requeue_running(self) -> int:
+        return await self.crud.requeue_running()
+
+
+report_job_repo = ReportJobRepo(ReportJobCrud(), DataclassSerializer(ReportJob))
@@ -0,0 +1,17 @@
+from app.core.exceptions import ApplicationError, UniqueViolationError
+
+
+class ReportJobException(ApplicationError):
+    pass
+
+
+class ReportJobNotFoundError(ReportJobException):
+    pass
+
+
+class ReportJobAlreadyExistsError(UniqueViolationError, ReportJobException):
+    pass
+
+
+class ReportAccessDeniedError(ReportJobException):
+    pass
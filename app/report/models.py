@@ -0,0 +1,43 @@
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+
+from app.core.models import Entity
+from app.time_tracking.models import StatsFilter
+
+
+class ReportType(str, Enum):
+    PROJECT_STATS = "project_stats"
+    EMPLOYEE_STATS = "employee_stats"
+
+
+class ReportJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+ACTIVE_REPORT_JOB_STATUSES = (ReportJobStatus.QUEUED.value, ReportJobStatus.RUNNING.value)
+
+
+@dataclass(kw_only=True)
+class ReportJob(Entity):
+    company_id: int
+    report_type: ReportType
+    status: ReportJobStatus
+    data_version: int
+    start_date: date | None = None
+    end_date: date | None = None
+    requested_by_tg_id: int
+    chat_id: int
+    progress_message_id: int | None = None
+    rows_done: int = 0
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    @property
+    def stats_filter(self) -> StatsFilter:
+        return StatsFilter(start=self.start_date, end=self.end_date)
@@ -0,0 +1,84 @@
+import asyncio
+from datetime import date, datetime
+
+from app.company.services import company_service
+from app.report.dal import ReportJobRepo, report_job_repo
+from app.report.exceptions import ReportAccessDeniedError, ReportJobAlreadyExistsError
+from app.report.models import ReportJob, ReportJobStatus, ReportType
+
+
+class ReportJobService:
+    def __init__(self, report_job_repo: ReportJobRepo):
+        self.report_job_repo = report_job_repo
+        self.submitted = asyncio.Event()
+
+    async def submit(
+        self,
+        company_id: int,
+        report_type: ReportType,
+        chat_id: int,
+        user_tg_id: int,
+        progress_message_id: int | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> tuple[ReportJob, bool]:
+        """Queues a report job over entries created on days ``start_date <= day < end_date``,
+        returns it and whether it was created.
+
+        A queued or running job for the same report, range and company data is returned
+        instead of queueing a duplicate.
+        """
+        is_owner = await company_service.verify_user_is_owner(company_id, user_tg_id)
+        if not is_owner:
+            raise ReportAccessDeniedError("Only company owner can export statistics")
+
+        data_version = await company_service.get_data_version(company_id)
+        active = await self.report_job_repo.get_active(
+            company_id, report_type.value, data_version, start_date, end_date
+        )
+        if active is not None:
+            return active, False
+
+        job = ReportJob(
+            company_id=company_id,
+            report_type=report_type,
+            status=ReportJobStatus.QUEUED,
+            data_version=data_version,
+            start_date=start_date,
+            end_date=end_date,
+            requested_by_tg_id=user_tg_id,
+            chat_id=chat_id,
+            progress_message_id=progress_message_id,
+            created_at=datetime.now(),
+        )
+        try:
+            job = await self.report_job_repo.create_and_get(job)
+        except ReportJobAlreadyExistsError:
+            # A concurrent request queued the same job first (ux_report_job_active)
+            active = await self.report_job_repo.get_active(
+                company_id, report_type.value, data_version, start_date, end_date
+            )
+            if active is None:
+                raise
+            return active, False
+        self.submitted.set()
+        return job, True
+
+    async def get_job(self, job_id: int) -> ReportJob:
+        return await self.report_job_repo.get_by_id(job_id)
+
+    async def claim_next(self) -> ReportJob | None:
+        return await self.report_job_repo.claim_next()
+
+    async def mark_done(self, job_id: int, rows_done: int) -> None:
+        await self.report_job_repo.finish(job_id, ReportJobStatus.DONE.value, rows_done)
+
+    async def mark_failed(self, job_id: int, error: str) -> None:
+        await self.report_job_repo.finish(job_id, ReportJobStatus.FAILED.value, error=error)
+
+    async def requeue_interrupted(self) -> int:
+        """Puts jobs left running by a stopped process back into the queue."""
+        return await self.report_job_repo.requeue_running()
+
+
+report_job_service = ReportJobService(report_job_repo)
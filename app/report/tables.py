@@ -0,0 +1,38 @@
+from sqlalchemy import BigInteger, Column, Date, DateTime, ForeignKey, Index, Integer, String, Table, func, text
+
+from app.core.database import metadata
+
+report_job_table = Table(
+    'report_job',
+    metadata,
+    Column('id', Integer, primary_key=True),
+    Column('company_id', Integer, ForeignKey('company.id', ondelete='CASCADE'), nullable=False),
+    Column('report_type', String, nullable=False),
+    Column('status', String, nullable=False),
+    Column('data_version', BigInteger, nullable=False),
+    Column('start_date', Date, nullable=True),
+    Column('end_date', Date, nullable=True),
+    Column('requested_by_tg_id', BigInteger, nullable=False),
+    Column('chat_id', BigInteger, nullable=False),
+    Column('progress_message_id', BigInteger, nullable=True),
+    Column('rows_done', Integer, nullable=False, default=0),
+    Column('error', String, nullable=True),
+    Column('created_at', DateTime, nullable=False),
+    Column('started_at', DateTime, nullable=True),
+    Column('finished_at', DateTime, nullable=True),
+)
+
+# One queued or running job per report, range and company data (migration 8e1b4d7f2c90);
+# ReportJobService.submit relies on it when two requests race.
+ACTIVE_JOB = text("status IN ('queued', 'running')")
+Index(
+    'ux_report_job_active',
+    report_job_table.c.company_id,
+    report_job_table.c.report_type,
+    report_job_table.c.data_version,
+    func.coalesce(report_job_table.c.start_date, text("'0001-01-01'")),
+    func.coalesce(report_job_table.c.end_date, text("'0001-01-01'")),
+    unique=True,
+    postgresql_where=ACTIVE_JOB,
+    sqlite_where=ACTIVE_JOB,
+)
@@ -0,0 +1,83 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.core.database import get_database
+from app.core.settings import settings
+from app.task.models import CLOSED_TASK_STATUSES
+from app.task.tables import task_archive_table, task_deadline_reminder_table, task_table
+from app.time_tracking.tables import time_tracking_entry_archive_table, time_tracking_entry_table
+
+logger = logging.getLogger(__name__)
+
+
+class TaskArchiver:
+    """Moves closed tasks without recent activity, with their time entries, to the archive tables.
+
+    A task is archived once it is done or canceled, was created more than ``after_days`` days
+    ago and has no time entry newer than that. Each batch of at most ``batch_size`` tasks is
+    copied and deleted in one transaction, so a task is always either hot or archived; the
+    candidate rows are locked with SKIP LOCKED so a task being edited is left for the next run.
+    The project rollup and the daily buckets are not touched: they keep counting archived entries.
+    """
+
+    def __init__(self, after_days: int = 90, batch_size: int = 100, batch_pause: float = 0.5):
+        self.after_days = after_days
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+
+    async def archive(self) -> int:
+        """Archives every eligible task on the current shard, returns how many were moved."""
+        cutoff = datetime.now() - timedelta(days=self.after_days)
+        archived = 0
+        while True:
+            moved = await self._archive_batch(cutoff)
+            archived += moved
+            if moved < self.batch_size:
+                break
+            logger.info("Archiving tasks: %s moved so far", archived)
+            await asyncio.sleep(self.batch_pause)
+        if archived:
+            logger.info("Archived %s tasks closed before %s", archived, cutoff)
+        return archived
+
+    async def _archive_batch(self, cutoff: datetime) -> int:
+        database = get_database()
+        recent_entries = select(time_tracking_entry_table.c.task_id).where(
+            time_tracking_entry_table.c.created_at >= cutoff
+        )
+        candidates = (
+            select(task_table.c.id)
+            .where(
+                task_table.c.status.in_(CLOSED_TASK_STATUSES),
+                task_table.c.created_at < cutoff,
+                task_table.c.id.not_in(recent_entries),
+            )
+            .order_by(task_table.c.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        async with database.transaction():
+            task_ids = [row["id"] for row in await database.primary.fetch_all(candidates)]
+            if not task_ids:
+                return 0
+            entries = time_tracking_entry_table.c.task_id.in_(task_ids)
+            await database.primary.execute(task_archive_table.insert().from_select(
+                [column.name for column in task_table.columns],
+                select(task_table).where(task_table.c.id.in_(task_ids)),
+            ))
+            await database.primary.execute(time_tracking_entry_archive_table.insert().from_select(
+                [column.name for column in time_tracking_entry_table.columns],
+                select(time_tracking_entry_table).where(entries),
+            ))
+            await database.primary.execute(
+                task_deadline_reminder_table.delete().where(task_deadline_reminder_table.c.task_id.in_(task_ids))
+            )
+            await database.primary.execute(time_tracking_entry_table.delete().where(entries))
+            await database.primary.execute(task_table.delete().where(task_table.c.id.in_(task_ids)))
+        return len(task_ids)
+
+
+task_archiver = TaskArchiver(settings.ARCHIVE_AFTER_DAYS, settings.ARCHIVE_BATCH_SIZE, settings.ARCHIVE_BATCH_PAUSE_SECONDS)
@@ -1,119 +1,175 @@
 from datetime import datetime, timedelta
-from sqlalchemy import and_, select, func
+from typing import Sequence
+
+from sqlalchemy import and_, bindparam, exists, or_, select, func
 
 from app.core.crud_base import CrudBase
 from app.core.repo_base import RepoBase
 from app.core.serializer import Serializer, DataclassSerializer
 from app.core.types import DTO, PageData, PaginationParameters
-from app.task.models import Task
-from app.task.tables import task_table
+from app.project.tables import project_table
+from app.task.models import CLOSED_TASK_STATUSES, Task, TaskStatus
+from app.task.tables import task_deadline_reminder_table, task_table, task_with_archive
 from app.task.exceptions import TaskAlreadyExistsError, TaskNotFoundError
-from app.core.database import database
 
 
 class TaskCrud(CrudBase[int, DTO]):
     table = task_table
+    version_column = "version"
+
+    def live_condition(self):
+        # Tasks of a deleted project stay until the purger gets to them, hidden with the project.
+        deleted_projects = select(project_table.c.id).where(project_table.c.deleted_at.is_not(None))
+        return self.table.c.project_id.not_in(deleted_projects)
+
+    def open_condition(self):
+        # The statuses are inlined rather than bound so PostgreSQL can use the partial
+        # ix_task_*_open indexes, whose predicate it cannot match against a parameter.
+        closed = bindparam("closed_statuses", CLOSED_TASK_STATUSES, expanding=True, literal_execute=True)
+        return self.table.c.status.not_in(closed)
+
+    def apply_filters(self, query, filters: dict | None = None):
+        # "open_only" is not a column: it leaves out done and canceled tasks
+        if filters and filters.pop("open_only", False):
+            query = query.where(self.open_condition())
+        return super().apply_filters(query, filters)
 
     async def get_next_code_for_project(self, project_id: int) -> int:
         query = select(func.max(self.table.c.code)).where(self.table.c.project_id == project_id)
         self.log_query(query)
-        max_code = await database.fetch_val(query)
+        max_code = await self.database.fetch_val(query)
         return (max_code or 0) + 1
 
     async def get_by_code(self, code: int) -> DTO | None:
-        query = select(self.table).where(self.table.c.code == code)
+        query = self.exclude_deleted(select(self.table).where(self.table.c.code == code))
         self.log_query(query)
-        return await database.fetch_one(query)
+        return await self.database.fetch_one(query)
 
     async def get_by_code_and_project_id(self, code: int, project_id: int) -> DTO | None:
-        query = select(self.table).where(
-            and_(self.table.c.code == code, self.table.c.project_id == project_id)
-        )
-        self.log_query(query)
-        return await database.fetch_one(query)
+        statement = self.statement("get_by_code_and_project_id", lambda: select(self.table).where(
+            and_(self.table.c.code == bindparam("code"), self.table.c.project_id == bindparam("project_id"))
+        ))
+        return await statement.fetch_one(self.database, code=code, project_id=project_id)
 
     async def get_by_assignee_user_id(
-        self, assignee_user_id: int, pagination: PaginationParameters | None = None
+        self,
+        assignee_user_id: int,
+        pagination: PaginationParameters | None = None,
+        columns: Sequence[str] | None = None,
+        open_only: bool = False,
     ) -> PageData[DTO]:
-        filters = {"assignee_user_id": assignee_user_id}
-        return await self.get_page(filters=filters, pagination=pagination)
+        filters = {"assignee_user_id": assignee_user_id, "open_only": open_only}
+        return await self.get_page_across_shards(filters=filters, pagination=pagination, columns=columns)
 
     async def get_by_project_id(
-        self, project_id: int, pagination: PaginationParameters | None = None
+        self,
+        project_id: int,
+        pagination: PaginationParameters | None = None,
+        columns: Sequence[str] | None = None,
+        open_only: bool = False,
     ) -> PageData[DTO]:
-        filters = {"project_id": project_id}
-        return await self.get_page(filters=filters, pagination=pagination)
+        filters = {"project_id": project_id, "open_only": open_only}
+        return await self.get_page(filters=filters, pagination=pagination, columns=columns)
 
-    async def get_soon_deadlines(self, days: int = 7) -> list[DTO]:
+    async def count_by_status(self, filters: dict) -> dict[str, int]:
+        """Number of tasks matching ``filters`` per status, in one grouped query."""
+        query = select(self.table.c.status, func.count().label("count")).select_from(self.table)
+        query = self.apply_filters(query, dict(filters)).group_by(self.table.c.status)
+        self.log_query(query)
+        rows = await self.database.reader().fetch_all(query)
+        return {row["status"]: row["count"] for row in rows}
+
+    async def count_by_status_across_shards(self, filters: dict) -> dict[str, int]:
+        """``count_by_status`` summed over every shard, for counts that are not scoped to one company."""
+        if not self.shards.enabled:
+            return await self.count_by_status(filters)
+        counts: dict[str, int] = {}
+        for shard_counts in (await self.shards.fan_out(lambda: self.count_by_status(filters))).values():
+            for status, count in shard_counts.items():
+                counts[status] = counts.get(status, 0) + count
+        return counts
+
+    async def get_soon_deadlines(
+        self,
+        days: int = 7,
+        after: tuple[datetime, int] | None = None,
+        limit: int | None = None,
+        unreminded_only: bool = False,
+    ) -> list[DTO]:
         now = datetime.now()
         deadline_limit = now + timedelta(days=days)
-        query = select(self.table).where(
-            and_(
-                self.table.c.deadline >= now,
-                self.table.c.deadline <= deadline_limit
+        conditions = [
+            self.table.c.deadline >= now,
+            self.table.c.deadline <= deadline_limit,
+            self.open_condition(),
+        ]
+        if after is not None:
+            after_deadline, after_id = after
+            conditions.append(self.table.c.deadline >= after_deadline)
+            conditions.append(
+                or_(self.table.c.deadline > after_deadline, self.table.c.id > after_id)
+            )
+        if unreminded_only:
+            reminder = task_deadline_reminder_table
+            conditions.append(
+                ~exists().where(
+                    and_(
+                        reminder.c.task_id == self.table.c.id,
+                        reminder.c.deadline == self.table.c.deadline
+                    )
+                )
             )
-        ).order_by(self.table.c.deadline.asc())
-        self.log_query(query)
-        return await database.fetch_all(query)
-
-    async def update_name(self, task_id: int, name: str) -> DTO:
-        query = (
-            self.table.update()
-            .where(self.table.c.id == task_id)
-            .values(name=name)
-            .returning(self.table)
-        )
-        self.log_query(query)
-        return await database.fetch_one(query)
-
-    async def update_description(self, task_id: int, description: str) -> DTO:
         query = (
-            self.table.update()
-            .where(self.table.c.id == task_id)
-            .values(description=description)
-            .returning(self.table)
+            self.exclude_deleted(select(self.table))
+            .where(and_(*conditions))
+            .order_by(self.table.c.deadline.asc(), self.table.c.id.asc())
         )
+        if limit is not None:
+            query = query.limit(limit)
         self.log_query(query)
-        return await database.fetch_one(query)
+        return await self.database.fetch_all(query)
 
-    async def update_deadline(self, task_id: int, deadline: datetime) -> DTO:
-        query = (
-            self.table.update()
-            .where(self.table.c.id == task_id)
-            .values(deadline=deadline)
-            .returning(self.table)
-        )
-        self.log_query(query)
-        return await database.fetch_one(query)
+    async def mark_deadline_reminders_sent(self, reminders: Sequence[tuple[int, datetime]]) -> None:
+        if not reminders:
+            return
+        reminder = task_deadline_reminder_table
+        sent_at = datetime.now()
+        delete_query = reminder.delete().where(reminder.c.task_id.in_([task_id for task_id, _ in reminders]))
+        insert_query = reminder.insert().values([
+            {"task_id": task_id, "deadline": deadline, "sent_at": sent_at}
+            for task_id, deadline in reminders
+        ])
+        self.log_query(insert_query)
+        async with self.database.transaction():
+            await self.database.execute(delete_query)
+            await self.database.execute(insert_query)
 
-    async def update_assignee(self, task_id: int, assignee_user_id: int) -> DTO:
-        query = (
-            self.table.update()
-            .where(self.table.c.id == task_id)
-            .values(assignee_user_id=assignee_user_id)
-            .returning(self.table)
-        )
-        self.log_query(query)
-        return await database.fetch_one(query)
 
-    async def update_status(self, task_id: int, status: str) -> DTO:
-        query = (
-            self.table.update()
-            .where(self.table.c.id == task_id)
-            .values(status=status)
-            .returning(self.table)
-        )
-        self.log_query(query)
-        return await database.fetch_one(query)
+class TaskWithArchiveCrud(TaskCrud):
+    """Reads over hot and archived tasks."""
+    table = task_with_archive
 
 
 class TaskRepo(RepoBase[int, Task]):
     crud: TaskCrud
 
-    def __init__(self, crud: TaskCrud, serializer: Serializer[Task, DTO]):
+    def __init__(
+        self,
+        crud: TaskCrud,
+        serializer: Serializer[Task, DTO],
+        with_archive_crud: TaskWithArchiveCrud | None = None,
+    ):
         super().__init__(crud, serializer, Task)
         self.not_found_exception_cls = TaskNotFoundError
         self.unique_violation_exception_cls = TaskAlreadyExistsError
+        self.with_archive_crud = with_archive_crud or TaskWithArchiveCrud()
+
+    async def get_by_id(self, id_: int, include_archived: bool = False) -> Task:
+        crud = self.with_archive_crud if include_archived else self.crud
+        dto = await crud.get_by_id(id_)
+        if dto is None:
+            raise self.not_found_exception_cls()
+        return self.serializer.deserialize(dto)
 
     async def get_next_code_for_project(self, project_id: int) -> int:
         return await self.crud.get_next_code_for_project(project_id)
@@ -130,47 +186,51 @@ class TaskRepo(RepoBase[int, Task]):
             return None
         return self.serializer.deserialize(dto)
 
-    async def get_by_assignee_user_id(
-        self, assignee_user_id: int, pagination: PaginationParameters | None = None
-    ) -> PageData[Task]:
-        page_data = await self.crud.get_by_assignee_user_id(assignee_user_id, pagination)
-        return PageData(
-            data=list(self.serializer.flat.deserialize(page_data.data)),
-            total=page_data.total,
-        )
-
-    async def get_by_project_id(
-        self, project_id: int, pagination: PaginationParameters | None = None
-    ) -> PageData[Task]:
-        page_data = await self.crud.get_by_project_id(project_id, pagination)
-        return PageData(
-            data=list(self.serializer.flat.deserialize(page_data.data)),
-            total=page_data.total,
+    async def get_by_assignee_user_id[M](
+        self,
+        assignee_user_id: int,
+        pagination: PaginationParameters | None = None,
+        read_model: type[M] | None = None,
+        open_only: bool = False,
+    ) -> PageData[Task] | PageData[M]:
+        page_data = await self.crud.get_by_assignee_user_id(
+            assignee_user_id, pagination, self.projection(read_model), open_only
         )
-
-    async def get_soon_deadlines(self, days: int = 7) -> list[Task]:
-        dtos = await self.crud.get_soon_deadlines(days)
+        return self.deserialize_page(page_data, read_model)
+
+    async def get_by_project_id[M](
+        self,
+        project_id: int,
+        pagination: PaginationParameters | None = None,
+        read_model: type[M] | None = None,
+        include_archived: bool = False,
+        open_only: bool = False,
+    ) -> PageData[Task] | PageData[M]:
+        # Only closed tasks are archived, so open ones are all in the hot table
+        crud = self.with_archive_crud if include_archived and not open_only else self.crud
+        page_data = await crud.get_by_project_id(project_id, pagination, self.projection(read_model), open_only)
+        return self.deserialize_page(page_data, read_model)
+
+    async def count_by_status_for_assignee(self, assignee_user_id: int) -> dict[str, int]:
+        counts = await self.crud.count_by_status_across_shards({"assignee_user_id": assignee_user_id})
+        return {status.value: counts.get(status.value, 0) for status in TaskStatus}
+
+    async def count_by_status_for_project(self, project_id: int) -> dict[str, int]:
+        counts = await self.crud.count_by_status({"project_id": project_id})
+        return {status.value: counts.get(status.value, 0) for status in TaskStatus}
+
+    async def get_soon_deadlines(
+        self,
+        days: int = 7,
+        after: tuple[datetime, int] | None = None,
+        limit: int | None = None,
+        unreminded_only: bool = False,
+    ) -> list[Task]:
+        dtos = await self.crud.get_soon_deadlines(days, after, limit, unreminded_only)
         return list(self.serializer.flat.deserialize(dtos))
 
-    async def update_name(self, task_id: int, name: str) -> Task:
-        dto = await self.crud.update_name(task_id, name)
-        return self.serializer.deserialize(dto)
-
-    async def update_description(self, task_id: int, description: str) -> Task:
-        dto = await self.crud.update_description(task_id, description)
-        return self.serializer.deserialize(dto)
-
-    async def update_deadline(self, task_id: int, deadline: datetime) -> Task:
-        dto = await self.crud.update_deadline(task_id, deadline)
-        return self.serializer.deserialize(dto)
-
-    async def update_assignee(self, task_id: int, assignee_user_id: int) -> Task:
-        dto = await self.crud.update_assignee(task_id, assignee_user_id)
-        return self.serializer.deserialize(dto)
-
-    async def update_status(self, task_id: int, status: str) -> Task:
-        dto = await self.crud.update_status(task_id, status)
-        return self.serializer.deserialize(dto)
+    async def mark_deadline_reminders_sent(self, tasks: Sequence[Task]) -> None:
+        await self.crud.mark_deadline_reminders_sent([(task.id, task.deadline) for task in tasks])
 
 
 task_repo = TaskRepo(TaskCrud(), DataclassSerializer(Task))
@@ -13,6 +13,9 @@ class TaskStatus(str, Enum):
     CANCELED = "canceled"
 
 
+CLOSED_TASK_STATUSES = (TaskStatus.DONE.value, TaskStatus.CANCELED.value)
+
+
 @dataclass(kw_only=True)
 class Task(Entity):
     project_id: int
@@ -23,3 +26,12 @@ class Task(Entity):
     created_at: datetime
     assignee_user_id: int
     status: TaskStatus = TaskStatus.NEW
+    version: int = 1
+
+
+@dataclass(kw_only=True)
+class TaskListItem(Entity):
+    """Columns shown in task lists."""
+    project_id: int
+    code: int
+    name: str
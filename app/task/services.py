@@ -1,7 +1,8 @@
 from datetime import datetime
+from typing import Sequence
 
 from app.task.dal import TaskCrud, TaskRepo
-from app.task.models import Task
+from app.task.models import Task, TaskListItem
 from app.task.exceptions import (
     TaskAccessDeniedError,
     TaskNotFoundError,
@@ -9,6 +10,8 @@ from app.task.exceptions import (
 from app.project.services import project_service
 from app.employee.services import employee_service
 from app.company.services import company_service
+from app.time_tracking.services import time_tracking_entry_service
+from app.core.database import get_database
 from app.core.serializer import DataclassSerializer
 from app.core.types import PageData, PaginationParameters
 
@@ -56,50 +59,77 @@ class TaskService:
         if not has_access:
             raise TaskAccessDeniedError("Only company owner or admin can delete tasks")
 
-        await self.task_repo.delete(task_id)
+        async with get_database().transaction():
+            await time_tracking_entry_service.remove_task_entries_from_rollup(task_id)
+            await time_tracking_entry_service.remove_task_time_buckets(task_id)
+            await company_service.bump_data_version_for_task(task_id)
+            await self.task_repo.delete(task_id)
 
     async def get_my_tasks(
-        self, user_tg_id: int, pagination: PaginationParameters | None = None
-    ) -> PageData[Task]:
-        return await self.task_repo.get_by_assignee_user_id(user_tg_id, pagination)
+        self, user_tg_id: int, pagination: PaginationParameters | None = None, open_only: bool = False
+    ) -> PageData[TaskListItem]:
+        return await self.task_repo.get_by_assignee_user_id(user_tg_id, pagination, TaskListItem, open_only)
+
+    async def get_my_task_counts(self, user_tg_id: int) -> dict[str, int]:
+        """Number of the user's tasks per status, every status included."""
+        return await self.task_repo.count_by_status_for_assignee(user_tg_id)
 
     async def get_tasks(
-        self, project_id: int, pagination: PaginationParameters | None = None
-    ) -> PageData[Task]:
-        return await self.task_repo.get_by_project_id(project_id, pagination)
+        self,
+        project_id: int,
+        pagination: PaginationParameters | None = None,
+        include_archived: bool = False,
+        open_only: bool = False,
+    ) -> PageData[TaskListItem]:
+        """Tasks of the project; archived ones (closed with no recent activity) only on request."""
+        return await self.task_repo.get_by_project_id(
+            project_id, pagination, TaskListItem, include_archived, open_only
+        )
 
-    async def get_task_details(self, task_id: int) -> Task:
-        return await self.task_repo.get_by_id(task_id)
+    async def get_task_counts(self, project_id: int) -> dict[str, int]:
+        """Number of the project's hot tasks per status, every status included."""
+        return await self.task_repo.count_by_status_for_project(project_id)
+
+    async def get_task_details(self, task_id: int, include_archived: bool = False) -> Task:
+        return await self.task_repo.get_by_id(task_id, include_archived)
 
-    async def edit_name(self, task_id: int, name: str, user_tg_id: int) -> Task:
+    async def edit_name(
+        self, task_id: int, name: str, user_tg_id: int, expected_version: int | None = None
+    ) -> Task:
         task = await self.task_repo.get_by_id(task_id)
 
         has_access = await self.verify_user_has_access_to_project(task.project_id, user_tg_id)
         if not has_access:
             raise TaskAccessDeniedError("Only company owner or admin can edit task name")
 
-        return await self.task_repo.update_name(task_id, name)
+        async with get_database().transaction():
+            await company_service.bump_data_version_for_task(task_id)
+            return await self.task_repo.patch(task_id, expected_version, name=name)
 
-    async def edit_description(self, task_id: int, description: str, user_tg_id: int) -> Task:
+    async def edit_description(
+        self, task_id: int, description: str, user_tg_id: int, expected_version: int | None = None
+    ) -> Task:
         task = await self.task_repo.get_by_id(task_id)
 
         has_access = await self.verify_user_has_access_to_project(task.project_id, user_tg_id)
         if not has_access:
             raise TaskAccessDeniedError("Only company owner or admin can edit task description")
 
-        return await self.task_repo.update_description(task_id, description)
+        return await self.task_repo.patch(task_id, expected_version, description=description)
 
-    async def set_deadline(self, task_id: int, deadline: datetime, user_tg_id: int) -> Task:
+    async def set_deadline(
+        self, task_id: int, deadline: datetime, user_tg_id: int, expected_version: int | None = None
+    ) -> Task:
         task = await self.task_repo.get_by_id(task_id)
 
         has_access = await self.verify_user_has_access_to_project(task.project_id, user_tg_id)
         if not has_access:
             raise TaskAccessDeniedError("Only company owner or admin can set task deadline")
 
-        return await self.task_repo.update_deadline(task_id, deadline)
+        return await self.task_repo.patch(task_id, expected_version, deadline=deadline)
 
     async def assign_to_user(
-        self, task_id: int, assignee_user_id: int, user_tg_id: int
+        self, task_id: int, assignee_user_id: int, user_tg_id: int, expected_version: int | None = None
     ) -> Task:
         task = await self.task_repo.get_by_id(task_id)
 
@@ -107,18 +137,29 @@ class TaskService:
         if not has_access:
             raise TaskAccessDeniedError("Only company owner or admin can assign tasks")
 
-        return await self.task_repo.update_assignee(task_id, assignee_user_id)
+        return await self.task_repo.patch(task_id, expected_version, assignee_user_id=assignee_user_id)
 
-    async def update_status(self, task_id: int, status: str, user_tg_id: int) -> Task:
+    async def update_status(
+        self, task_id: int, status: str, user_tg_id: int, expected_version: int | None = None
+    ) -> Task:
         task = await self.task_repo.get_by_id(task_id)
         has_access = await self.verify_user_has_access_to_project(task.project_id, user_tg_id)
         if not has_access:
             raise TaskAccessDeniedError("Only company owner or admin can change task status")
 
-        return await self.task_repo.update_status(task_id, status)
+        return await self.task_repo.patch(task_id, expected_version, status=status)
 
-    async def get_soon_deadlines(self, days: int = 7) -> list[Task]:
-        return await self.task_repo.get_soon_deadlines(days)
+    async def get_soon_deadlines(
+        self,
+        days: int = 7,
+        after: tuple[datetime, int] | None = None,
+        limit: int | None = None,
+        unreminded_only: bool = False,
+    ) -> list[Task]:
+        return await self.task_repo.get_soon_deadlines(days, after, limit, unreminded_only)
+
+    async def mark_deadline_reminders_sent(self, tasks: Sequence[Task]) -> None:
+        await self.task_repo.mark_deadline_reminders_sent(tasks)
 
     async def get_task_by_full_code(self, company_code: str, project_code: str, task_code: int) -> Task:
         company = await company_service.company_repo.get_by_code(company_code.upper())
@@ -1,5 +1,6 @@
 from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Table, BigInteger, CheckConstraint
 
+from app.core.archive import archive_table, with_archive
 from app.core.database import metadata
 from app.task.models import TaskStatus
 
@@ -15,8 +16,21 @@ task_table = Table(
     Column('created_at', DateTime, nullable=False),
     Column('assignee_user_id', BigInteger, nullable=False),
     Column('status', String, nullable=False, server_default=TaskStatus.NEW.value),
+    Column('version', Integer, nullable=False, server_default='1'),
     CheckConstraint(
         f"status IN ('{TaskStatus.NEW.value}', '{TaskStatus.IN_PROGRESS.value}', '{TaskStatus.REVIEW.value}', '{TaskStatus.DONE.value}', '{TaskStatus.CANCELED.value}')",
         name='task_status_check'
     ),
 )
+
+task_deadline_reminder_table = Table(
+    'task_deadline_reminder',
+    metadata,
+    Column('task_id', Integer, ForeignKey('task.id', ondelete='CASCADE'), primary_key=True),
+    Column('deadline', DateTime, nullable=False),
+    Column('sent_at', DateTime, nullable=False),
+)
+
+# Closed tasks without recent activity, moved out by TaskArchiver
+task_archive_table = archive_table(task_table)
+task_with_archive = with_archive(task_table, task_archive_table)
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+from collections import defaultdict
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError, TelegramBadRequest, TelegramForbiddenError
+
+from app.core.periodic import run_periodically
+from app.core.sharding import get_shard_map
+from app.task.models import Task
+from app.task.services import TaskService
+from app.tg_bot.utils.formatters import format_deadline_reminder
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineReminderScheduler:
+    """Periodically reminds assignees about open tasks whose deadline is close.
+
+    Tasks are scanned in ``(deadline, id)`` order in batches of ``batch_size``; every task
+    that got a reminder is recorded together with its deadline right after its message is
+    sent, so later scans skip it until the deadline is changed. Tasks of an assignee the bot
+    cannot write to are recorded too; tasks whose message failed for another reason are left
+    for the next scan.
+    """
+
+    max_tasks_per_message = 30
+
+    def __init__(
+        self,
+        bot: Bot,
+        task_service: TaskService,
+        days: int = 1,
+        interval: float = 600,
+        batch_size: int = 500,
+        batch_pause: float = 1.0,
+    ):
+        self.bot = bot
+        self.task_service = task_service
+        self.days = days
+        self.interval = interval
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+
+    async def run(self) -> None:
+        await run_periodically(lambda: get_shard_map().for_each(self.scan), self.interval, "deadline reminders")
+
+    async def scan(self) -> int:
+        sent = 0
+        after = None
+        while True:
+            tasks = await self.task_service.get_soon_deadlines(
+                self.days, after=after, limit=self.batch_size, unreminded_only=True
+            )
+            if not tasks:
+                break
+
+            sent += await self.send_reminders(tasks)
+
+            if len(tasks) < self.batch_size:
+                break
+            after = (tasks[-1].deadline, tasks[-1].id)
+            await asyncio.sleep(self.batch_pause)
+        if sent:
+            logger.info("Sent %s deadline reminder messages", sent)
+        return sent
+
+    async def send_reminders(self, tasks: list[Task]) -> int:
+        tasks_by_assignee: dict[int, list[Task]] = defaultdict(list)
+        for task in tasks:
+            tasks_by_assignee[task.assignee_user_id].append(task)
+
+        sent = 0
+        for assignee_user_id, assignee_tasks in tasks_by_assignee.items():
+            for start in range(0, len(assignee_tasks), self.max_tasks_per_message):
+                chunk = assignee_tasks[start:start + self.max_tasks_per_message]
+                try:
+                    await self.bot.send_message(
+                        assignee_user_id, format_deadline_reminder(chunk), parse_mode="HTML"
+                    )
+                except (TelegramForbiddenError, TelegramBadRequest) as e:
+                    logger.warning("Cannot send deadline reminder to %s: %s", assignee_user_id, e)
+                    await self.task_service.mark_deadline_reminders_sent(assignee_tasks[start:])
+                    break
+                except TelegramAPIError as e:
+                    logger.warning("Deadline reminder to %s failed, will retry: %s", assignee_user_id, e)
+                    break
+                sent += 1
+                await self.task_service.mark_deadline_reminders_sent(chunk)
+        return sent
@@ -1,22 +1,24 @@
-import csv
-import io
 from aiogram import Router, F
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
-from aiogram.types import Message, CallbackQuery, BufferedInputFile
+from aiogram.types import Message, CallbackQuery
 
 from app.company.services import company_service
-from app.time_tracking.services import time_tracking_entry_service
 from app.core.exceptions import ApplicationError
+from app.report.models import ReportType
+from app.report.services import report_job_service
 from app.tg_bot.states.company import CompanyCreation
 from app.tg_bot.utils.callback_data import CompanyCallback
+from app.tg_bot.report_worker import REPORTS
 from app.tg_bot.utils.formatters import format_company_details
+from app.tg_bot.utils.stats_ranges import format_stats_range, resolve_stats_range
 from app.tg_bot.utils.pagination import get_pagination_params, calculate_total_pages
 from app.tg_bot.utils.error_handlers import handle_service_error
 from app.tg_bot.keyboards.inline import (
     build_list_keyboard,
     build_company_details_keyboard,
     build_confirm_keyboard,
+    build_stats_range_keyboard,
 )
 
 
@@ -184,7 +186,9 @@ async def callback_back_to_list(callback: CallbackQuery):
     await callback.answer()
 
 
-async def callback_export_project_stats(callback: CallbackQuery, callback_data: CompanyCallback):
+async def submit_stats_report(
+    callback: CallbackQuery, callback_data: CompanyCallback, report_type: ReportType
+):
     company_id = callback_data.company_id
     user_tg_id = callback.from_user.id
 
@@ -194,82 +198,50 @@ async def callback_export_project_stats(callback: CallbackQuery, callback_data:
             await callback.answer("Only company owner can export statistics", show_alert=True)
             return
 
-        company = await company_service.get_company_details(company_id)
-        rows = await time_tracking_entry_service.get_project_stats_for_company(company_id)
-
-        if not rows:
-            await callback.answer("No time tracking data available for export", show_alert=True)
+        title = REPORTS[report_type].title
+        if not callback_data.range:
+            await callback.message.edit_text(
+                f"<b>{title}</b>\n\nChoose the period to export:",
+                reply_markup=build_stats_range_keyboard(company_id, callback_data.action),
+                parse_mode="HTML"
+            )
+            await callback.answer()
             return
 
-        output = io.StringIO()
-        fieldnames = ["company_code", "project_code", "total_hours_spent", "total_money_spent"]
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
-
-        csv_bytes = output.getvalue().encode('utf-8')
-        output.close()
-
-        filename = f"{company.code}_project_stats.csv"
-        document = BufferedInputFile(csv_bytes, filename=filename)
-
-        await callback.message.answer_document(
-            document=document,
-            caption=f"📊 Project statistics for {company.name}"
+        start_date, end_date = resolve_stats_range(callback_data.range)
+        progress = await callback.message.answer(
+            f"⏳ Generating {title.lower()} ({format_stats_range(start_date, end_date)})…"
         )
-        await callback.answer("CSV file generated successfully!")
+        try:
+            _, created = await report_job_service.submit(
+                company_id,
+                report_type,
+                chat_id=callback.message.chat.id,
+                user_tg_id=user_tg_id,
+                progress_message_id=progress.message_id,
+                start_date=start_date,
+                end_date=end_date,
+            )
+        except Exception:
+            # No job will ever edit the progress message, don't leave it spinning
+            await progress.delete()
+            raise
+        if not created:
+            await progress.delete()
+            await callback.answer(f"{title} are already being generated", show_alert=True)
+            return
+        await callback.answer()
 
     except ApplicationError as e:
         await handle_service_error(e, callback)
 
 
-async def callback_export_employee_stats(callback: CallbackQuery, callback_data: CompanyCallback):
-    company_id = callback_data.company_id
-    user_tg_id = callback.from_user.id
-
-    try:
-        is_owner = await company_service.verify_user_is_owner(company_id, user_tg_id)
-        if not is_owner:
-            await callback.answer("Only company owner can export statistics", show_alert=True)
-            return
-
-        company = await company_service.get_company_details(company_id)
-        rows = await time_tracking_entry_service.get_employee_stats_for_company(company_id)
-
-        if not rows:
-            await callback.answer("No time tracking data available for export", show_alert=True)
-            return
+async def callback_export_project_stats(callback: CallbackQuery, callback_data: CompanyCallback):
+    await submit_stats_report(callback, callback_data, ReportType.PROJECT_STATS)
 
-        output = io.StringIO()
-        fieldnames = [
-            "company_code",
-            "project_code",
-            "task_code",
-            "task_name",
-            "employee_display_name",
-            "created_at",
-            "duration_minutes",
-            "salary",
-            "employee_total_minutes",
-        ]
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
-
-        csv_bytes = output.getvalue().encode('utf-8')
-        output.close()
-
-        filename = f"{company.code}_employee_stats.csv"
-        document = BufferedInputFile(csv_bytes, filename=filename)
-
-        await callback.message.answer_document(
-            document=document,
-            caption=f"📊 Employee statistics for {company.name}"
-        )
-        await callback.answer("CSV file generated successfully!")
 
-    except ApplicationError as e:
-        await handle_service_error(e, callback)
+async def callback_export_employee_stats(callback: CallbackQuery, callback_data: CompanyCallback):
+    await submit_stats_report(callback, callback_data, ReportType.EMPLOYEE_STATS)
 
 
 def register_company_handlers(router: Router):
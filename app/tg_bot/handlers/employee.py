@@ -6,16 +6,20 @@ from aiogram.types import Message, CallbackQuery
 from app.company.services import company_service
 from app.employee.services import employee_service
 from app.core.exceptions import ApplicationError
+from app.time_tracking.services import time_tracking_entry_service
 from app.tg_bot.states.employee import EmployeeCreation, EmployeeModification
 from app.tg_bot.utils.callback_data import CompanyCallback, EmployeeCallback
-from app.tg_bot.utils.formatters import format_employee_details
+from app.tg_bot.utils.formatters import format_employee_details, format_employee_history
 from app.tg_bot.utils.pagination import get_pagination_params, calculate_total_pages
 from app.tg_bot.utils.error_handlers import handle_service_error
 from app.tg_bot.keyboards.inline import (
     build_list_keyboard,
     build_employee_details_keyboard,
+    build_employee_history_keyboard,
 )
 
+HISTORY_PAGE_SIZE = 10
+
 
 async def cmd_new_employee(message: Message, state: FSMContext):
     user_tg_id = message.from_user.id
@@ -265,7 +269,36 @@ async def callback_employee_details(callback: CallbackQuery, callback_data: Empl
         is_admin = await employee_service.verify_user_is_owner_or_admin(employee.company_id, user_tg_id)
 
         text = format_employee_details(employee)
-        keyboard = build_employee_details_keyboard(employee_id, employee.company_id, is_admin, employee.is_active)
+        keyboard = build_employee_details_keyboard(
+            employee_id, employee.company_id, is_admin, employee.is_active, employee.version,
+            is_self=employee.telegram_id == user_tg_id,
+        )
+
+        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
+        await callback.answer()
+    except ApplicationError as e:
+        await handle_service_error(e, callback)
+
+
+async def callback_employee_history(callback: CallbackQuery, callback_data: EmployeeCallback):
+    employee_id = callback_data.employee_id
+    before_id = callback_data.before_id or None
+    user_tg_id = callback.from_user.id
+
+    try:
+        employee = await employee_service.get_employee_details(employee_id)
+        is_admin = await employee_service.verify_user_is_owner_or_admin(employee.company_id, user_tg_id)
+        if not is_admin and employee.telegram_id != user_tg_id:
+            await callback.answer("You don't have permission to perform this action", show_alert=True)
+            return
+
+        page = await time_tracking_entry_service.get_employee_history_page(
+            employee_id, before_id, page_size=HISTORY_PAGE_SIZE, include_archived=True
+        )
+        text = format_employee_history(employee, page.data, is_first_page=before_id is None)
+        keyboard = build_employee_history_keyboard(
+            employee_id, employee.company_id, page.next_cursor, is_first_page=before_id is None
+        )
 
         await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
         await callback.answer()
@@ -277,7 +310,7 @@ async def callback_set_display_name(callback: CallbackQuery, callback_data: Empl
     employee_id = callback_data.employee_id
     company_id = callback_data.company_id
 
-    await state.update_data(employee_id=employee_id, company_id=company_id)
+    await state.update_data(employee_id=employee_id, company_id=company_id, version=callback_data.version or None)
     await state.set_state(EmployeeModification.waiting_for_display_name)
     await callback.message.edit_text("Enter new display name:")
     await callback.answer()
@@ -290,11 +323,14 @@ async def process_new_display_name(message: Message, state: FSMContext):
     user_tg_id = message.from_user.id
 
     try:
-        employee = await employee_service.set_display_name(employee_id, message.text, user_tg_id)
+        employee = await employee_service.set_display_name(employee_id, message.text, user_tg_id, data.get('version'))
         is_admin = await employee_service.verify_user_is_owner_or_admin(company_id, user_tg_id)
 
         text = f"✅ Display name updated!\n\n{format_employee_details(employee)}"
-        keyboard = build_employee_details_keyboard(employee_id, company_id, is_admin, employee.is_active)
+        keyboard = build_employee_details_keyboard(
+            employee_id, company_id, is_admin, employee.is_active, employee.version,
+            is_self=employee.telegram_id == user_tg_id,
+        )
 
         await message.answer(text, reply_markup=keyboard, parse_mode="HTML")
         await state.clear()
@@ -307,7 +343,7 @@ async def callback_set_salary(callback: CallbackQuery, callback_data: EmployeeCa
     employee_id = callback_data.employee_id
     company_id = callback_data.company_id
 
-    await state.update_data(employee_id=employee_id, company_id=company_id)
+    await state.update_data(employee_id=employee_id, company_id=company_id, version=callback_data.version or None)
     await state.set_state(EmployeeModification.waiting_for_salary)
     await callback.message.edit_text("Enter new salary per hour (e.g., 25.50):")
     await callback.answer()
@@ -325,11 +361,14 @@ async def process_new_salary(message: Message, state: FSMContext):
             await message.answer("❌ Salary must be a positive number. Please try again:")
             return
 
-        employee = await employee_service.set_salary_per_hour(employee_id, salary, user_tg_id)
+        employee = await employee_service.set_salary_per_hour(employee_id, salary, user_tg_id, data.get('version'))
         is_admin = await employee_service.verify_user_is_owner_or_admin(company_id, user_tg_id)
 
         text = f"✅ Salary updated!\n\n{format_employee_details(employee)}"
-        keyboard = build_employee_details_keyboard(employee_id, company_id, is_admin, employee.is_active)
+        keyboard = build_employee_details_keyboard(
+            employee_id, company_id, is_admin, employee.is_active, employee.version,
+            is_self=employee.telegram_id == user_tg_id,
+        )
 
         await message.answer(text, reply_markup=keyboard, parse_mode="HTML")
         await state.clear()
@@ -349,12 +388,17 @@ async def callback_toggle_active(callback: CallbackQuery, callback_data: Employe
         employee = await employee_service.get_employee_details(employee_id)
         new_status = not employee.is_active
 
-        employee = await employee_service.set_is_active(employee_id, new_status, user_tg_id)
+        employee = await employee_service.set_is_active(
+            employee_id, new_status, user_tg_id, callback_data.version or None
+        )
         is_admin = await employee_service.verify_user_is_owner_or_admin(company_id, user_tg_id)
 
         status_msg = "activated" if new_status else "deactivated"
         text = f"✅ Employee {status_msg}!\n\n{format_employee_details(employee)}"
-        keyboard = build_employee_details_keyboard(employee_id, company_id, is_admin, employee.is_active)
+        keyboard = build_employee_details_keyboard(
+            employee_id, company_id, is_admin, employee.is_active, employee.version,
+            is_self=employee.telegram_id == user_tg_id,
+        )
 
         await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
         await callback.answer()
@@ -417,6 +461,10 @@ def register_employee_handlers(router: Router):
         callback_employee_details,
         EmployeeCallback.filter(F.action == "details")
     )
+    router.callback_query.register(
+        callback_employee_history,
+        EmployeeCallback.filter(F.action == "history")
+    )
     router.callback_query.register(
         callback_set_display_name,
         EmployeeCallback.filter(F.action == "set_display_name")
@@ -10,10 +10,10 @@ from app.project.services import project_service
 from app.task.services import task_service
 from app.time_tracking.services import time_tracking_entry_service
 from app.core.exceptions import ApplicationError
-from app.core.database import database
+from app.core.database import get_database
 from app.tg_bot.states.task import TaskCreation, TaskModification, TimeTracking
 from app.tg_bot.utils.callback_data import CompanyCallback, ProjectCallback, TaskCallback, EmployeeCallback
-from app.tg_bot.utils.formatters import format_task_details
+from app.tg_bot.utils.formatters import format_task_counts, format_task_details
 from app.tg_bot.utils.pagination import get_pagination_params, calculate_total_pages
 from app.tg_bot.utils.error_handlers import handle_service_error
 from app.tg_bot.keyboards.inline import (
@@ -220,7 +220,7 @@ async def callback_select_employee_for_task_assignee(callback: CallbackQuery, ca
         if current_state == TaskCreation.waiting_for_assignee:
             time_spent = data.get('time_spent')
 
-            async with database.transaction():
+            async with get_database().transaction():
                 task = await task_service.create_task(
                     project_id=data['project_id'],
                     name=data['name'],
@@ -248,7 +248,7 @@ async def callback_select_employee_for_task_assignee(callback: CallbackQuery, ca
             task_id = data['task_id']
             project_id = data['project_id']
 
-            task = await task_service.assign_to_user(task_id, assignee_user_id, user_tg_id)
+            task = await task_service.assign_to_user(task_id, assignee_user_id, user_tg_id, data.get('version'))
             project = await project_service.get_project_details(project_id)
 
             is_admin = await employee_service.verify_user_is_owner_or_admin(project.company_id, user_tg_id)
@@ -256,7 +256,7 @@ async def callback_select_employee_for_task_assignee(callback: CallbackQuery, ca
 
             tracked_minutes = await get_tracked_minutes_for_user(task_id, project.company_id, user_tg_id)
             text = f"✅ Task assigned successfully!\n\n{format_task_details(task, tracked_minutes)}"
-            keyboard = build_task_details_keyboard(task_id, project_id, is_admin, is_assignee)
+            keyboard = build_task_details_keyboard(task_id, project_id, is_admin, is_assignee, task.version)
 
             await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
             await state.clear()
@@ -298,14 +298,15 @@ async def cmd_my_tasks(message: Message):
     page = 1
 
     pagination = get_pagination_params(page, page_size=5)
-    page_data = await task_service.get_my_tasks(user_tg_id, pagination)
+    page_data = await task_service.get_my_tasks(user_tg_id, pagination, open_only=True)
 
     if not page_data.data:
-        await message.answer("You don't have any tasks assigned to you yet.")
+        await message.answer("You don't have any open tasks assigned to you.")
         return
 
+    counts = await task_service.get_my_task_counts(user_tg_id)
     total_pages = calculate_total_pages(page_data.total, page_size=5)
-    text = f"<b>My Tasks</b> (Page {page}/{total_pages}):\n\n"
+    text = f"<b>My Open Tasks</b> (Page {page}/{total_pages}):\n{format_task_counts(counts)}\n\n"
 
     items = [
         (f"#{t.code} - {t.name}", TaskCallback(action="details", task_id=t.id, project_id=t.project_id))
@@ -375,7 +376,7 @@ async def handle_task_id_shortcut(message: Message):
         tracked_minutes = await get_tracked_minutes_for_user(task.id, project.company_id, user_tg_id)
 
         text = format_task_details(task, tracked_minutes)
-        keyboard = build_task_details_keyboard(task.id, task.project_id, is_admin, is_assignee)
+        keyboard = build_task_details_keyboard(task.id, task.project_id, is_admin, is_assignee, task.version)
 
         await message.answer(text, reply_markup=keyboard, parse_mode="HTML")
 
@@ -470,10 +471,11 @@ async def callback_task_page(callback: CallbackQuery, callback_data: TaskCallbac
     else:
         user_tg_id = callback.from_user.id
         pagination = get_pagination_params(page, page_size=5)
-        page_data = await task_service.get_my_tasks(user_tg_id, pagination)
+        page_data = await task_service.get_my_tasks(user_tg_id, pagination, open_only=True)
+        counts = await task_service.get_my_task_counts(user_tg_id)
 
         total_pages = calculate_total_pages(page_data.total, page_size=5)
-        text = f"<b>My Tasks</b> (Page {page}/{total_pages}):\n\n"
+        text = f"<b>My Open Tasks</b> (Page {page}/{total_pages}):\n{format_task_counts(counts)}\n\n"
 
         items = [
             (f"#{t.code} - {t.name}", TaskCallback(action="details", task_id=t.id, project_id=t.project_id))
@@ -504,7 +506,7 @@ async def callback_task_details(callback: CallbackQuery, callback_data: TaskCall
 
         tracked_minutes = await get_tracked_minutes_for_user(task_id, project.company_id, user_tg_id)
         text = format_task_details(task, tracked_minutes)
-        keyboard = build_task_details_keyboard(task_id, task.project_id, is_admin, is_assignee)
+        keyboard = build_task_details_keyboard(task_id, task.project_id, is_admin, is_assignee, task.version)
 
         await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
         await callback.answer()
@@ -557,7 +559,7 @@ async def process_time_duration(message: Message, state: FSMContext):
 
         tracked_minutes = await get_tracked_minutes_for_user(task_id, project.company_id, user_tg_id)
         text = f"✅ Tracked {duration_minutes} minutes for this task!\n\n{format_task_details(task, tracked_minutes)}"
-        keyboard = build_task_details_keyboard(task_id, project_id, is_admin, is_assignee)
+        keyboard = build_task_details_keyboard(task_id, project_id, is_admin, is_assignee, task.version)
 
         await message.answer(text, reply_markup=keyboard, parse_mode="HTML")
         await state.clear()
@@ -572,7 +574,7 @@ async def callback_edit_name(callback: CallbackQuery, callback_data: TaskCallbac
     task_id = callback_data.task_id
     project_id = callback_data.project_id
 
-    await state.update_data(task_id=task_id, project_id=project_id)
+    await state.update_data(task_id=task_id, project_id=project_id, version=callback_data.version or None)
     await state.set_state(TaskModification.waiting_for_name)
     await callback.message.edit_text("Enter new task name:")
     await callback.answer()
@@ -585,7 +587,7 @@ async def process_new_task_name(message: Message, state: FSMContext):
     user_tg_id = message.from_user.id
 
     try:
-        task = await task_service.edit_name(task_id, message.text, user_tg_id)
+        task = await task_service.edit_name(task_id, message.text, user_tg_id, data.get('version'))
         project = await project_service.get_project_details(project_id)
 
         is_admin = await employee_service.verify_user_is_owner_or_admin(project.company_id, user_tg_id)
@@ -593,7 +595,7 @@ async def process_new_task_name(message: Message, state: FSMContext):
 
         tracked_minutes = await get_tracked_minutes_for_user(task_id, project.company_id, user_tg_id)
         text = f"✅ Task name updated!\n\n{format_task_details(task, tracked_minutes)}"
-        keyboard = build_task_details_keyboard(task_id, project_id, is_admin, is_assignee)
+        keyboard = build_task_details_keyboard(task_id, project_id, is_admin, is_assignee, task.version)
 
         await message.answer(text, reply_markup=keyboard, parse_mode="HTML")
         await state.clear()
@@ -606,7 +608,7 @@ async def callback_edit_description(callback: CallbackQuery, callback_data: Task
     task_id = callback_data.task_id
     project_id = callback_data.project_id
 
-    await state.update_data(task_id=task_id, project_id=project_id)
+    await state.update_data(task_id=task_id, project_id=project_id, version=callback_data.version or None)
     await state.set_state(TaskModification.waiting_for_description)
     await callback.message.edit_text("Enter new task description:")
     await callback.answer()
@@ -619,7 +621,7 @@ async def process_new_task_description(message: Message, state: FSMContext):
     user_tg_id = message.from_user.id
 
     try:
-        task = await task_service.edit_description(task_id, message.text, user_tg_id)
+        task = await task_service.edit_description(task_id, message.text, user_tg_id, data.get('version'))
         project = await project_service.get_project_details(project_id)
 
         is_admin = await employee_service.verify_user_is_owner_or_admin(project.company_id, user_tg_id)
@@ -627,7 +629,7 @@ async def process_new_task_description(message: Message, state: FSMContext):
 
         tracked_minutes = await get_tracked_minutes_for_user(task_id, project.company_id, user_tg_id)
         text = f"✅ Task description updated!\n\n{format_task_details(task, tracked_minutes)}"
-        keyboard = build_task_details_keyboard(task_id, project_id, is_admin, is_assignee)
+        keyboard = build_task_details_keyboard(task_id, project_id, is_admin, is_assignee, task.version)
 
         await message.answer(text, reply_markup=keyboard, parse_mode="HTML")
         await state.clear()
@@ -640,7 +642,7 @@ async def callback_set_deadline(callback: CallbackQuery, callback_data: TaskCall
     task_id = callback_data.task_id
     project_id = callback_data.project_id
 
-    await state.update_data(task_id=task_id, project_id=project_id)
+    await state.update_data(task_id=task_id, project_id=project_id, version=callback_data.version or None)
     await state.set_state(TaskModification.waiting_for_deadline)
     await callback.message.edit_text(
         "Enter new deadline:\n"
@@ -660,7 +662,7 @@ async def process_new_task_deadline(message: Message, state: FSMContext):
 
     try:
         deadline = parse_flexible_deadline(message.text)
-        task = await task_service.set_deadline(task_id, deadline, user_tg_id)
+        task = await task_service.set_deadline(task_id, deadline, user_tg_id, data.get('version'))
         project = await project_service.get_project_details(project_id)
 
         is_admin = await employee_service.verify_user_is_owner_or_admin(project.company_id, user_tg_id)
@@ -668,7 +670,7 @@ async def process_new_task_deadline(message: Message, state: FSMContext):
 
         tracked_minutes = await get_tracked_minutes_for_user(task_id, project.company_id, user_tg_id)
         text = f"✅ Task deadline updated!\n\n{format_task_details(task, tracked_minutes)}"
-        keyboard = build_task_details_keyboard(task_id, project_id, is_admin, is_assignee)
+        keyboard = build_task_details_keyboard(task_id, project_id, is_admin, is_assignee, task.version)
 
         await message.answer(text, reply_markup=keyboard, parse_mode="HTML")
         await state.clear()
@@ -701,7 +703,7 @@ async def callback_assign(callback: CallbackQuery, callback_data: TaskCallback,
             await callback.answer("❌ This company has no employees", show_alert=True)
             return
 
-        await state.update_data(task_id=task_id, project_id=project_id)
+        await state.update_data(task_id=task_id, project_id=project_id, version=callback_data.version or None)
         await state.set_state(TaskModification.waiting_for_assignee)
 
         total_pages = calculate_total_pages(page_data.total, page_size=5)
@@ -729,7 +731,7 @@ async def callback_change_status(callback: CallbackQuery, callback_data: TaskCal
     task_id = callback_data.task_id
     project_id = callback_data.project_id
 
-    keyboard = build_status_selection_keyboard(task_id, project_id)
+    keyboard = build_status_selection_keyboard(task_id, project_id, callback_data.version)
     await callback.message.edit_text("Select new status:", reply_markup=keyboard)
     await callback.answer()
 
@@ -741,7 +743,7 @@ async def callback_set_status(callback: CallbackQuery, callback_data: TaskCallba
     user_tg_id = callback.from_user.id
 
     try:
-        task = await task_service.update_status(task_id, status, user_tg_id)
+        task = await task_service.update_status(task_id, status, user_tg_id, callback_data.version or None)
         project = await project_service.get_project_details(project_id)
 
         is_admin = await employee_service.verify_user_is_owner_or_admin(project.company_id, user_tg_id)
@@ -749,7 +751,7 @@ async def callback_set_status(callback: CallbackQuery, callback_data: TaskCallba
 
         tracked_minutes = await get_tracked_minutes_for_user(task_id, project.company_id, user_tg_id)
         text = f"✅ Status updated!\n\n{format_task_details(task, tracked_minutes)}"
-        keyboard = build_task_details_keyboard(task_id, project_id, is_admin, is_assignee)
+        keyboard = build_task_details_keyboard(task_id, project_id, is_admin, is_assignee, task.version)
 
         await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
         await callback.answer()
@@ -813,10 +815,11 @@ async def callback_task_back_to_list(callback: CallbackQuery, callback_data: Tas
     else:
         user_tg_id = callback.from_user.id
         pagination = get_pagination_params(page, page_size=5)
-        page_data = await task_service.get_my_tasks(user_tg_id, pagination)
+        page_data = await task_service.get_my_tasks(user_tg_id, pagination, open_only=True)
+        counts = await task_service.get_my_task_counts(user_tg_id)
 
         total_pages = calculate_total_pages(page_data.total, page_size=5)
-        text = f"<b>My Tasks</b> (Page {page}/{total_pages}):\n\n"
+        text = f"<b>My Open Tasks</b> (Page {page}/{total_pages}):\n{format_task_counts(counts)}\n\n"
 
         items = [
             (f"#{t.code} - {t.name}", TaskCallback(action="details", task_id=t.id, project_id=t.project_id))
@@ -84,6 +84,32 @@ def build_company_details_keyboard(company_id: int, is_owner: bool) -> InlineKey
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+def build_stats_range_keyboard(company_id: int, action: str) -> InlineKeyboardMarkup:
+    from app.tg_bot.utils.callback_data import CompanyCallback
+    from app.tg_bot.utils.stats_ranges import STATS_RANGES
+
+    buttons = []
+    row = []
+    for range_name, label in STATS_RANGES.items():
+        row.append(InlineKeyboardButton(
+            text=label,
+            callback_data=CompanyCallback(action=action, company_id=company_id, range=range_name).pack()
+        ))
+        if len(row) == 2:
+            buttons.append(row)
+            row = []
+    if row:
+        buttons.append(row)
+
+    back_callback = CompanyCallback(action="details", company_id=company_id)
+    buttons.append([InlineKeyboardButton(
+        text="◀️ Back",
+        callback_data=back_callback.pack()
+    )])
+
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+
 def build_project_details_keyboard(project_id: int, company_id: int, is_owner_or_admin: bool) -> InlineKeyboardMarkup:
     from app.tg_bot.utils.callback_data import ProjectCallback
 
@@ -109,7 +135,9 @@ def build_employee_details_keyboard(
     employee_id: int,
     company_id: int,
     is_admin: bool,
-    is_active: bool
+    is_active: bool,
+    version: int = 0,
+    is_self: bool = False
 ) -> InlineKeyboardMarkup:
     from app.tg_bot.utils.callback_data import EmployeeCallback
 
@@ -118,18 +146,24 @@ def build_employee_details_keyboard(
     if is_admin:
         buttons.append([InlineKeyboardButton(
             text="✏️ Set Display Name",
-            callback_data=EmployeeCallback(action="set_display_name", employee_id=employee_id, company_id=company_id).pack()
+            callback_data=EmployeeCallback(action="set_display_name", employee_id=employee_id, company_id=company_id, version=version).pack()
         )])
 
         buttons.append([InlineKeyboardButton(
             text="💰 Set Salary/Hour",
-            callback_data=EmployeeCallback(action="set_salary", employee_id=employee_id, company_id=company_id).pack()
+            callback_data=EmployeeCallback(action="set_salary", employee_id=employee_id, company_id=company_id, version=version).pack()
         )])
 
         status_text = "🔴 Deactivate" if is_active else "🟢 Activate"
         buttons.append([InlineKeyboardButton(
             text=status_text,
-            callback_data=EmployeeCallback(action="toggle_active", employee_id=employee_id, company_id=company_id).pack()
+            callback_data=EmployeeCallback(action="toggle_active", employee_id=employee_id, company_id=company_id, version=version).pack()
+        )])
+
+    if is_admin or is_self:
+        buttons.append([InlineKeyboardButton(
+            text="🕒 Time History",
+            callback_data=EmployeeCallback(action="history", employee_id=employee_id, company_id=company_id).pack()
         )])
 
     back_callback = EmployeeCallback(action="back_to_list", company_id=company_id)
@@ -141,6 +175,39 @@ def build_employee_details_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+def build_employee_history_keyboard(
+    employee_id: int,
+    company_id: int,
+    next_before_id: int | None,
+    is_first_page: bool
+) -> InlineKeyboardMarkup:
+    from app.tg_bot.utils.callback_data import EmployeeCallback
+
+    buttons = []
+
+    navigation_buttons = []
+    if not is_first_page:
+        navigation_buttons.append(InlineKeyboardButton(
+            text="⏮ Latest",
+            callback_data=EmployeeCallback(action="history", employee_id=employee_id, company_id=company_id).pack()
+        ))
+    if next_before_id is not None:
+        older_callback = EmployeeCallback(
+            action="history", employee_id=employee_id, company_id=company_id, before_id=next_before_id
+        )
+        navigation_buttons.append(InlineKeyboardButton(text="Older ▶️", callback_data=older_callback.pack()))
+    if navigation_buttons:
+        buttons.append(navigation_buttons)
+
+    back_callback = EmployeeCallback(action="details", employee_id=employee_id, company_id=company_id)
+    buttons.append([InlineKeyboardButton(
+        text="◀️ Back",
+        callback_data=back_callback.pack()
+    )])
+
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+
 def build_confirm_keyboard(
     confirm_callback: CallbackData,
     cancel_callback: CallbackData
@@ -158,7 +225,8 @@ def build_task_details_keyboard(
     task_id: int,
     project_id: int,
     is_admin: bool,
-    is_assignee: bool
+    is_assignee: bool,
+    version: int = 0
 ) -> InlineKeyboardMarkup:
     from app.tg_bot.utils.callback_data import TaskCallback
 
@@ -173,27 +241,27 @@ def build_task_details_keyboard(
     if is_admin:
         buttons.append([InlineKeyboardButton(
             text="✏️ Edit Name",
-            callback_data=TaskCallback(action="edit_name", task_id=task_id, project_id=project_id).pack()
+            callback_data=TaskCallback(action="edit_name", task_id=task_id, project_id=project_id, version=version).pack()
         )])
 
         buttons.append([InlineKeyboardButton(
             text="📝 Edit Description",
-            callback_data=TaskCallback(action="edit_description", task_id=task_id, project_id=project_id).pack()
+            callback_data=TaskCallback(action="edit_description", task_id=task_id, project_id=project_id, version=version).pack()
         )])
 
         buttons.append([InlineKeyboardButton(
             text="📅 Set Deadline",
-            callback_data=TaskCallback(action="set_deadline", task_id=task_id, project_id=project_id).pack()
+            callback_data=TaskCallback(action="set_deadline", task_id=task_id, project_id=project_id, version=version).pack()
         )])
 
         buttons.append([InlineKeyboardButton(
             text="👤 Assign",
-            callback_data=TaskCallback(action="assign", task_id=task_id, project_id=project_id).pack()
+            callback_data=TaskCallback(action="assign", task_id=task_id, project_id=project_id, version=version).pack()
         )])
 
         buttons.append([InlineKeyboardButton(
             text="🔄 Change Status",
-            callback_data=TaskCallback(action="change_status", task_id=task_id, project_id=project_id).pack()
+            callback_data=TaskCallback(action="change_status", task_id=task_id, project_id=project_id, version=version).pack()
         )])
 
         buttons.append([InlineKeyboardButton(
@@ -210,7 +278,7 @@ def build_task_details_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
-def build_status_selection_keyboard(task_id: int, project_id: int) -> InlineKeyboardMarkup:
+def build_status_selection_keyboard(task_id: int, project_id: int, version: int = 0) -> InlineKeyboardMarkup:
     from app.tg_bot.utils.callback_data import TaskCallback
 
     statuses = [
@@ -225,7 +293,7 @@ def build_status_selection_keyboard(task_id: int, project_id: int) -> InlineKeyb
     for label, status_value in statuses:
         buttons.append([InlineKeyboardButton(
             text=label,
-            callback_data=TaskCallback(action="set_status", task_id=task_id, project_id=project_id, status=status_value).pack()
+            callback_data=TaskCallback(action="set_status", task_id=task_id, project_id=project_id, status=status_value, version=version).pack()
         )])
 
     back_callback = TaskCallback(action="details", task_id=task_id, project_id=project_id)
@@ -0,0 +1,19 @@
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from app.core.database import get_database
+
+
+class ReadYourWritesMiddleware(BaseMiddleware):
+    """Handles every update in its own replica routing scope: reads go to the replica until the update writes."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        async with get_database().read_your_writes():
+            return await handler(event, data)
@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import (
+    EditMessageCaption,
+    EditMessageMedia,
+    EditMessageReplyMarkup,
+    EditMessageText,
+    TelegramMethod,
+)
+
+logger = logging.getLogger(__name__)
+
+COALESCED_EDIT_METHODS = (EditMessageText, EditMessageCaption, EditMessageReplyMarkup, EditMessageMedia)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def is_idle(self) -> bool:
+        self._refill()
+        return not self._lock.locked() and self._tokens >= self.capacity and time.monotonic() >= self._blocked_until
+
+    def block_for(self, seconds: float) -> None:
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass
+class SendQueueStats:
+    queued: int
+    max_queued: int
+    sent: int
+    coalesced: int
+    retried: int
+    queued_per_chat: dict[int | str, int] = field(default_factory=dict)
+
+
+@dataclass
+class _PendingEdit:
+    method: TelegramMethod
+    future: asyncio.Future
+    waiters: int = 0
+
+
+class SendScheduler(BaseRequestMiddleware):
+    """Rate-limits every chat-bound request going through the bot session.
+
+    Requests without a ``chat_id`` (``getUpdates``, ``answerCallbackQuery``, ...) pass straight through.
+    """
+
+    max_idle_buckets = 1024
+
+    def __init__(self, global_rate: float = 30.0, chat_rate: float = 1.0, max_retries: int = 3):
+        self.global_bucket = TokenBucket(global_rate)
+        self.chat_rate = chat_rate
+        self.max_retries = max_retries
+        self._chat_buckets: dict[int | str, TokenBucket] = {}
+        self._pending_edits: dict[tuple, _PendingEdit] = {}
+        self._queued_per_chat: dict[int | str, int] = {}
+        self._queued = 0
+        self._max_queued = 0
+        self._sent = 0
+        self._coalesced = 0
+        self._retried = 0
+
+    def stats(self) -> SendQueueStats:
+        return SendQueueStats(
+            queued=self._queued,
+            max_queued=self._max_queued,
+            sent=self._sent,
+            coalesced=self._coalesced,
+            retried=self._retried,
+            queued_per_chat=dict(self._queued_per_chat),
+        )
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType,
+        bot: Bot,
+        method: TelegramMethod,
+    ) -> Any:
+        chat_id = getattr(method, "chat_id", None)
+        if chat_id is None:
+            return await make_request(bot, method)
+
+        edit_key = self._get_edit_key(method, chat_id)
+        if edit_key is None:
+            return await self._send(make_request, bot, method, chat_id)
+
+        pending = self._pending_edits.get(edit_key)
+        if pending is not None:
+            pending.method = method
+            pending.waiters += 1
+            self._coalesced += 1
+            return await asyncio.shield(pending.future)
+
+        pending = _PendingEdit(method=method, future=asyncio.get_running_loop().create_future())
+        self._pending_edits[edit_key] = pending
+        try:
+            await self._wait_turn(chat_id)
+        except BaseException:
+            self._pending_edits.pop(edit_key, None)
+            if pending.waiters:
+                pending.future.cancel()
+            raise
+
+        # Edits arriving after this point start a new pending slot instead of being merged.
+        self._pending_edits.pop(edit_key, None)
+        try:
+            result = await self._send(make_request, bot, pending.method, chat_id, turn_taken=True)
+        except BaseException as e:
+            if pending.waiters:
+                pending.future.set_exception(e)
+            raise
+        pending.future.set_result(result)
+        return result
+
+    @staticmethod
+    def _get_edit_key(method: TelegramMethod, chat_id: int | str) -> tuple | None:
+        if not isinstance(method, COALESCED_EDIT_METHODS) or method.message_id is None:
+            return None
+        return type(method), chat_id, method.message_id
+
+    async def _send(
+        self,
+        make_request: NextRequestMiddlewareType,
+        bot: Bot,
+        method: TelegramMethod,
+        chat_id: int | str,
+        turn_taken: bool = False,
+    ) -> Any:
+        if not turn_taken:
+            await self._wait_turn(chat_id)
+        attempt = 0
+        while True:
+            try:
+                result = await make_request(bot, method)
+                self._sent += 1
+                return result
+            except TelegramRetryAfter as e:
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                self._retried += 1
+                logger.warning(
+                    "Flood control on %s in chat %s, retrying in %s s (attempt %s)",
+                    type(method).__name__, chat_id, e.retry_after, attempt,
+                )
+                self._get_chat_bucket(chat_id).block_for(e.retry_after)
+                await self._wait_turn(chat_id)
+
+    async def _wait_turn(self, chat_id: int | str) -> None:
+        self._queued += 1
+        self._max_queued = max(self._max_queued, self._queued)
+        self._queued_per_chat[chat_id] = self._queued_per_chat.get(chat_id, 0) + 1
+        try:
+            await self._get_chat_bucket(chat_id).acquire()
+            await self.global_bucket.acquire()
+        finally:
+            self._queued -= 1
+            self._queued_per_chat[chat_id] -= 1
+            if not self._queued_per_chat[chat_id]:
+                del self._queued_per_chat[chat_id]
+
+    def _get_chat_bucket(self, chat_id: int | str) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._chat_buckets) >= self.max_idle_buckets:
+                self._prune_idle_buckets()
+            bucket = self._chat_buckets[chat_id] = TokenBucket(self.chat_rate, capacity=1)
+        return bucket
+
+    def _prune_idle_buckets(self) -> None:
+        for chat_id in [chat_id for chat_id, bucket in self._chat_buckets.items() if bucket.is_idle]:
+            del self._chat_buckets[chat_id]
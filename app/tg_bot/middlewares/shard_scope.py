@@ -0,0 +1,19 @@
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from app.core.sharding import get_shard_map
+
+
+class ShardScopeMiddleware(BaseMiddleware):
+    """Handles every update in its own shard scope: the first company or row it touches picks the shard."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        with get_shard_map().scope():
+            return await handler(event, data)
@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
+
+from app.company.services import company_service
+from app.core.database import get_database
+from app.core.sharding import get_shard_map
+from app.report.models import ReportJob, ReportType
+from app.report.services import ReportJobService
+from app.time_tracking.models import StatsFilter
+from app.time_tracking.services import (
+    EMPLOYEE_STATS_FIELDNAMES,
+    PROJECT_STATS_FIELDNAMES,
+    time_tracking_entry_service,
+)
+from app.tg_bot.utils.csv_export import CSV_CHUNK_ROWS, export_csv_chunked
+from app.tg_bot.utils.export_cache import ExportCache
+from app.tg_bot.utils.stats_ranges import format_stats_range
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ReportSpec:
+    title: str
+    filename: str
+    fieldnames: list[str]
+    rows: Callable[[int, StatsFilter], AsyncIterator[dict]]
+
+
+REPORTS = {
+    ReportType.PROJECT_STATS: ReportSpec(
+        title="Project statistics",
+        filename="project_stats",
+        fieldnames=PROJECT_STATS_FIELDNAMES,
+        rows=time_tracking_entry_service.iter_project_stats_for_company,
+    ),
+    ReportType.EMPLOYEE_STATS: ReportSpec(
+        title="Employee statistics",
+        filename="employee_stats",
+        fieldnames=EMPLOYEE_STATS_FIELDNAMES,
+        rows=time_tracking_entry_service.iter_employee_stats_for_company,
+    ),
+}
+
+
+class ReportWorkerPool:
+    """Runs queued report jobs, at most ``concurrency`` at a time.
+
+    Rows are streamed from the database while CSV encoding runs on a process pool. The
+    job's progress message is edited every ``progress_interval`` seconds and replaced by
+    the document once it is ready. The row count is only stored with the finished job:
+    the streaming query holds the task's connection until the export is built.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        report_job_service: ReportJobService,
+        export_cache: ExportCache,
+        concurrency: int = 2,
+        process_workers: int = 2,
+        poll_interval: float = 5.0,
+        progress_interval: float = 2.0,
+        chunk_rows: int = CSV_CHUNK_ROWS,
+        compress: bool = False,
+        executor: Executor | None = None,
+    ):
+        self.bot = bot
+        self.report_job_service = report_job_service
+        self.export_cache = export_cache
+        self.concurrency = concurrency
+        self.process_workers = process_workers
+        self.poll_interval = poll_interval
+        self.progress_interval = progress_interval
+        self.chunk_rows = chunk_rows
+        self.compress = compress
+        self.executor = executor
+
+    async def run(self) -> None:
+        requeued = sum(await get_shard_map().for_each(self.report_job_service.requeue_interrupted))
+        if requeued:
+            logger.info("Requeued %s interrupted report jobs", requeued)
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.process_workers)
+
+        workers = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _work(self) -> None:
+        while True:
+            with get_shard_map().scope():
+                try:
+                    job = await get_shard_map().first(self.report_job_service.claim_next)
+                except Exception:
+                    logger.exception("Cannot claim a report job")
+                    job = None
+                if job is None:
+                    await self._wait_for_jobs()
+                    continue
+                # Claiming the job pinned this worker to the job's shard and its primary,
+                # the export itself reads from the shard's replica.
+                async with get_database().read_your_writes():
+                    await self.process(job)
+
+    async def _wait_for_jobs(self) -> None:
+        submitted = self.report_job_service.submitted
+        try:
+            await asyncio.wait_for(submitted.wait(), self.poll_interval)
+        except TimeoutError:
+            pass
+        submitted.clear()
+
+    async def process(self, job: ReportJob) -> None:
+        spec = REPORTS[ReportType(job.report_type)]
+        last_progress = time.monotonic()
+
+        async def on_progress(rows_done: int) -> None:
+            nonlocal last_progress
+            if time.monotonic() - last_progress < self.progress_interval:
+                return
+            last_progress = time.monotonic()
+            await self._edit_progress(job, f"⏳ Generating {spec.title.lower()}… {rows_done} rows")
+
+        try:
+            company = await company_service.get_company_details(job.company_id)
+            data_version = await company_service.get_data_version(job.company_id)
+            export = await self.export_cache.get_or_create(
+                (job.report_type, job.company_id, job.start_date, job.end_date, self.compress),
+                data_version,
+                lambda: export_csv_chunked(
+                    spec.rows(job.company_id, job.stats_filter),
+                    spec.fieldnames,
+                    self.executor,
+                    compress=self.compress,
+                    chunk_rows=self.chunk_rows,
+                    on_progress=on_progress,
+                ),
+            )
+            try:
+                if not export.rows:
+                    await self._edit_progress(job, "No time tracking data available for export")
+                else:
+                    filename = spec.filename
+                    if job.stats_filter.is_ranged:
+                        filename += "_" + format_stats_range(job.start_date, job.end_date, separator="_")
+                    await self.bot.send_document(
+                        job.chat_id,
+                        document=export.as_input_file(f"{company.code}_{filename}.csv"),
+                        caption=f"📊 {spec.title} for {company.name} ({format_stats_range(job.start_date, job.end_date)})",
+                    )
+                    await self._delete_progress(job)
+            finally:
+                export.close()
+            await self.report_job_service.mark_done(job.id, export.rows)
+        except Exception as e:
+            logger.exception("Report job %s failed", job.id)
+            await self.report_job_service.mark_failed(job.id, str(e))
+            await self._edit_progress(job, "❌ Failed to generate the report, please try again later")
+
+    async def _edit_progress(self, job: ReportJob, text: str) -> None:
+        if job.progress_message_id is None:
+            return
+        try:
+            await self.bot.edit_message_text(text, chat_id=job.chat_id, message_id=job.progress_message_id)
+        except (TelegramBadRequest, TelegramForbiddenError) as e:
+            logger.warning("Cannot update progress of report job %s: %s", job.id, e)
+
+    async def _delete_progress(self, job: ReportJob) -> None:
+        if job.progress_message_id is None:
+            return
+        try:
+            await self.bot.delete_message(job.chat_id, job.progress_message_id)
+        except (TelegramBadRequest, TelegramForbiddenError) as e:
+            logger.warning("Cannot delete progress message of report job %s: %s", job.id, e)
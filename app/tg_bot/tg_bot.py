@@ -2,12 +2,46 @@ from aiogram import Dispatcher, Bot, Router
 from aiogram.fsm.storage.memory import MemoryStorage
 
 from app.core.settings import settings
+from app.report.services import report_job_service
+from app.task.services import task_service
+from app.tg_bot.deadline_reminders import DeadlineReminderScheduler
 from app.tg_bot.handlers import register_handlers
+from app.tg_bot.middlewares.read_your_writes import ReadYourWritesMiddleware
+from app.tg_bot.middlewares.send_scheduler import SendScheduler
+from app.tg_bot.middlewares.shard_scope import ShardScopeMiddleware
+from app.tg_bot.report_worker import ReportWorkerPool
+from app.tg_bot.utils.export_cache import stats_export_cache
 
 bot = Bot(settings.TG_BOT_TOKEN)
+send_scheduler = SendScheduler(
+    global_rate=settings.TG_GLOBAL_RATE_LIMIT,
+    chat_rate=settings.TG_CHAT_RATE_LIMIT,
+    max_retries=settings.TG_MAX_RETRIES,
+)
+bot.session.middleware(send_scheduler)
 storage = MemoryStorage()
 dp = Dispatcher(storage=storage)
+dp.update.outer_middleware(ShardScopeMiddleware())
+dp.update.outer_middleware(ReadYourWritesMiddleware())
 
 aiogram_router = Router()
 register_handlers(aiogram_router)
 dp.include_router(aiogram_router)
+
+deadline_reminder_scheduler = DeadlineReminderScheduler(
+    bot,
+    task_service,
+    days=settings.DEADLINE_REMINDER_DAYS,
+    interval=settings.DEADLINE_REMINDER_INTERVAL_SECONDS,
+    batch_size=settings.DEADLINE_REMINDER_BATCH_SIZE,
+)
+
+report_worker_pool = ReportWorkerPool(
+    bot,
+    report_job_service,
+    stats_export_cache,
+    concurrency=settings.REPORT_WORKERS,
+    process_workers=settings.REPORT_PROCESS_POOL_WORKERS,
+    poll_interval=settings.REPORT_POLL_INTERVAL_SECONDS,
+    compress=settings.EXPORT_GZIP,
+)
@@ -5,6 +5,7 @@ class CompanyCallback(CallbackData, prefix="company"):
     action: str
     company_id: int = 0
     page: int = 1
+    range: str = ""
 
 
 class ProjectCallback(CallbackData, prefix="project"):
@@ -19,6 +20,8 @@ class EmployeeCallback(CallbackData, prefix="employee"):
     employee_id: int = 0
     company_id: int = 0
     page: int = 1
+    before_id: int = 0
+    version: int = 0
 
 
 class TaskCallback(CallbackData, prefix="task"):
@@ -27,3 +30,4 @@ class TaskCallback(CallbackData, prefix="task"):
     project_id: int = 0
     page: int = 1
     status: str = ""
+    version: int = 0
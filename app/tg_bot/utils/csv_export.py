@@ -0,0 +1,140 @@
+import asyncio
+import csv
+import gzip
+import io
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from tempfile import SpooledTemporaryFile
+from typing import IO, AsyncGenerator, AsyncIterable, Awaitable, Callable, Sequence
+
+from aiogram import Bot
+from aiogram.types import InputFile
+
+SPOOL_MAX_MEMORY_SIZE = 1024 * 1024
+UPLOAD_CHUNK_SIZE = 64 * 1024
+CSV_CHUNK_ROWS = 5000
+
+
+class SpooledInputFile(InputFile):
+    def __init__(self, file: IO[bytes], filename: str, chunk_size: int = UPLOAD_CHUNK_SIZE):
+        super().__init__(filename=filename, chunk_size=chunk_size)
+        self.file = file
+
+    async def read(self, bot: Bot) -> AsyncGenerator[bytes, None]:
+        self.file.seek(0)
+        while chunk := self.file.read(self.chunk_size):
+            yield chunk
+
+
+@dataclass
+class CsvExport:
+    file: IO[bytes]
+    rows: int
+    size: int
+    compressed: bool
+
+    def as_input_file(self, filename: str) -> SpooledInputFile:
+        if self.compressed:
+            filename = f"{filename}.gz"
+        return SpooledInputFile(self.file, filename=filename)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+async def export_csv(
+    rows: AsyncIterable[dict],
+    fieldnames: Sequence[str],
+    compress: bool = False,
+    max_memory_size: int = SPOOL_MAX_MEMORY_SIZE,
+) -> CsvExport:
+    """Writes rows one by one into a temp file that stays in memory up to ``max_memory_size`` bytes."""
+    spool = SpooledTemporaryFile(max_size=max_memory_size)
+    sink = gzip.GzipFile(fileobj=spool, mode="wb") if compress else spool
+    text = io.TextIOWrapper(sink, encoding="utf-8", newline="")
+    writer = csv.DictWriter(text, fieldnames=fieldnames)
+    writer.writeheader()
+
+    count = 0
+    try:
+        async for row in rows:
+            writer.writerow(row)
+            count += 1
+        text.flush()
+        text.detach()
+        if compress:
+            sink.close()
+    except BaseException:
+        spool.close()
+        raise
+
+    size = spool.tell()
+    spool.seek(0)
+    return CsvExport(file=spool, rows=count, size=size, compressed=compress)
+
+
+def encode_csv_chunk(
+    rows: list[dict], fieldnames: Sequence[str], header: bool = False, compress: bool = False
+) -> bytes:
+    """Encodes rows to CSV bytes; a plain module function so it can run in a worker process.
+
+    Compressed chunks are separate gzip members, their concatenation is a valid gzip file.
+    """
+    output = io.StringIO(newline="")
+    writer = csv.DictWriter(output, fieldnames=fieldnames)
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    data = output.getvalue().encode("utf-8")
+    return gzip.compress(data) if compress else data
+
+
+async def export_csv_chunked(
+    rows: AsyncIterable[dict],
+    fieldnames: Sequence[str],
+    executor: Executor | None = None,
+    compress: bool = False,
+    chunk_rows: int = CSV_CHUNK_ROWS,
+    on_progress: Callable[[int], Awaitable[None]] | None = None,
+    max_memory_size: int = SPOOL_MAX_MEMORY_SIZE,
+) -> CsvExport:
+    """Like ``export_csv``, but encodes rows in chunks of ``chunk_rows`` on ``executor``.
+
+    The next chunk is read while the previous one is being encoded. ``on_progress`` is
+    awaited with the number of rows written after every chunk.
+    """
+    loop = asyncio.get_running_loop()
+    spool = SpooledTemporaryFile(max_size=max_memory_size)
+    count = 0
+    header = True
+    pending: asyncio.Future | None = None
+    chunk: list[dict] = []
+
+    async def flush() -> None:
+        nonlocal pending, header, chunk
+        encoding = loop.run_in_executor(executor, encode_csv_chunk, chunk, fieldnames, header, compress)
+        header = False
+        chunk = []
+        if pending is not None:
+            spool.write(await pending)
+        pending = encoding
+
+    try:
+        async for row in rows:
+            chunk.append(row)
+            count += 1
+            if len(chunk) >= chunk_rows:
+                await flush()
+                if on_progress is not None:
+                    await on_progress(count)
+        if chunk or header:
+            await flush()
+        if pending is not None:
+            spool.write(await pending)
+    except BaseException:
+        spool.close()
+        raise
+
+    size = spool.tell()
+    spool.seek(0)
+    return CsvExport(file=spool, rows=count, size=size, compressed=compress)
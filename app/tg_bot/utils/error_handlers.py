@@ -1,5 +1,5 @@
 from aiogram.types import Message, CallbackQuery
-from app.core.exceptions import ApplicationError
+from app.core.exceptions import ApplicationError, ConcurrentUpdateError, DatabaseBusyError
 from app.company.exceptions import (
     CompanyNotFoundError,
     CompanyAccessDeniedError,
@@ -26,6 +26,10 @@ from app.time_tracking.exceptions import (
     TimeTrackingEntryNotFoundError,
     TimeTrackingEntryAlreadyExistsError,
 )
+from app.report.exceptions import (
+    ReportJobNotFoundError,
+    ReportAccessDeniedError,
+)
 
 
 ERROR_MESSAGES = {
@@ -45,6 +49,10 @@ ERROR_MESSAGES = {
     TaskAlreadyExistsError: "Task already exists",
     TimeTrackingEntryNotFoundError: "Time tracking entry not found",
     TimeTrackingEntryAlreadyExistsError: "Time tracking entry already exists",
+    ReportJobNotFoundError: "Report not found",
+    ReportAccessDeniedError: "Only company owner can export statistics",
+    DatabaseBusyError: "The bot is busy right now, please try again in a moment",
+    ConcurrentUpdateError: "Someone else has just changed this. Refresh it and try again",
 }
 
 
@@ -0,0 +1,189 @@
+import asyncio
+import io
+import logging
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable
+
+from app.core.settings import settings
+from app.tg_bot.utils.csv_export import SPOOL_MAX_MEMORY_SIZE, CsvExport
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ExportCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    memory_entries: int
+    memory_size: int
+    disk_entries: int
+    disk_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+
+@dataclass
+class _CachedExport:
+    version: int
+    rows: int
+    size: int
+    compressed: bool
+    data: bytes | None = None
+    path: str | None = None
+
+
+class ExportCache:
+    """LRU cache of generated CSV exports, valid while the data version they were built for is current.
+
+    Exports up to ``max_memory_item_size`` bytes are kept in memory, larger ones in files under
+    ``directory``. Each tier is trimmed to its size limit by evicting the least recently used entries.
+    """
+
+    def __init__(
+        self,
+        max_memory_size: int,
+        max_disk_size: int,
+        max_memory_item_size: int = SPOOL_MAX_MEMORY_SIZE,
+        directory: str | None = None,
+    ):
+        self.max_memory_size = max_memory_size
+        self.max_disk_size = max_disk_size
+        self.max_memory_item_size = max_memory_item_size
+        self.directory = directory
+        self._own_directory: str | None = None
+        self._entries: OrderedDict[Hashable, _CachedExport] = OrderedDict()
+        self._locks: dict[Hashable, asyncio.Lock] = {}
+        self._memory_size = 0
+        self._disk_size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    async def get_or_create(
+        self, key: Hashable, version: int, build: Callable[[], Awaitable[CsvExport]]
+    ) -> CsvExport:
+        """Returns the cached export for ``key`` if it was built for ``version``, otherwise builds it.
+
+        Concurrent misses for the same key build the export once. The caller owns the returned
+        export and must close it.
+        """
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            export = self._get(key, version)
+            if export is not None:
+                self._hits += 1
+                logger.info("Export cache hit for %s, hit rate %.0f%%", key, self.stats().hit_rate * 100)
+                return export
+
+            self._misses += 1
+            export = await build()
+            try:
+                await self._put(key, version, export)
+            except OSError:
+                logger.exception("Cannot cache export for %s", key)
+            return export
+
+    def stats(self) -> ExportCacheStats:
+        return ExportCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            memory_entries=sum(1 for entry in self._entries.values() if entry.data is not None),
+            memory_size=self._memory_size,
+            disk_entries=sum(1 for entry in self._entries.values() if entry.path is not None),
+            disk_size=self._disk_size,
+        )
+
+    def close(self) -> None:
+        for key in list(self._entries):
+            self._remove(key)
+        if self._own_directory is not None:
+            shutil.rmtree(self._own_directory, ignore_errors=True)
+            self._own_directory = None
+
+    def _get(self, key: Hashable, version: int) -> CsvExport | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.version != version:
+            self._remove(key)
+            return None
+
+        if entry.data is not None:
+            file = io.BytesIO(entry.data)
+        else:
+            try:
+                file = open(entry.path, "rb")
+            except FileNotFoundError:
+                self._remove(key)
+                return None
+        self._entries.move_to_end(key)
+        return CsvExport(file=file, rows=entry.rows, size=entry.size, compressed=entry.compressed)
+
+    async def _put(self, key: Hashable, version: int, export: CsvExport) -> None:
+        if export.size > self.max_disk_size and export.size > self.max_memory_item_size:
+            return
+        self._remove(key)
+
+        entry = _CachedExport(version=version, rows=export.rows, size=export.size, compressed=export.compressed)
+        if export.size <= self.max_memory_item_size:
+            entry.data = export.file.read()
+            self._memory_size += export.size
+        else:
+            entry.path = await asyncio.to_thread(self._write_file, export)
+            self._disk_size += export.size
+        export.file.seek(0)
+
+        self._entries[key] = entry
+        self._evict()
+
+    def _write_file(self, export: CsvExport) -> str:
+        if self.directory is None and self._own_directory is None:
+            self._own_directory = tempfile.mkdtemp(prefix="export_cache_")
+        directory = self.directory or self._own_directory
+        os.makedirs(directory, exist_ok=True)
+        fd, path = tempfile.mkstemp(dir=directory, suffix=".csv")
+        with os.fdopen(fd, "wb") as file:
+            shutil.copyfileobj(export.file, file)
+        return path
+
+    def _evict(self) -> None:
+        for key, entry in list(self._entries.items()):
+            if self._memory_size <= self.max_memory_size and self._disk_size <= self.max_disk_size:
+                break
+            over_memory = entry.data is not None and self._memory_size > self.max_memory_size
+            over_disk = entry.path is not None and self._disk_size > self.max_disk_size
+            if over_memory or over_disk:
+                self._remove(key)
+                self._evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        if entry.data is not None:
+            self._memory_size -= entry.size
+        if entry.path is not None:
+            self._disk_size -= entry.size
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+        lock = self._locks.get(key)
+        if lock is not None and not lock.locked():
+            del self._locks[key]
+
+
+stats_export_cache = ExportCache(
+    max_memory_size=settings.EXPORT_CACHE_MAX_MEMORY_BYTES,
+    max_disk_size=settings.EXPORT_CACHE_MAX_DISK_BYTES,
+    directory=settings.EXPORT_CACHE_DIR,
+)
@@ -59,6 +59,10 @@ def format_task_status(status: str) -> str:
     return f"{emoji} {label}"
 
 
+def format_task_counts(counts: dict[str, int]) -> str:
+    return " · ".join(f"{format_task_status(status)}: {count}" for status, count in counts.items() if count)
+
+
 def format_tracked_time(minutes: int) -> str:
     if minutes < 60:
         return f"{minutes} min"
@@ -67,6 +71,20 @@ def format_tracked_time(minutes: int) -> str:
         return f"{hours:.1f} hours"
 
 
+def format_employee_history(employee: Employee, entries: list[dict], is_first_page: bool) -> str:
+    title = "Latest time entries" if is_first_page else "Older time entries"
+    lines = [f"<b>{title}</b> — {employee.display_name}\n"]
+    if not entries:
+        lines.append("No time entries yet")
+    for entry in entries:
+        lines.append(
+            f"• {entry['created_at'].strftime('%Y-%m-%d %H:%M')} {entry['project_code']} #{entry['task_code']} "
+            f"{entry['task_name']} — {format_tracked_time(entry['duration_minutes'])} "
+            f"(${entry['cost_cents'] / 100:.2f})"
+        )
+    return "\n".join(lines)
+
+
 def format_task_details(task: Task, tracked_minutes: int = 0) -> str:
     tracked_time_line = ""
     if tracked_minutes > 0:
@@ -83,3 +101,13 @@ def format_task_details(task: Task, tracked_minutes: int = 0) -> str:
         f"<b>Created:</b> {task.created_at.strftime('%Y-%m-%d %H:%M')}\n"
         f"<b>ID:</b> {task.id}"
     )
+
+
+def format_deadline_reminder(tasks: list[Task]) -> str:
+    lines = [f"⏰ <b>Upcoming deadlines</b> ({len(tasks)}):\n"]
+    for task in tasks:
+        lines.append(
+            f"• #{task.code} - {task.name} — {task.deadline.strftime('%Y-%m-%d %H:%M')} "
+            f"({format_task_status(task.status)})"
+        )
+    return "\n".join(lines)
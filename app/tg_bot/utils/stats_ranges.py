@@ -0,0 +1,42 @@
+from datetime import date, timedelta
+
+from app.time_tracking.partitions import add_months, month_start
+
+STATS_RANGES = {
+    "all": "All time",
+    "this_week": "This week",
+    "last_week": "Last week",
+    "this_month": "This month",
+    "last_month": "Last month",
+    "last_30_days": "Last 30 days",
+}
+
+
+def resolve_stats_range(name: str, today: date | None = None) -> tuple[date | None, date | None]:
+    """Returns ``(start, end)`` days of a named range, ``end`` is exclusive and ``None`` is unbounded."""
+    today = today or date.today()
+    tomorrow = today + timedelta(days=1)
+    week_start = today - timedelta(days=today.weekday())
+
+    if name == "all":
+        return None, None
+    if name == "this_week":
+        return week_start, tomorrow
+    if name == "last_week":
+        return week_start - timedelta(days=7), week_start
+    if name == "this_month":
+        return month_start(today), tomorrow
+    if name == "last_month":
+        return add_months(month_start(today), -1), month_start(today)
+    if name == "last_30_days":
+        return today - timedelta(days=29), tomorrow
+    raise ValueError(f"Unknown stats range: {name}")
+
+
+def format_stats_range(start: date | None, end: date | None, separator: str = " – ") -> str:
+    """Human-readable range with the inclusive last day, e.g. ``2026-10-01 – 2026-10-31``."""
+    if start is None and end is None:
+        return "all time"
+    first = start.isoformat() if start else "…"
+    last = (end - timedelta(days=1)).isoformat() if end else "…"
+    return f"{first}{separator}{last}"
@@ -1,4 +1,8 @@
-from sqlalchemy import and_, select, func, join
+from collections import defaultdict
+from datetime import date, datetime, time
+from typing import AsyncIterator
+
+from sqlalchemy import and_, bindparam, literal, select, func, join, tuple_, union_all
 
 from app.core.crud_base import CrudBase
 from app.core.repo_base import RepoBase
@@ -6,71 +10,96 @@ from app.core.serializer import Serializer, DataclassSerializer
 from app.core.types import DTO
 from app.employee.tables import employee_table
 from app.project.tables import project_table
-from app.task.tables import task_table
-from app.time_tracking.models import TimeTrackingEntry
-from app.time_tracking.tables import time_tracking_entry_table
-from app.core.database import database
+from app.task.tables import task_archive_table, task_table, task_with_archive
+from app.time_tracking.exceptions import TimeTrackingEntryAlreadyExistsError, TimeTrackingEntryNotFoundError
+from app.time_tracking.models import StatsFilter, TimeTrackingEntry
+from app.time_tracking.tables import (
+    project_cost_rollup_table,
+    time_tracking_bucket_delta_table,
+    time_tracking_daily_bucket_table,
+    time_tracking_entry_archive_table,
+    time_tracking_entry_table,
+    time_tracking_entry_with_archive,
+)
+
+
+def day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min)
+
+
+def live_company_projects(company_id):
+    """Condition on ``project_table`` for the company's projects that are not deleted."""
+    return and_(project_table.c.company_id == company_id, project_table.c.deleted_at.is_(None))
 
 
 class TimeTrackingEntryCrud(CrudBase[int, DTO]):
     table = time_tracking_entry_table
+    tasks = task_table
 
     async def get_total_minutes_by_task_and_employee(self, task_id: int, employee_id: int) -> int:
-        query = select(func.sum(self.table.c.duration_minutes)).where(
+        statement = self.statement("get_total_minutes_by_task_and_employee", lambda: select(
+            func.sum(self.table.c.duration_minutes)
+        ).where(
             and_(
-                self.table.c.task_id == task_id,
-                self.table.c.employee_id == employee_id
+                self.table.c.task_id == bindparam("task_id"),
+                self.table.c.employee_id == bindparam("employee_id")
             )
-        )
-        self.log_query(query)
-        result = await database.fetch_val(query)
+        ))
+        result = await statement.fetch_val(self.database, task_id=task_id, employee_id=employee_id)
         return result or 0
 
     async def get_all_entries_for_company(self, company_id: int) -> list[DTO]:
+        await self.shards.use_company(company_id)
         query = (
             select(self.table)
             .select_from(
                 self.table
-                .join(task_table, self.table.c.task_id == task_table.c.id)
-                .join(project_table, task_table.c.project_id == project_table.c.id)
+                .join(self.tasks, self.table.c.task_id == self.tasks.c.id)
+                .join(project_table, self.tasks.c.project_id == project_table.c.id)
             )
-            .where(project_table.c.company_id == company_id)
+            .where(live_company_projects(company_id))
             .order_by(self.table.c.created_at.desc())
         )
         self.log_query(query)
-        return await database.fetch_all(query)
+        return await self.database.reader().fetch_all(query)
 
-    async def get_project_stats_for_company(self, company_id: int) -> list[dict]:
-        time_sum = func.sum(self.table.c.duration_minutes).label("total_minutes")
-        cost_sum = func.sum(
-            (self.table.c.duration_minutes / 60.0) * employee_table.c.salary_per_hour
-        ).label("total_cost")
+    def _stats_filter_conditions(self, stats_filter: StatsFilter | None) -> list:
+        if stats_filter is None:
+            return []
+        conditions = []
+        if stats_filter.start is not None:
+            conditions.append(self.table.c.created_at >= day_start(stats_filter.start))
+        if stats_filter.end is not None:
+            conditions.append(self.table.c.created_at < day_start(stats_filter.end))
+        if stats_filter.project_ids:
+            conditions.append(self.tasks.c.project_id.in_(stats_filter.project_ids))
+        if stats_filter.employee_ids:
+            conditions.append(self.table.c.employee_id.in_(stats_filter.employee_ids))
+        return conditions
 
+    def _project_stats_query(self, company_id: int, stats_filter: StatsFilter | None = None):
+        if stats_filter is not None and (stats_filter.is_ranged or stats_filter.employee_ids):
+            # The rollup only holds whole-history totals per project
+            return self._project_totals_query(company_id, *self._stats_filter_conditions(stats_filter))
+
+        rollup = project_cost_rollup_table
+        conditions = [live_company_projects(company_id), rollup.c.entry_count > 0]
+        if stats_filter is not None and stats_filter.project_ids:
+            conditions.append(project_table.c.id.in_(stats_filter.project_ids))
         query = (
             select(
                 project_table.c.code.label("project_code"),
-                time_sum,
-                cost_sum
-            )
-            .select_from(
-                self.table
-                .join(employee_table, self.table.c.employee_id == employee_table.c.id)
-                .join(task_table, self.table.c.task_id == task_table.c.id)
-                .join(project_table, task_table.c.project_id == project_table.c.id)
+                rollup.c.total_minutes,
+                rollup.c.total_cost_cents
             )
-            .where(project_table.c.company_id == company_id)
-            .group_by(project_table.c.code)
-            .order_by(cost_sum.desc())
+            .select_from(rollup.join(project_table, rollup.c.project_id == project_table.c.id))
+            .where(and_(*conditions))
+            .order_by(rollup.c.total_cost_cents.desc())
         )
         self.log_query(query)
-        return await database.fetch_all(query)
-
-    async def get_employee_stats_for_company(self, company_id: int) -> list[dict]:
-        window_func = func.row_number().over(
-            order_by=self.table.c.created_at.desc(),
-            partition_by=employee_table.c.telegram_id
-        ).label("entry_rank")
+        return query
 
+    def _employee_stats_query(self, company_id: int, stats_filter: StatsFilter | None = None):
         total_employee_time = func.sum(self.table.c.duration_minutes).over(
             partition_by=employee_table.c.id
         ).label("employee_total_minutes")
@@ -78,45 +107,513 @@ class TimeTrackingEntryCrud(CrudBase[int, DTO]):
         query = (
             select(
                 project_table.c.code.label("project_code"),
-                task_table.c.code.label("task_code"),
-                task_table.c.name.label("task_name"),
+                self.tasks.c.code.label("task_code"),
+                self.tasks.c.name.label("task_name"),
                 employee_table.c.display_name.label("employee_display_name"),
                 self.table.c.created_at,
                 self.table.c.duration_minutes,
                 total_employee_time,
-                (self.table.c.duration_minutes / 60.0 * employee_table.c.salary_per_hour).label("salary_cost"),
-                window_func
+                self.table.c.cost_cents
             )
             .select_from(
                 self.table
                 .join(employee_table, self.table.c.employee_id == employee_table.c.id)
-                .join(task_table, self.table.c.task_id == task_table.c.id)
-                .join(project_table, task_table.c.project_id == project_table.c.id)
+                .join(self.tasks, self.table.c.task_id == self.tasks.c.id)
+                .join(project_table, self.tasks.c.project_id == project_table.c.id)
             )
-            .where(project_table.c.company_id == company_id)
+            .where(and_(live_company_projects(company_id), *self._stats_filter_conditions(stats_filter)))
             .order_by(employee_table.c.display_name, self.table.c.created_at.desc())
         )
         self.log_query(query)
-        return await database.fetch_all(query)
+        return query
+
+    def _entry_details_query(self):
+        return (
+            select(
+                self.table.c.id,
+                self.table.c.employee_id,
+                employee_table.c.display_name.label("employee_display_name"),
+                project_table.c.code.label("project_code"),
+                self.tasks.c.code.label("task_code"),
+                self.tasks.c.name.label("task_name"),
+                self.table.c.created_at,
+                self.table.c.duration_minutes,
+                self.table.c.cost_cents
+            )
+            .select_from(
+                self.table
+                .join(employee_table, self.table.c.employee_id == employee_table.c.id)
+                .join(self.tasks, self.table.c.task_id == self.tasks.c.id)
+                .join(project_table, self.tasks.c.project_id == project_table.c.id)
+            )
+        )
+
+    def _recent_entries_per_employee_query(
+        self, company_id: int, limit: int, stats_filter: StatsFilter | None = None
+    ):
+        entry_rank = func.row_number().over(
+            partition_by=self.table.c.employee_id,
+            order_by=(self.table.c.created_at.desc(), self.table.c.id.desc())
+        ).label("entry_rank")
+        ranked = (
+            self._entry_details_query()
+            .add_columns(entry_rank)
+            .where(and_(live_company_projects(company_id), *self._stats_filter_conditions(stats_filter)))
+            .subquery("ranked")
+        )
+        query = (
+            select(ranked)
+            .where(ranked.c.entry_rank <= limit)
+            .order_by(ranked.c.employee_display_name, ranked.c.employee_id, ranked.c.entry_rank)
+        )
+        self.log_query(query)
+        return query
+
+    async def get_recent_entries_per_employee(
+        self, company_id: int, limit: int, stats_filter: StatsFilter | None = None
+    ) -> list[DTO]:
+        await self.shards.use_company(company_id)
+        return await self.database.reader().fetch_all(self._recent_entries_per_employee_query(company_id, limit, stats_filter))
+
+    async def get_employee_entries_before(
+        self, employee_id: int, limit: int, before_id: int | None = None
+    ) -> list[DTO]:
+        """Entries of an employee, newest first, starting after the entry ``before_id``.
+
+        Keyset pagination on ``(created_at, id)`` served by the ``(employee_id, created_at)`` index.
+        """
+        if self.shards.needs_lookup():
+            # Pins the scope to the shard of the employee's company
+            employee_company = select(employee_table.c.company_id).where(employee_table.c.id == employee_id)
+            await self.shards.locate(lambda: self.database.reader().fetch_val(employee_company))
+        conditions = [self.table.c.employee_id == employee_id]
+        if before_id is not None:
+            before_created_at = select(self.table.c.created_at).where(self.table.c.id == before_id).scalar_subquery()
+            conditions.append(
+                tuple_(self.table.c.created_at, self.table.c.id) < tuple_(before_created_at, before_id)
+            )
+        query = (
+            self._entry_details_query()
+            .where(and_(*conditions))
+            .order_by(self.table.c.created_at.desc(), self.table.c.id.desc())
+            .limit(limit)
+        )
+        self.log_query(query)
+        return await self.database.reader().fetch_all(query)
+
+    def created_between(self, start: date, end: date):
+        # Plain bounds on created_at, so PostgreSQL prunes monthly partitions outside the range
+        return and_(self.table.c.created_at >= day_start(start), self.table.c.created_at < day_start(end))
+
+    def _employee_minutes_query(self, company_id: int, start: date, end: date):
+        query = (
+            select(
+                employee_table.c.id.label("employee_id"),
+                employee_table.c.display_name.label("employee_display_name"),
+                func.sum(self.table.c.duration_minutes).label("total_minutes")
+            )
+            .select_from(
+                self.table
+                .join(employee_table, self.table.c.employee_id == employee_table.c.id)
+                .join(self.tasks, self.table.c.task_id == self.tasks.c.id)
+                .join(project_table, self.tasks.c.project_id == project_table.c.id)
+            )
+            .where(and_(live_company_projects(company_id), self.created_between(start, end)))
+            .group_by(employee_table.c.id, employee_table.c.display_name)
+            .order_by(employee_table.c.display_name)
+        )
+        self.log_query(query)
+        return query
+
+    def _project_costs_query(self, company_id: int, start: date, end: date):
+        return self._project_totals_query(company_id, self.created_between(start, end))
+
+    def _project_totals_query(self, company_id: int, *conditions):
+        query = (
+            select(
+                project_table.c.code.label("project_code"),
+                func.sum(self.table.c.duration_minutes).label("total_minutes"),
+                func.sum(self.table.c.cost_cents).label("total_cost_cents")
+            )
+            .select_from(
+                self.table
+                .join(self.tasks, self.table.c.task_id == self.tasks.c.id)
+                .join(project_table, self.tasks.c.project_id == project_table.c.id)
+            )
+            .where(and_(live_company_projects(company_id), *conditions))
+            .group_by(project_table.c.id, project_table.c.code)
+            .order_by(func.sum(self.table.c.cost_cents).desc())
+        )
+        self.log_query(query)
+        return query
+
+    async def get_employee_minutes_from_entries(self, company_id: int, start: date, end: date) -> list[dict]:
+        await self.shards.use_company(company_id)
+        return await self.database.reader().fetch_all(self._employee_minutes_query(company_id, start, end))
+
+    async def get_project_costs_from_entries(self, company_id: int, start: date, end: date) -> list[dict]:
+        await self.shards.use_company(company_id)
+        return await self.database.reader().fetch_all(self._project_costs_query(company_id, start, end))
+
+    async def get_project_stats_for_company(
+        self, company_id: int, stats_filter: StatsFilter | None = None
+    ) -> list[dict]:
+        await self.shards.use_company(company_id)
+        return await self.database.reader().fetch_all(self._project_stats_query(company_id, stats_filter))
+
+    async def iter_project_stats_for_company(
+        self, company_id: int, stats_filter: StatsFilter | None = None
+    ) -> AsyncIterator[DTO]:
+        await self.shards.use_company(company_id)
+        async for row in self.iter_query(self._project_stats_query(company_id, stats_filter)):
+            yield row
+
+    async def get_employee_stats_for_company(
+        self, company_id: int, stats_filter: StatsFilter | None = None
+    ) -> list[dict]:
+        await self.shards.use_company(company_id)
+        return await self.database.reader().fetch_all(self._employee_stats_query(company_id, stats_filter))
+
+    async def iter_employee_stats_for_company(
+        self, company_id: int, stats_filter: StatsFilter | None = None
+    ) -> AsyncIterator[DTO]:
+        await self.shards.use_company(company_id)
+        async for row in self.iter_query(self._employee_stats_query(company_id, stats_filter)):
+            yield row
+
+
+class TimeTrackingEntryWithArchiveCrud(TimeTrackingEntryCrud):
+    """The same reads over hot and archived entries and tasks, for statistics and history."""
+    table = time_tracking_entry_with_archive
+    tasks = task_with_archive
+
+
+class ProjectCostRollupCrud(CrudBase[int, DTO]):
+    table = project_cost_rollup_table
+
+    def _aggregate_entries_query(self, *conditions, entries=time_tracking_entry_table, tasks=task_table):
+        query = (
+            select(
+                tasks.c.project_id,
+                func.sum(entries.c.duration_minutes).label("total_minutes"),
+                func.sum(entries.c.cost_cents).label("total_cost_cents"),
+                func.count().label("entry_count")
+            )
+            .select_from(entries.join(tasks, entries.c.task_id == tasks.c.id))
+            .group_by(tasks.c.project_id)
+        )
+        if conditions:
+            query = query.where(and_(*conditions))
+        return query
+
+    async def _apply_entries(self, sign: int, conditions, entries=time_tracking_entry_table, tasks=task_table) -> None:
+        query = self._aggregate_entries_query(*conditions, entries=entries, tasks=tasks)
+        async for row in self.iter_query(query, key=tasks.c.project_id, primary=True):
+            await self.upsert_increment(
+                {"project_id": row["project_id"]},
+                {
+                    "total_minutes": sign * row["total_minutes"],
+                    "total_cost_cents": sign * row["total_cost_cents"],
+                    "entry_count": sign * row["entry_count"],
+                },
+            )
+
+    async def add_entries(self, *conditions) -> None:
+        await self._apply_entries(1, conditions)
+
+    async def subtract_entries(self, *conditions) -> None:
+        await self._apply_entries(-1, conditions)
+
+    async def subtract_archived_entries(self, *conditions) -> None:
+        """``conditions`` on ``time_tracking_entry_archive_table``."""
+        await self._apply_entries(-1, conditions, time_tracking_entry_archive_table, task_archive_table)
+
+    async def rebuild(self, company_id: int | None = None) -> None:
+        tasks = task_with_archive
+        aggregate = self._aggregate_entries_query(entries=time_tracking_entry_with_archive, tasks=tasks)
+        delete_query = self.table.delete()
+        if company_id is not None:
+            await self.shards.use_company(company_id)
+            company_projects = select(project_table.c.id).where(project_table.c.company_id == company_id)
+            aggregate = aggregate.where(tasks.c.project_id.in_(company_projects))
+            delete_query = delete_query.where(self.table.c.project_id.in_(company_projects))
+        insert_query = self.table.insert().from_select(
+            ["project_id", "total_minutes", "total_cost_cents", "entry_count"], aggregate
+        )
+        self.log_query(insert_query)
+        async with self.database.transaction():
+            await self.database.execute(delete_query)
+            await self.database.execute(insert_query)
+
+
+class TimeBucketCrud(CrudBase[tuple[int, int, date], DTO]):
+    """Per ``(employee_id, task_id, day)`` totals of time entries.
+
+    Writers only append rows to ``time_tracking_bucket_delta``; ``compact`` folds them into
+    ``time_tracking_daily_bucket``. Range queries read both tables, so results are exact
+    whether or not the deltas were compacted yet.
+    """
+    table = time_tracking_daily_bucket_table
+    delta_table = time_tracking_bucket_delta_table
+    # Buckets of archived tasks are kept, they are found through the archive
+    tasks = task_with_archive
+
+    async def add_entry_delta(self, entry_id: int, sign: int = 1) -> None:
+        entries = time_tracking_entry_table
+        source = (
+            select(
+                entries.c.employee_id,
+                entries.c.task_id,
+                func.date(entries.c.created_at),
+                entries.c.duration_minutes * sign,
+                entries.c.cost_cents * sign,
+                literal(sign)
+            )
+            .where(entries.c.id == entry_id)
+        )
+        query = self.delta_table.insert().from_select(
+            ["employee_id", "task_id", "day", "minutes", "cost_cents", "entry_count"], source
+        )
+        self.log_query(query)
+        await self.database.execute(query)
+
+    async def compact(self, batch_size: int = 10_000) -> int:
+        """Folds pending deltas into the daily buckets, returns the number of deltas merged."""
+        merged = 0
+        while True:
+            batch_ids = select(self.delta_table.c.id).order_by(self.delta_table.c.id).limit(batch_size)
+            delete_query = (
+                self.delta_table.delete()
+                .where(self.delta_table.c.id.in_(batch_ids.scalar_subquery()))
+                .returning(self.delta_table)
+            )
+            self.log_query(delete_query)
+            async with self.database.transaction():
+                deltas = await self.database.fetch_all(delete_query)
+                totals = defaultdict(lambda: [0, 0, 0])
+                for delta in deltas:
+                    total = totals[(delta["employee_id"], delta["task_id"], delta["day"])]
+                    total[0] += delta["minutes"]
+                    total[1] += delta["cost_cents"]
+                    total[2] += delta["entry_count"]
+                for (employee_id, task_id, day), (minutes, cost_cents, count) in totals.items():
+                    await self.upsert_increment(
+                        {"employee_id": employee_id, "task_id": task_id, "day": day},
+                        {"total_minutes": minutes, "total_cost_cents": cost_cents, "entry_count": count},
+                    )
+                if totals:
+                    await self.database.execute(self.table.delete().where(self.table.c.entry_count <= 0))
+            merged += len(deltas)
+            if len(deltas) < batch_size:
+                return merged
+
+    async def rebuild(self) -> None:
+        entries = time_tracking_entry_with_archive
+        day = func.date(entries.c.created_at)
+        aggregate = (
+            select(
+                entries.c.employee_id,
+                entries.c.task_id,
+                day,
+                func.sum(entries.c.duration_minutes),
+                func.sum(entries.c.cost_cents),
+                func.count()
+            )
+            .group_by(entries.c.employee_id, entries.c.task_id, day)
+        )
+        insert_query = self.table.insert().from_select(
+            ["employee_id", "task_id", "day", "total_minutes", "total_cost_cents", "entry_count"], aggregate
+        )
+        self.log_query(insert_query)
+        async with self.database.transaction():
+            await self.database.execute(self.delta_table.delete())
+            await self.database.execute(self.table.delete())
+            await self.database.execute(insert_query)
+
+    async def delete_for_task(self, task_id: int) -> None:
+        async with self.database.transaction():
+            for table in (self.table, self.delta_table):
+                query = table.delete().where(table.c.task_id == task_id)
+                self.log_query(query)
+                await self.database.execute(query)
+
+    def _buckets_between(self, start: date, end: date):
+        buckets, deltas = self.table, self.delta_table
+        return union_all(
+            select(
+                buckets.c.employee_id,
+                buckets.c.task_id,
+                buckets.c.total_minutes.label("minutes"),
+                buckets.c.total_cost_cents.label("cost_cents")
+            ).where(and_(buckets.c.day >= start, buckets.c.day < end)),
+            select(
+                deltas.c.employee_id,
+                deltas.c.task_id,
+                deltas.c.minutes,
+                deltas.c.cost_cents
+            ).where(and_(deltas.c.day >= start, deltas.c.day < end))
+        ).subquery("buckets")
+
+    async def get_employee_minutes(self, company_id: int, start: date, end: date) -> list[dict]:
+        await self.shards.use_company(company_id)
+        buckets = self._buckets_between(start, end)
+        total_minutes = func.sum(buckets.c.minutes)
+        query = (
+            select(
+                employee_table.c.id.label("employee_id"),
+                employee_table.c.display_name.label("employee_display_name"),
+                total_minutes.label("total_minutes")
+            )
+            .select_from(
+                buckets
+                .join(employee_table, buckets.c.employee_id == employee_table.c.id)
+                .join(self.tasks, buckets.c.task_id == self.tasks.c.id)
+                .join(project_table, self.tasks.c.project_id == project_table.c.id)
+            )
+            .where(live_company_projects(company_id))
+            .group_by(employee_table.c.id, employee_table.c.display_name)
+            .having(total_minutes != 0)
+            .order_by(employee_table.c.display_name)
+        )
+        self.log_query(query)
+        return await self.database.reader().fetch_all(query)
+
+    async def get_project_costs(self, company_id: int, start: date, end: date) -> list[dict]:
+        await self.shards.use_company(company_id)
+        buckets = self._buckets_between(start, end)
+        total_minutes = func.sum(buckets.c.minutes)
+        total_cost_cents = func.sum(buckets.c.cost_cents)
+        query = (
+            select(
+                project_table.c.code.label("project_code"),
+                total_minutes.label("total_minutes"),
+                total_cost_cents.label("total_cost_cents")
+            )
+            .select_from(
+                buckets
+                .join(self.tasks, buckets.c.task_id == self.tasks.c.id)
+                .join(project_table, self.tasks.c.project_id == project_table.c.id)
+            )
+            .where(live_company_projects(company_id))
+            .group_by(project_table.c.id, project_table.c.code)
+            .having(total_minutes != 0)
+            .order_by(total_cost_cents.desc())
+        )
+        self.log_query(query)
+        return await self.database.reader().fetch_all(query)
+
 
 class TimeTrackingEntryRepo(RepoBase[int, TimeTrackingEntry]):
     crud: TimeTrackingEntryCrud
 
-    def __init__(self, crud: TimeTrackingEntryCrud, serializer: Serializer[TimeTrackingEntry, DTO]):
+    def __init__(
+        self,
+        crud: TimeTrackingEntryCrud,
+        serializer: Serializer[TimeTrackingEntry, DTO],
+        rollup_crud: ProjectCostRollupCrud | None = None,
+        bucket_crud: TimeBucketCrud | None = None,
+        with_archive_crud: TimeTrackingEntryWithArchiveCrud | None = None,
+    ):
         super().__init__(crud, serializer, TimeTrackingEntry)
+        self.not_found_exception_cls = TimeTrackingEntryNotFoundError
+        self.unique_violation_exception_cls = TimeTrackingEntryAlreadyExistsError
+        self.rollup_crud = rollup_crud or ProjectCostRollupCrud()
+        self.bucket_crud = bucket_crud or TimeBucketCrud()
+        # Statistics and history read archived entries too, so they do not change when entries move
+        self.with_archive_crud = with_archive_crud or TimeTrackingEntryWithArchiveCrud()
 
     async def get_total_minutes_by_task_and_employee(self, task_id: int, employee_id: int) -> int:
-        return await self.crud.get_total_minutes_by_task_and_employee(task_id, employee_id)
+        return await self.with_archive_crud.get_total_minutes_by_task_and_employee(task_id, employee_id)
 
     async def get_all_entries_for_company(self, company_id: int) -> list[TimeTrackingEntry]:
-        dtos = await self.crud.get_all_entries_for_company(company_id)
+        dtos = await self.with_archive_crud.get_all_entries_for_company(company_id)
         return list(self.serializer.flat.deserialize(dtos))
 
-    async def get_project_stats_for_company(self, company_id: int) -> list[dict]:
-        return await self.crud.get_project_stats_for_company(company_id)
+    async def get_project_stats_for_company(
+        self, company_id: int, stats_filter: StatsFilter | None = None
+    ) -> list[dict]:
+        return await self.with_archive_crud.get_project_stats_for_company(company_id, stats_filter)
+
+    async def get_employee_stats_for_company(
+        self, company_id: int, stats_filter: StatsFilter | None = None
+    ) -> list[dict]:
+        return await self.with_archive_crud.get_employee_stats_for_company(company_id, stats_filter)
+
+    def iter_project_stats_for_company(
+        self, company_id: int, stats_filter: StatsFilter | None = None
+    ) -> AsyncIterator[DTO]:
+        return self.with_archive_crud.iter_project_stats_for_company(company_id, stats_filter)
+
+    async def add_to_project_rollup(self, entry_id: int) -> None:
+        await self.rollup_crud.add_entries(time_tracking_entry_table.c.id == entry_id)
+
+    async def remove_from_project_rollup(
+        self,
+        entry_id: int | None = None,
+        task_id: int | None = None,
+        employee_id: int | None = None,
+    ) -> None:
+        if entry_id is None and task_id is None and employee_id is None:
+            raise ValueError("At least one of entry_id, task_id or employee_id is required")
+        for entries, subtract in (
+            (time_tracking_entry_table, self.rollup_crud.subtract_entries),
+            (time_tracking_entry_archive_table, self.rollup_crud.subtract_archived_entries),
+        ):
+            conditions = []
+            if entry_id is not None:
+                conditions.append(entries.c.id == entry_id)
+            if task_id is not None:
+                conditions.append(entries.c.task_id == task_id)
+            if employee_id is not None:
+                conditions.append(entries.c.employee_id == employee_id)
+            await subtract(*conditions)
+
+    async def delete_archived_entries(self, employee_id: int) -> None:
+        """Archived entries are not removed by the foreign keys of the employee."""
+        archive = time_tracking_entry_archive_table
+        query = archive.delete().where(archive.c.employee_id == employee_id)
+        self.crud.log_query(query)
+        await self.crud.database.execute(query)
+
+    async def delete_task_time_buckets(self, task_id: int) -> None:
+        await self.bucket_crud.delete_for_task(task_id)
+
+    async def rebuild_project_rollup(self, company_id: int | None = None) -> None:
+        await self.rollup_crud.rebuild(company_id)
+
+    def iter_employee_stats_for_company(
+        self, company_id: int, stats_filter: StatsFilter | None = None
+    ) -> AsyncIterator[DTO]:
+        return self.with_archive_crud.iter_employee_stats_for_company(company_id, stats_filter)
+
+    async def get_recent_entries_per_employee(
+        self, company_id: int, limit: int, stats_filter: StatsFilter | None = None
+    ) -> list[DTO]:
+        return await self.with_archive_crud.get_recent_entries_per_employee(company_id, limit, stats_filter)
+
+    async def get_employee_entries_before(
+        self, employee_id: int, limit: int, before_id: int | None = None, include_archived: bool = False
+    ) -> list[DTO]:
+        crud = self.with_archive_crud if include_archived else self.crud
+        return await crud.get_employee_entries_before(employee_id, limit, before_id)
+
+    async def add_to_time_buckets(self, entry_id: int) -> None:
+        await self.bucket_crud.add_entry_delta(entry_id)
+
+    async def remove_from_time_buckets(self, entry_id: int) -> None:
+        await self.bucket_crud.add_entry_delta(entry_id, sign=-1)
+
+    async def compact_time_buckets(self) -> int:
+        return await self.bucket_crud.compact()
+
+    async def rebuild_time_buckets(self) -> None:
+        await self.bucket_crud.rebuild()
+
+    async def get_employee_minutes(self, company_id: int, start: date, end: date) -> list[dict]:
+        return await self.bucket_crud.get_employee_minutes(company_id, start, end)
 
-    async def get_employee_stats_for_company(self, company_id: int) -> list[dict]:
-        return await self.crud.get_employee_stats_for_company(company_id)
+    async def get_project_costs(self, company_id: int, start: date, end: date) -> list[dict]:
+        return await self.bucket_crud.get_project_costs(company_id, start, end)
 
 
 time_tracking_entry_repo = TimeTrackingEntryRepo(TimeTrackingEntryCrud(), DataclassSerializer(TimeTrackingEntry))
\ No newline at end of file
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime
 
 from app.core.models import Entity
 
@@ -10,3 +10,20 @@ class TimeTrackingEntry(Entity):
     employee_id: int
     duration_minutes: int
     created_at: datetime
+    cost_cents: int
+
+
+@dataclass(frozen=True, kw_only=True)
+class StatsFilter:
+    """Limits stats to entries created on days ``start <= day < end`` for the given projects and employees.
+
+    ``None`` bounds and empty id tuples do not restrict the stats.
+    """
+    start: date | None = None
+    end: date | None = None
+    project_ids: tuple[int, ...] = ()
+    employee_ids: tuple[int, ...] = ()
+
+    @property
+    def is_ranged(self) -> bool:
+        return self.start is not None or self.end is not None
@@ -0,0 +1,177 @@
+import json
+import logging
+import re
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.core.database import get_database
+from app.time_tracking.tables import time_tracking_entry_table
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "time_tracking_entry"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+PARTITION_NAME_RE = re.compile(rf"^{PARENT_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> date | None:
+    match = PARTITION_NAME_RE.match(name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def partitions_between(start: date, end: date) -> list[str]:
+    """Names of the monthly partitions holding entries created on days ``start <= day < end``."""
+    names = []
+    month = month_start(start)
+    while month < end:
+        names.append(partition_name(month))
+        month = add_months(month, 1)
+    return names
+
+
+def plan_relations(plan: dict) -> set[str]:
+    relations = {plan["Relation Name"]} if "Relation Name" in plan else set()
+    for child in plan.get("Plans", []):
+        relations |= plan_relations(child)
+    return relations
+
+
+class TimeTrackingEntryPartitionManager:
+    """Keeps monthly ``created_at`` range partitions of ``time_tracking_entry`` in place.
+
+    Only PostgreSQL deployments are partitioned (see the ``time_tracking_entry_partitioning``
+    migration); on other databases every method is a no-op.
+    """
+
+    def __init__(self, months_ahead: int = 3, retention_months: int | None = None):
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+
+    @staticmethod
+    def is_supported() -> bool:
+        return get_database().url.dialect == "postgresql"
+
+    async def get_partitions(self) -> list[str]:
+        query = text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+            "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+            "WHERE parent.relname = :parent"
+        ).bindparams(parent=PARENT_TABLE)
+        return [row[0] for row in await get_database().fetch_all(query)]
+
+    async def create_partitions(self, today: date | None = None) -> list[str]:
+        """Creates partitions from the current month up to ``months_ahead`` months in the future."""
+        if not self.is_supported():
+            return []
+        current = month_start(today or date.today())
+        existing = set(await self.get_partitions())
+        created = []
+        for offset in range(self.months_ahead + 1):
+            month = add_months(current, offset)
+            name = partition_name(month)
+            if name in existing:
+                continue
+            try:
+                await self.create_partition(month, has_default=DEFAULT_PARTITION in existing)
+            except Exception:
+                # Leave the month to the next run, later months can still be created
+                logger.exception("Could not create time tracking partition %s", name)
+                continue
+            created.append(name)
+        if created:
+            logger.info("Created time tracking partitions: %s", ", ".join(created))
+        return created
+
+    async def create_partition(self, month: date, has_default: bool = True) -> int:
+        """Creates the partition of ``month``, returns how many entries it took over from the default partition.
+
+        PostgreSQL refuses to create a partition for a range the default partition already has
+        rows in (entries recorded while maintenance was behind, or dated ahead). Those rows are
+        moved: the default partition is detached, the month partition created, the rows moved
+        into it and the default partition attached again, all in one transaction.
+        """
+        name = partition_name(month)
+        start, end = month.isoformat(), add_months(month, 1).isoformat()
+        create = text(
+            f'CREATE TABLE "{name}" PARTITION OF {PARENT_TABLE} '
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+        database = get_database()
+        async with database.transaction():
+            in_default = False
+            if has_default:
+                in_default = await database.fetch_val(text(
+                    f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+                    f"WHERE created_at >= '{start}' AND created_at < '{end}')"
+                ))
+            if not in_default:
+                await database.execute(create)
+                return 0
+
+            columns = ", ".join(column.name for column in time_tracking_entry_table.columns)
+            await database.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+            await database.execute(create)
+            moved = await database.fetch_val(text(
+                f"WITH moved AS ("
+                f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= '{start}' AND created_at < '{end}' "
+                f"RETURNING {columns}"
+                f"), inserted AS ("
+                f'INSERT INTO "{name}" ({columns}) SELECT {columns} FROM moved RETURNING 1'
+                f") SELECT count(*) FROM inserted"
+            ))
+            await database.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+        logger.info("Moved %s entries from %s to %s", moved, DEFAULT_PARTITION, name)
+        return moved
+
+    async def detach_partitions(self, today: date | None = None) -> list[str]:
+        """Detaches monthly partitions that ended more than ``retention_months`` months ago.
+
+        Detached partitions stay in the database as standalone tables so they can be archived
+        or dropped by hand.
+        """
+        if not self.is_supported() or self.retention_months is None:
+            return []
+        cutoff = add_months(month_start(today or date.today()), -self.retention_months)
+        detached = []
+        for name in sorted(await self.get_partitions()):
+            month = partition_month(name)
+            if month is None or add_months(month, 1) > cutoff:
+                continue
+            await get_database().execute(text(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{name}"'))
+            detached.append(name)
+        if detached:
+            logger.info("Detached time tracking partitions: %s", ", ".join(detached))
+        return detached
+
+    async def scanned_partitions(self, query) -> list[str]:
+        """Runs EXPLAIN for ``query`` and returns the partitions left after pruning."""
+        compiled = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+        plan = await get_database().fetch_val(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return sorted(
+            name for name in plan_relations(plan[0]["Plan"])
+            if name.startswith(f"{PARENT_TABLE}_")
+        )
+
+    async def maintain(self, today: date | None = None) -> None:
+        await self.create_partitions(today)
+        await self.detach_partitions(today)
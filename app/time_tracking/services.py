@@ -1,8 +1,15 @@
-from datetime import datetime
+import calendar
+from datetime import date, datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from typing import AsyncIterator
 
+from app.core.database import get_database
+from app.core.settings import settings
 from app.core.serializer import DataclassSerializer
+from app.core.types import DTO, CursorPageData
 from app.time_tracking.dal import TimeTrackingEntryCrud, TimeTrackingEntryRepo
-from app.time_tracking.models import TimeTrackingEntry
+from app.time_tracking.models import StatsFilter, TimeTrackingEntry
+from app.time_tracking.partitions import TimeTrackingEntryPartitionManager
 
 
 class TimeTrackingEntryService:
@@ -15,13 +22,93 @@ class TimeTrackingEntryService:
         employee_id: int,
         duration_minutes: int,
     ) -> TimeTrackingEntry:
+        from app.company.services import company_service
+        from app.employee.services import employee_service
+        created_at = datetime.now()
+        salary_per_hour = await employee_service.get_salary_rate_at(employee_id, created_at)
+
         entry = TimeTrackingEntry(
             task_id=task_id,
             employee_id=employee_id,
             duration_minutes=duration_minutes,
-            created_at=datetime.now(),
+            created_at=created_at,
+            cost_cents=calculate_cost_cents(duration_minutes, salary_per_hour),
         )
-        return await self.time_tracking_entry_repo.create_and_get(entry)
+        async with get_database().transaction():
+            entry = await self.time_tracking_entry_repo.create_and_get(entry)
+            await self.time_tracking_entry_repo.add_to_project_rollup(entry.id)
+            await self.time_tracking_entry_repo.add_to_time_buckets(entry.id)
+            await company_service.bump_data_version_for_task(task_id)
+        return entry
+
+    async def delete_time_entry(self, entry_id: int) -> None:
+        from app.company.services import company_service
+
+        entry = await self.time_tracking_entry_repo.get_by_id(entry_id)
+        async with get_database().transaction():
+            await company_service.bump_data_version_for_task(entry.task_id)
+            await self.time_tracking_entry_repo.remove_from_project_rollup(entry_id=entry_id)
+            await self.time_tracking_entry_repo.remove_from_time_buckets(entry_id)
+            await self.time_tracking_entry_repo.delete(entry_id)
+
+    async def remove_task_entries_from_rollup(self, task_id: int) -> None:
+        await self.time_tracking_entry_repo.remove_from_project_rollup(task_id=task_id)
+
+    async def remove_employee_entries_from_rollup(self, employee_id: int) -> None:
+        await self.time_tracking_entry_repo.remove_from_project_rollup(employee_id=employee_id)
+
+    async def remove_task_time_buckets(self, task_id: int) -> None:
+        await self.time_tracking_entry_repo.delete_task_time_buckets(task_id)
+
+    async def delete_archived_employee_entries(self, employee_id: int) -> None:
+        await self.time_tracking_entry_repo.delete_archived_entries(employee_id)
+
+    async def rebuild_project_rollup(self, company_id: int | None = None) -> None:
+        await self.time_tracking_entry_repo.rebuild_project_rollup(company_id)
+
+    async def compact_time_buckets(self) -> int:
+        return await self.time_tracking_entry_repo.compact_time_buckets()
+
+    async def rebuild_time_buckets(self) -> None:
+        await self.time_tracking_entry_repo.rebuild_time_buckets()
+
+    async def get_employee_minutes_between(self, company_id: int, start: date, end: date) -> list[dict]:
+        """Minutes per employee for entries recorded on days ``start <= day < end``."""
+        return await self.time_tracking_entry_repo.get_employee_minutes(company_id, start, end)
+
+    async def get_employee_minutes_for_week(self, company_id: int, year: int, week: int) -> list[dict]:
+        start = date.fromisocalendar(year, week, 1)
+        return await self.get_employee_minutes_between(company_id, start, start + timedelta(days=7))
+
+    async def get_project_costs_between(self, company_id: int, start: date, end: date) -> list[dict]:
+        """Minutes and salary cost per project for entries recorded on days ``start <= day < end``."""
+        return await self.time_tracking_entry_repo.get_project_costs(company_id, start, end)
+
+    async def get_project_costs_for_month(self, company_id: int, year: int, month: int) -> list[dict]:
+        start = date(year, month, 1)
+        end = start + timedelta(days=calendar.monthrange(year, month)[1])
+        return await self.get_project_costs_between(company_id, start, end)
+
+    async def get_recent_entries_per_employee(
+        self, company_id: int, limit: int = 5, stats_filter: StatsFilter | None = None
+    ) -> list[dict]:
+        """The ``limit`` newest entries of every employee, ordered by employee and then newest first."""
+        rows = await self.time_tracking_entry_repo.get_recent_entries_per_employee(company_id, limit, stats_filter)
+        return [dict(row) for row in rows]
+
+    async def get_employee_history_page(
+        self, employee_id: int, before_id: int | None = None, page_size: int = 10, include_archived: bool = False
+    ) -> CursorPageData[dict]:
+        """A page of an employee's entries older than entry ``before_id``, newest first.
+
+        ``next_cursor`` is the ``before_id`` of the next page, ``None`` on the last page.
+        """
+        rows = await self.time_tracking_entry_repo.get_employee_entries_before(
+            employee_id, page_size + 1, before_id, include_archived
+        )
+        entries = [dict(row) for row in rows[:page_size]]
+        next_cursor = entries[-1]["id"] if len(rows) > page_size else None
+        return CursorPageData(data=entries, next_cursor=next_cursor)
 
     async def get_total_minutes_by_task_and_employee(
         self,
@@ -30,47 +117,81 @@ class TimeTrackingEntryService:
     ) -> int:
         return await self.time_tracking_entry_repo.get_total_minutes_by_task_and_employee(task_id, employee_id)
 
-    async def get_project_stats_for_company(self, company_id: int) -> list[dict]:
-        stats = await self.time_tracking_entry_repo.get_project_stats_for_company(company_id)
+    async def get_project_stats_for_company(
+        self, company_id: int, stats_filter: StatsFilter | None = None
+    ) -> list[dict]:
+        return [row async for row in self.iter_project_stats_for_company(company_id, stats_filter)]
 
+    async def iter_project_stats_for_company(
+        self, company_id: int, stats_filter: StatsFilter | None = None
+    ) -> AsyncIterator[dict]:
         from app.company.services import company_service
         company = await company_service.get_company_details(company_id)
 
-        rows = []
-        for stat in stats:
-            rows.append(
-                {
-                    "company_code": company.code,
-                    "project_code": stat["project_code"],
-                    "total_hours_spent": round(stat["total_minutes"] / 60.0, 2),
-                    "total_money_spent": round(stat["total_cost"], 2)
-                }
-            )
-        return rows
-
-    async def get_employee_stats_for_company(self, company_id: int) -> list[dict]:
-        stats = await self.time_tracking_entry_repo.get_employee_stats_for_company(company_id)
+        async for stat in self.time_tracking_entry_repo.iter_project_stats_for_company(company_id, stats_filter):
+            yield format_project_stat_row(company.code, stat)
 
+    async def get_employee_stats_for_company(
+        self, company_id: int, stats_filter: StatsFilter | None = None
+    ) -> list[dict]:
+        return [row async for row in self.iter_employee_stats_for_company(company_id, stats_filter)]
+
+    async def iter_employee_stats_for_company(
+        self, company_id: int, stats_filter: StatsFilter | None = None
+    ) -> AsyncIterator[dict]:
         from app.company.services import company_service
         company = await company_service.get_company_details(company_id)
 
-        rows = []
-        for stat in stats:
-            rows.append(
-                {
-                    "company_code": company.code,
-                    "project_code": stat["project_code"],
-                    "task_code": stat["task_code"],
-                    "task_name": stat["task_name"],
-                    "employee_display_name": stat["employee_display_name"],
-                    "created_at": stat["created_at"].strftime("%Y-%m-%d %H:%M:%S") if stat["created_at"] else None,
-                    "duration_minutes": stat["duration_minutes"],
-                    "salary": round(stat["salary_cost"], 2),
-                    "employee_total_minutes": stat["employee_total_minutes"]
-                }
-            )
-        return rows
+        async for stat in self.time_tracking_entry_repo.iter_employee_stats_for_company(company_id, stats_filter):
+            yield format_employee_stat_row(company.code, stat)
+
+
+def calculate_cost_cents(duration_minutes: int, salary_per_hour: float) -> int:
+    cents = Decimal(str(salary_per_hour)) * duration_minutes * 100 / 60
+    return int(cents.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
 
+def format_project_stat_row(company_code: str, stat: DTO) -> dict:
+    return {
+        "company_code": company_code,
+        "project_code": stat["project_code"],
+        "total_hours_spent": round(stat["total_minutes"] / 60.0, 2),
+        "total_money_spent": round(stat["total_cost_cents"] / 100, 2)
+    }
+
+
+def format_employee_stat_row(company_code: str, stat: DTO) -> dict:
+    return {
+        "company_code": company_code,
+        "project_code": stat["project_code"],
+        "task_code": stat["task_code"],
+        "task_name": stat["task_name"],
+        "employee_display_name": stat["employee_display_name"],
+        "created_at": stat["created_at"].strftime("%Y-%m-%d %H:%M:%S") if stat["created_at"] else None,
+        "duration_minutes": stat["duration_minutes"],
+        "salary": round(stat["cost_cents"] / 100, 2),
+        "employee_total_minutes": stat["employee_total_minutes"]
+    }
+
+
+PROJECT_STATS_FIELDNAMES = ["company_code", "project_code", "total_hours_spent", "total_money_spent"]
+EMPLOYEE_STATS_FIELDNAMES = [
+    "company_code",
+    "project_code",
+    "task_code",
+    "task_name",
+    "employee_display_name",
+    "created_at",
+    "duration_minutes",
+    "salary",
+    "employee_total_minutes",
+]
+
+
+time_tracking_entry_partition_manager = TimeTrackingEntryPartitionManager(
+    months_ahead=settings.TIME_ENTRY_PARTITION_MONTHS_AHEAD,
+    retention_months=settings.TIME_ENTRY_PARTITION_RETENTION_MONTHS,
+)
 
 time_tracking_entry_service = TimeTrackingEntryService(
     TimeTrackingEntryRepo(TimeTrackingEntryCrud(), DataclassSerializer(TimeTrackingEntry))
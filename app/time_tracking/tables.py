@@ -1,7 +1,10 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Table
+from sqlalchemy import BigInteger, Column, Date, DateTime, ForeignKey, Integer, Table
 
+from app.core.archive import archive_table, with_archive
 from app.core.database import metadata
 
+# On PostgreSQL the table is range partitioned by created_at month with the primary key
+# (id, created_at), see TimeTrackingEntryPartitionManager; id stays unique through its sequence.
 time_tracking_entry_table = Table(
     'time_tracking_entry',
     metadata,
@@ -10,4 +13,42 @@ time_tracking_entry_table = Table(
     Column('employee_id', Integer, ForeignKey('employee.id', ondelete='CASCADE'), nullable=False),
     Column('duration_minutes', Integer, nullable=False),
     Column('created_at', DateTime, nullable=False),
+    Column('cost_cents', BigInteger, nullable=False),
+)
+
+# Entries of archived tasks. The rollup and the daily buckets keep counting them.
+time_tracking_entry_archive_table = archive_table(time_tracking_entry_table)
+time_tracking_entry_with_archive = with_archive(time_tracking_entry_table, time_tracking_entry_archive_table)
+
+project_cost_rollup_table = Table(
+    'project_cost_rollup',
+    metadata,
+    Column('project_id', Integer, ForeignKey('project.id', ondelete='CASCADE'), primary_key=True),
+    Column('total_minutes', Integer, nullable=False),
+    Column('total_cost_cents', BigInteger, nullable=False),
+    Column('entry_count', Integer, nullable=False),
+)
+
+time_tracking_daily_bucket_table = Table(
+    'time_tracking_daily_bucket',
+    metadata,
+    Column('employee_id', Integer, ForeignKey('employee.id', ondelete='CASCADE'), primary_key=True),
+    # No foreign key: buckets outlive the hot row of an archived task
+    Column('task_id', Integer, primary_key=True),
+    Column('day', Date, primary_key=True),
+    Column('total_minutes', Integer, nullable=False),
+    Column('total_cost_cents', BigInteger, nullable=False),
+    Column('entry_count', Integer, nullable=False),
+)
+
+time_tracking_bucket_delta_table = Table(
+    'time_tracking_bucket_delta',
+    metadata,
+    Column('id', Integer, primary_key=True),
+    Column('employee_id', Integer, ForeignKey('employee.id', ondelete='CASCADE'), nullable=False),
+    Column('task_id', Integer, nullable=False),
+    Column('day', Date, nullable=False),
+    Column('minutes', Integer, nullable=False),
+    Column('cost_cents', BigInteger, nullable=False),
+    Column('entry_count', Integer, nullable=False),
 )
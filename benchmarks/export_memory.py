@@ -0,0 +1,119 @@
+"""Peak Python memory of the employee stats CSV export, buffered vs streaming.
+
+    python -m benchmarks.export_memory [entries ...]
+"""
+import asyncio
+import csv
+import io
+import os
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+
+DB_FILE = os.path.join(tempfile.gettempdir(), "export_memory_benchmark.sqlite")
+os.environ["DB_URI"] = f"sqlite+aiosqlite:///{DB_FILE}"
+os.environ.setdefault("TG_BOT_TOKEN", "42:BENCHMARK")
+
+from sqlalchemy import create_engine  # noqa: E402
+
+from app.company.tables import company_table  # noqa: E402
+from app.core.database import database, metadata  # noqa: E402
+from app.employee.tables import employee_table  # noqa: E402
+from app.project.tables import project_table  # noqa: E402
+from app.task.tables import task_table  # noqa: E402
+from app.tg_bot.utils.csv_export import export_csv  # noqa: E402
+from app.time_tracking.services import EMPLOYEE_STATS_FIELDNAMES, time_tracking_entry_service  # noqa: E402
+from app.time_tracking.tables import time_tracking_entry_table  # noqa: E402
+
+EMPLOYEES = 50
+TASKS = 200
+
+
+def seed(entries: int) -> None:
+    if os.path.exists(DB_FILE):
+        os.remove(DB_FILE)
+    engine = create_engine(f"sqlite:///{DB_FILE}")
+    metadata.create_all(engine)
+    now = datetime.now()
+    with engine.begin() as conn:
+        conn.execute(company_table.insert(), [{"id": 1, "name": "Bench", "code": "BEN", "owner_tg_id": 1}])
+        conn.execute(project_table.insert(), [{"id": 1, "company_id": 1, "name": "P", "code": "PRJ", "created_at": now}])
+        conn.execute(employee_table.insert(), [
+            {
+                "id": i, "telegram_id": 1000 + i, "company_id": 1, "is_active": True, "is_admin": False,
+                "created_at": now, "salary_per_hour": 20.0 + i, "display_name": f"Employee {i}",
+            }
+            for i in range(1, EMPLOYEES + 1)
+        ])
+        conn.execute(task_table.insert(), [
+            {
+                "id": i, "project_id": 1, "name": f"Task {i}", "code": i, "description": "x" * 200,
+                "deadline": now, "created_at": now, "assignee_user_id": 1001,
+            }
+            for i in range(1, TASKS + 1)
+        ])
+        batch = []
+        for i in range(entries):
+            employee_id = i % EMPLOYEES + 1
+            duration_minutes = 15 + i % 240
+            batch.append({
+                "task_id": i % TASKS + 1,
+                "employee_id": employee_id,
+                "duration_minutes": duration_minutes,
+                "created_at": now - timedelta(minutes=i),
+                "cost_cents": duration_minutes * (20 + employee_id) * 100 // 60,
+            })
+            if len(batch) == 10_000:
+                conn.execute(time_tracking_entry_table.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(time_tracking_entry_table.insert(), batch)
+    engine.dispose()
+
+
+async def buffered_export() -> int:
+    rows = await time_tracking_entry_service.get_employee_stats_for_company(1)
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=EMPLOYEE_STATS_FIELDNAMES)
+    writer.writeheader()
+    writer.writerows(rows)
+    data = output.getvalue().encode("utf-8")
+    return len(data)
+
+
+async def streaming_export() -> int:
+    export = await export_csv(
+        time_tracking_entry_service.iter_employee_stats_for_company(1), EMPLOYEE_STATS_FIELDNAMES
+    )
+    export.close()
+    return export.size
+
+
+async def measure(export) -> tuple[int, int]:
+    tracemalloc.start()
+    size = await export()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, peak
+
+
+async def main(sizes: list[int]) -> None:
+    print(f"{'entries':>10} {'csv size':>12} {'buffered peak':>15} {'streaming peak':>15}")
+    for entries in sizes:
+        seed(entries)
+        await database.connect()
+        try:
+            size, buffered_peak = await measure(buffered_export)
+            _, streaming_peak = await measure(streaming_export)
+        finally:
+            await database.disconnect()
+        print(
+            f"{entries:>10} {size / 2**20:>10.1f}MB "
+            f"{buffered_peak / 2**20:>13.1f}MB {streaming_peak / 2**20:>13.1f}MB"
+        )
+    os.remove(DB_FILE)
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 300_000]))
@@ -0,0 +1,86 @@
+"""Bytes fetched per task list page, whole rows vs the columns the list renders.
+
+    python -m benchmarks.list_projection [description length ...]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+DB_FILE = os.path.join(tempfile.gettempdir(), "list_projection_benchmark.sqlite")
+os.environ["DB_URI"] = f"sqlite+aiosqlite:///{DB_FILE}"
+os.environ.setdefault("TG_BOT_TOKEN", "42:BENCHMARK")
+
+from sqlalchemy import create_engine  # noqa: E402
+
+from app.company.tables import company_table  # noqa: E402
+from app.core.database import database, metadata  # noqa: E402
+from app.core.repo_base import RepoBase  # noqa: E402
+from app.core.types import PaginationParameters  # noqa: E402
+from app.project.tables import project_table  # noqa: E402
+from app.task.dal import TaskCrud  # noqa: E402
+from app.task.models import TaskListItem  # noqa: E402
+from app.task.tables import task_table  # noqa: E402
+
+TASKS = 1_000
+PAGE_SIZE = 5
+PAGES = 200
+
+
+def seed(description_length: int) -> None:
+    if os.path.exists(DB_FILE):
+        os.remove(DB_FILE)
+    engine = create_engine(f"sqlite:///{DB_FILE}")
+    metadata.create_all(engine)
+    now = datetime.now()
+    with engine.begin() as conn:
+        conn.execute(company_table.insert(), [{"id": 1, "name": "Bench", "code": "BEN", "owner_tg_id": 1}])
+        conn.execute(project_table.insert(), [{"id": 1, "company_id": 1, "name": "P", "code": "PRJ", "created_at": now}])
+        conn.execute(task_table.insert(), [
+            {
+                "id": i, "project_id": 1, "name": f"Task {i}", "code": i, "description": "x" * description_length,
+                "deadline": now, "created_at": now, "assignee_user_id": 1001,
+            }
+            for i in range(1, TASKS + 1)
+        ])
+    engine.dispose()
+
+
+def row_bytes(row) -> int:
+    return sum(len(str(value).encode("utf-8")) for value in dict(row).values())
+
+
+async def measure(columns) -> tuple[float, float]:
+    crud = TaskCrud()
+    total = 0
+    started = time.perf_counter()
+    for page in range(1, PAGES + 1):
+        pagination = PaginationParameters(page=page, page_size=PAGE_SIZE)
+        page_data = await crud.get_by_assignee_user_id(1001, pagination, columns)
+        total += sum(row_bytes(row) for row in page_data.data)
+    elapsed = time.perf_counter() - started
+    return total / PAGES, elapsed / PAGES * 1000
+
+
+async def main(description_lengths: list[int]) -> None:
+    columns = RepoBase.projection(TaskListItem)
+    print(f"{'description':>12} {'full page':>12} {'projected':>12} {'full ms':>9} {'proj ms':>9}")
+    for description_length in description_lengths:
+        seed(description_length)
+        await database.connect()
+        try:
+            full_bytes, full_ms = await measure(None)
+            projected_bytes, projected_ms = await measure(columns)
+        finally:
+            await database.disconnect()
+        print(
+            f"{description_length:>12} {full_bytes:>11.0f}B {projected_bytes:>11.0f}B "
+            f"{full_ms:>9.2f} {projected_ms:>9.2f}"
+        )
+    os.remove(DB_FILE)
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(arg) for arg in sys.argv[1:]] or [0, 200, 2_000]))
@@ -0,0 +1,74 @@
+"""Per-call Python overhead of the hot queries: build + compile through databases vs pre-compiled statements.
+
+    python -m benchmarks.prepared_statements [calls]
+
+Only the client side is measured, no database is needed. On PostgreSQL both paths end up in the
+same asyncpg statement cache, so the difference is the time saved per call.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("TG_BOT_TOKEN", "42:BENCHMARK")
+
+from databases.backends.postgres import PostgresBackend  # noqa: E402
+from sqlalchemy import and_, bindparam, func, select  # noqa: E402
+
+from app.core.statements import Statement  # noqa: E402
+from app.employee.tables import employee_table  # noqa: E402
+from app.task.tables import task_table  # noqa: E402
+from app.time_tracking.tables import time_tracking_entry_table  # noqa: E402
+
+employee, task, entry = employee_table, task_table, time_tracking_entry_table
+
+QUERIES = {
+    "task get_by_id": (
+        lambda id: task.select().where(task.c.id == id),
+        lambda: task.select().where(task.c.id == bindparam("id")),
+        {"id": 1},
+    ),
+    "employee by telegram/company": (
+        lambda telegram_id, company_id: select(employee).where(
+            and_(employee.c.telegram_id == telegram_id, employee.c.company_id == company_id)
+        ),
+        lambda: select(employee).where(
+            and_(employee.c.telegram_id == bindparam("telegram_id"), employee.c.company_id == bindparam("company_id"))
+        ),
+        {"telegram_id": 1001, "company_id": 1},
+    ),
+    "total minutes by task/employee": (
+        lambda task_id, employee_id: select(func.sum(entry.c.duration_minutes)).where(
+            and_(entry.c.task_id == task_id, entry.c.employee_id == employee_id)
+        ),
+        lambda: select(func.sum(entry.c.duration_minutes)).where(
+            and_(entry.c.task_id == bindparam("task_id"), entry.c.employee_id == bindparam("employee_id"))
+        ),
+        {"task_id": 1, "employee_id": 1},
+    ),
+    "task by code/project": (
+        lambda code, project_id: select(task).where(and_(task.c.code == code, task.c.project_id == project_id)),
+        lambda: select(task).where(and_(task.c.code == bindparam("code"), task.c.project_id == bindparam("project_id"))),
+        {"code": 1, "project_id": 1},
+    ),
+}
+
+
+def per_call_us(call, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        call()
+    return (time.perf_counter() - started) / calls * 1_000_000
+
+
+def main(calls: int) -> None:
+    connection = PostgresBackend("postgresql://bench@localhost/bench").connection()
+    print(f"{'query':>32} {'databases':>11} {'prepared':>10} {'saved':>9}")
+    for name, (build, build_prepared, values) in QUERIES.items():
+        statement = Statement(name, build_prepared())
+        databases_us = per_call_us(lambda: connection._compile(build(**values)), calls)
+        prepared_us = per_call_us(lambda: (statement.compile(), statement.args(values)), calls)
+        print(f"{name:>32} {databases_us:>9.1f}us {prepared_us:>8.1f}us {databases_us - prepared_us:>7.1f}us")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
@@ -0,0 +1,127 @@
+"""Latency of weekly/monthly range reports read from daily buckets vs raw time entries.
+
+    python -m benchmarks.time_buckets [entries ...]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+DB_FILE = os.path.join(tempfile.gettempdir(), "time_buckets_benchmark.sqlite")
+os.environ["DB_URI"] = f"sqlite+aiosqlite:///{DB_FILE}"
+os.environ.setdefault("TG_BOT_TOKEN", "42:BENCHMARK")
+
+from sqlalchemy import create_engine, text  # noqa: E402
+
+from app.company.tables import company_table  # noqa: E402
+from app.core.database import database, metadata  # noqa: E402
+from app.employee.tables import employee_table  # noqa: E402
+from app.project.tables import project_table  # noqa: E402
+from app.task.tables import task_table  # noqa: E402
+from app.time_tracking.dal import TimeBucketCrud, TimeTrackingEntryCrud  # noqa: E402
+from app.time_tracking.tables import time_tracking_entry_table  # noqa: E402
+
+EMPLOYEES = 200
+PROJECTS = 20
+TASKS = 2_000
+DAYS = 730
+TASKS_PER_DAY = 3
+START = datetime(2025, 1, 1)
+REPEATS = 5
+
+INDEXES = [
+    "CREATE INDEX ix_task_project_id ON task (project_id)",
+    "CREATE INDEX ix_project_company_id ON project (company_id)",
+    "CREATE INDEX ix_time_tracking_entry_created_at ON time_tracking_entry (created_at)",
+    "CREATE INDEX ix_time_tracking_daily_bucket_day ON time_tracking_daily_bucket (day)",
+]
+
+
+def seed(entries: int) -> None:
+    if os.path.exists(DB_FILE):
+        os.remove(DB_FILE)
+    engine = create_engine(f"sqlite:///{DB_FILE}")
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        for index in INDEXES:
+            conn.execute(text(index))
+        conn.execute(company_table.insert(), [{"id": 1, "name": "Bench", "code": "BEN", "owner_tg_id": 1}])
+        conn.execute(project_table.insert(), [
+            {"id": i, "company_id": 1, "name": f"P{i}", "code": f"P{i}", "created_at": START}
+            for i in range(1, PROJECTS + 1)
+        ])
+        conn.execute(employee_table.insert(), [
+            {
+                "id": i, "telegram_id": 1000 + i, "company_id": 1, "is_active": True, "is_admin": False,
+                "created_at": START, "salary_per_hour": 20.0 + i % 30, "display_name": f"Employee {i}",
+            }
+            for i in range(1, EMPLOYEES + 1)
+        ])
+        conn.execute(task_table.insert(), [
+            {
+                "id": i, "project_id": i % PROJECTS + 1, "name": f"Task {i}", "code": i, "description": "",
+                "deadline": START, "created_at": START, "assignee_user_id": 1001,
+            }
+            for i in range(1, TASKS + 1)
+        ])
+        step = DAYS * 24 * 60 / entries
+        batch = []
+        for i in range(entries):
+            created_at = START + timedelta(minutes=i * step)
+            employee_id = i % EMPLOYEES + 1
+            # every employee switches between a few tasks per day
+            task_id = (employee_id * 13 + (created_at - START).days * 7 + i // EMPLOYEES % TASKS_PER_DAY) % TASKS + 1
+            duration_minutes = 15 + i % 240
+            batch.append({
+                "task_id": task_id,
+                "employee_id": employee_id,
+                "duration_minutes": duration_minutes,
+                "created_at": created_at,
+                "cost_cents": duration_minutes * (20 + employee_id % 30) * 100 // 60,
+            })
+            if len(batch) == 50_000:
+                conn.execute(time_tracking_entry_table.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(time_tracking_entry_table.insert(), batch)
+    engine.dispose()
+
+
+async def timed(query, *args) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        await query(*args)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+async def main(sizes: list[int]) -> None:
+    week = (1, date(2026, 3, 2), date(2026, 3, 9))
+    month = (1, date(2026, 3, 1), date(2026, 4, 1))
+    entry_crud, bucket_crud = TimeTrackingEntryCrud(), TimeBucketCrud()
+    print(f"{'entries':>10} {'report':>24} {'raw entries':>12} {'buckets':>10}")
+    for entries in sizes:
+        seed(entries)
+        await database.connect()
+        try:
+            await bucket_crud.rebuild()
+            reports = [
+                ("employee minutes / week", entry_crud.get_employee_minutes_from_entries,
+                 bucket_crud.get_employee_minutes, week),
+                ("project cost / month", entry_crud.get_project_costs_from_entries,
+                 bucket_crud.get_project_costs, month),
+            ]
+            for name, raw_query, bucket_query, args in reports:
+                raw_ms = await timed(raw_query, *args)
+                bucket_ms = await timed(bucket_query, *args)
+                print(f"{entries:>10} {name:>24} {raw_ms:>10.1f}ms {bucket_ms:>8.1f}ms")
+        finally:
+            await database.disconnect()
+    os.remove(DB_FILE)
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(arg) for arg in sys.argv[1:]] or [1_000_000, 10_000_000]))
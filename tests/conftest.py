@@ -1,38 +1,87 @@
 import os
-import uuid
-from unittest.mock import patch
+import shutil
+from datetime import datetime
 
+import pytest
 import pytest_asyncio
 from databases import Database
 from sqlalchemy import create_engine
 
-from app.core.database import metadata
+from app.company.dal import CompanyCrud
+from app.core.database import DatabaseRouter, metadata, use_database
+from app.core.sharding import DEFAULT_SHARD, ShardMap, use_shard_map
+from app.employee.dal import EmployeeCrud
+from app.project.dal import ProjectCrud
+from app.task.dal import TaskCrud
 
+# "copy": every test gets its own copy of the schema template.
+# "rollback": every test runs in a transaction on the template itself, rolled back at teardown.
+TEST_DB_ISOLATION = os.environ.get("TEST_DB_ISOLATION", "copy")
 
-@pytest_asyncio.fixture(autouse=True)
-async def db():
-    db_file = f"test_{uuid.uuid4().hex}.db"
-    db_url = f"sqlite+aiosqlite:///{db_file}"
-    sync_url = f"sqlite:///{db_file}"
 
-    engine = create_engine(sync_url)
+@pytest.fixture(scope="session")
+def schema_template(tmp_path_factory) -> str:
+    """A SQLite file with the whole schema, created once per session (and per xdist worker)."""
+    path = tmp_path_factory.mktemp("schema") / "template.db"
+    engine = create_engine(f"sqlite:///{path}")
     metadata.create_all(engine)
     engine.dispose()
+    return str(path)
+
+
+@pytest.fixture
+def sqlite_database(schema_template, tmp_path_factory):
+    """Factory of databases with the schema already in place, each in its own file."""
+    directory = tmp_path_factory.mktemp("db")
+
+    def create(name: str = "test") -> Database:
+        path = directory / f"{name}.db"
+        shutil.copyfile(schema_template, path)
+        return Database(f"sqlite+aiosqlite:///{path}")
+
+    return create
 
-    test_database = Database(db_url)
+
+@pytest_asyncio.fixture(autouse=True)
+async def db(schema_template, sqlite_database):
+    if TEST_DB_ISOLATION == "rollback":
+        database = Database(f"sqlite+aiosqlite:///{schema_template}", force_rollback=True)
+    else:
+        database = sqlite_database()
+    test_database = DatabaseRouter(database)
     await test_database.connect()
 
-    with (
-        patch('app.core.database.database', test_database),
-        patch('app.core.crud_base.database', test_database),
-        patch('app.company.dal.database', test_database),
-        patch('app.employee.dal.database', test_database),
-        patch('app.project.dal.database', test_database),
-        patch('app.task.dal.database', test_database),
-        patch('app.time_tracking.dal.database', test_database)
-    ):
+    with use_database(test_database), use_shard_map(ShardMap({DEFAULT_SHARD: test_database})):
         yield test_database
 
     await test_database.disconnect()
-    if os.path.exists(db_file):
-        os.remove(db_file)
+
+
+@pytest_asyncio.fixture
+async def company_setup(db):
+    company_id = await CompanyCrud().create({"name": "Company", "code": "CMP", "owner_tg_id": 1})
+    project_id = await ProjectCrud().create({
+        "company_id": company_id, "name": "Project", "code": "PRJ", "created_at": datetime.now()
+    })
+    task_id = await TaskCrud().create({
+        "project_id": project_id,
+        "name": "Task",
+        "code": 1,
+        "description": "Description",
+        "deadline": datetime.now(),
+        "created_at": datetime.now(),
+        "assignee_user_id": 111,
+    })
+    employee_crud = EmployeeCrud()
+    employee_ids = []
+    for telegram_id, name, salary in [(111, "Alice", 60.0), (222, "Bob", 30.0)]:
+        employee_ids.append(await employee_crud.create({
+            "telegram_id": telegram_id,
+            "company_id": company_id,
+            "is_active": True,
+            "is_admin": False,
+            "created_at": datetime.now(),
+            "salary_per_hour": salary,
+            "display_name": name,
+        }))
+    return {"company_id": company_id, "project_id": project_id, "task_id": task_id, "employee_ids": employee_ids}
@@ -1,5 +1,4 @@
 import pytest
-import sqlite3
 
 from app.company.dal import CompanyCrud, CompanyRepo
 from app.company.services import CompanyService
@@ -65,8 +64,7 @@ class TestCompanyService:
             owner_tg_id=123456789
         )
 
-        # SQLite raises IntegrityError instead of asyncpg.UniqueViolationError
-        with pytest.raises(sqlite3.IntegrityError):
+        with pytest.raises(CompanyAlreadyExistsError):
             await company_service.create_company(
                 name="Second Company",
                 code="TST",
@@ -85,7 +83,7 @@ class TestCompanyService:
 
         assert page_data.total == 2
         assert len(page_data.data) == 2
-        assert all(c.owner_tg_id == owner_tg_id for c in page_data.data)
+        assert {c.code for c in page_data.data} == {"AAA", "BBB"}
 
     async def test_get_my_companies_with_pagination(self, db, company_service):
         owner_tg_id = 123456789
@@ -185,3 +183,14 @@ class TestCompanyService:
         assert company1.code == "ABC"
         assert company2.code == "DEF"
         assert company3.code == "XYZ"
+
+    async def test_data_version_is_bumped_per_company(self, db, company_service):
+        first = await company_service.create_company(name="First", code="FST", owner_tg_id=1)
+        second = await company_service.create_company(name="Second", code="SND", owner_tg_id=1)
+        assert await company_service.get_data_version(first.id) == 0
+
+        await company_service.bump_data_version(first.id)
+        await company_service.bump_data_version(first.id)
+
+        assert await company_service.get_data_version(first.id) == 2
+        assert await company_service.get_data_version(second.id) == 0
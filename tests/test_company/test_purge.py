@@ -0,0 +1,148 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+
+from app.company.purge import DeletedDataPurger
+from app.company.services import company_service
+from app.company.tables import company_table
+from app.core.sharding import company_shard_table
+from app.employee.services import employee_service
+from app.project.exceptions import ProjectNotFoundError
+from app.project.services import project_service
+from app.project.tables import project_table
+from app.task.dal import task_repo
+from app.task.exceptions import TaskNotFoundError
+from app.task.services import task_service
+from app.task.tables import task_table
+from app.time_tracking.services import time_tracking_entry_service
+from app.time_tracking.tables import time_tracking_entry_table
+
+OWNER = 1
+
+
+async def create_project(company_id: int, code: str, entries: int = 3) -> int:
+    project = await project_service.create_project(company_id, f"Project {code}", code, OWNER)
+    employee = await employee_service.get_employee_by_telegram_id_and_company_id(OWNER, company_id)
+    for number in range(2):
+        task = await task_service.create_task(project.id, f"Task {number}", "", datetime.now(), OWNER, OWNER)
+        for _ in range(entries):
+            await time_tracking_entry_service.create_time_entry(task.id, employee.id, 30)
+    return project.id
+
+
+async def create_company(code: str) -> int:
+    company = await company_service.create_company(f"Company {code}", code, OWNER)
+    await employee_service.create_employee(company.id, OWNER, "Owner", 10.0, True, OWNER)
+    return company.id
+
+
+async def count(db, table, condition=None) -> int:
+    query = select(func.count()).select_from(table)
+    if condition is not None:
+        query = query.where(condition)
+    return await db.fetch_val(query)
+
+
+@pytest.mark.asyncio
+class TestDeletedDataPurger:
+    async def test_deleted_project_is_hidden_until_purged(self, db):
+        company_id = await create_company("AAA")
+        deleted_id = await create_project(company_id, "DEL")
+        await create_project(company_id, "KEE")
+
+        await project_service.delete_project(deleted_id, OWNER)
+
+        with pytest.raises(ProjectNotFoundError):
+            await project_service.get_project_details(deleted_id)
+        projects = await project_service.get_projects(company_id)
+        assert [p.code for p in projects.data] == ["KEE"]
+        assert (await task_service.get_my_tasks(OWNER)).total == 2
+        stats = await time_tracking_entry_service.get_project_stats_for_company(company_id)
+        assert [row["project_code"] for row in stats] == ["KEE"]
+        assert await count(db, task_table) == 4
+
+        purged = await DeletedDataPurger(batch_size=2, batch_pause=0).purge()
+
+        assert (purged["time_tracking_entry"], purged["task"], purged["project"]) == (6, 2, 1)
+        assert await count(db, project_table) == 1
+        assert await count(db, task_table) == 2
+        assert await count(db, time_tracking_entry_table) == 6
+
+    async def test_deleted_company_is_purged_with_its_data(self, db):
+        company_id = await create_company("AAA")
+        await create_project(company_id, "AAA")
+        other_id = await create_company("BBB")
+        await create_project(other_id, "BBB")
+
+        await company_service.delete_company(company_id, OWNER)
+
+        companies = await company_service.get_my_companies(OWNER)
+        assert [c.code for c in companies.data] == ["BBB"]
+        assert (await task_service.get_my_tasks(OWNER)).total == 2
+
+        await DeletedDataPurger(batch_size=4, batch_pause=0).purge()
+
+        assert await count(db, company_table) == 1
+        assert await count(db, project_table) == 1
+        assert await count(db, time_tracking_entry_table) == 6
+        assert await count(db, company_shard_table, company_shard_table.c.company_id == company_id) == 0
+        assert (await company_service.create_company("Again", "AAA", OWNER)).code == "AAA"
+
+    async def test_deleted_codes_can_be_taken_again_before_the_purge(self, db):
+        company_id = await create_company("AAA")
+        project_id = await create_project(company_id, "PRJ")
+        await project_service.delete_project(project_id, OWNER)
+
+        new_project_id = await create_project(company_id, "PRJ")
+        await company_service.delete_company(company_id, OWNER)
+        new_company_id = await create_company("AAA")
+
+        assert (await company_service.company_repo.get_by_code("AAA")).id == new_company_id
+        assert await count(db, company_shard_table, company_shard_table.c.code == "AAA") == 1
+
+        await DeletedDataPurger(batch_pause=0).purge()
+
+        assert await db.fetch_val(select(company_table.c.id)) == new_company_id
+        assert await count(db, project_table, project_table.c.id == new_project_id) == 0
+        assert await count(db, company_shard_table) == 1
+
+    async def test_purge_resumes_after_a_crash(self, db, monkeypatch):
+        company_id = await create_company("AAA")
+        project_id = await create_project(company_id, "DEL", entries=5)
+        await project_service.delete_project(project_id, OWNER)
+        purger = DeletedDataPurger(batch_size=3, batch_pause=0)
+        delete_batch = purger._delete_batch
+        calls = 0
+
+        async def crash_on_third_batch(table, condition):
+            nonlocal calls
+            calls += 1
+            if calls == 3:
+                raise ConnectionError("connection lost")
+            return await delete_batch(table, condition)
+
+        monkeypatch.setattr(purger, "_delete_batch", crash_on_third_batch)
+        with pytest.raises(ConnectionError):
+            await purger.purge()
+        assert await count(db, time_tracking_entry_table) == 4
+
+        monkeypatch.undo()
+        purged = await purger.purge()
+
+        assert (purged["time_tracking_entry"], purged["task"], purged["project"]) == (4, 2, 1)
+        assert await count(db, project_table) == 0
+
+    async def test_task_of_deleted_project_cannot_be_changed(self, db):
+        company_id = await create_company("AAA")
+        project_id = await create_project(company_id, "DEL", entries=0)
+        task = (await task_service.get_tasks(project_id)).data[0]
+        full_task = await task_repo.get_by_id(task.id)
+
+        await project_service.delete_project(project_id, OWNER)
+
+        with pytest.raises(TaskNotFoundError):
+            await task_repo.patch(task.id, name="Renamed")
+        with pytest.raises(TaskNotFoundError):
+            await task_repo.update(full_task)
+        assert await db.fetch_val(select(task_table.c.name).where(task_table.c.id == task.id)) == task.name
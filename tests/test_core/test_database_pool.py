@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from app.core.database import PooledDatabase
+from app.core.exceptions import DatabaseBusyError
+
+POOL_SIZE = 2
+
+
+@pytest_asyncio.fixture
+async def pooled_database(tmp_path):
+    database = PooledDatabase(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", max_connections=POOL_SIZE, acquire_timeout=5)
+    await database.connect()
+    yield database
+    await database.disconnect()
+
+
+async def handler(database: PooledDatabase, in_use: list[int], duration: float = 0.05) -> None:
+    async with database.connection() as connection:
+        in_use.append(database.pool_stats().in_use)
+        await connection.fetch_val(select(1))
+        await asyncio.sleep(duration)
+
+
+@pytest.mark.asyncio
+class TestPooledDatabase:
+    async def test_handlers_beyond_pool_size_wait_for_a_connection(self, pooled_database):
+        in_use = []
+
+        await asyncio.gather(*(handler(pooled_database, in_use) for _ in range(10)))
+
+        stats = pooled_database.pool_stats()
+        assert max(in_use) == POOL_SIZE
+        assert stats.acquired == 10
+        assert stats.in_use == 0
+        assert stats.waiters == 0
+        assert stats.timeouts == 0
+        # Eight handlers queued behind the first two, the last ones for four handler durations.
+        assert stats.acquire_wait_max >= 0.15
+
+    async def test_waiters_are_reported(self, pooled_database):
+        in_use = []
+        handlers = [asyncio.create_task(handler(pooled_database, in_use, duration=0.2)) for _ in range(5)]
+        await asyncio.sleep(0.1)
+
+        stats = pooled_database.pool_stats()
+        assert stats.in_use == POOL_SIZE
+        assert stats.waiters == 3
+
+        await asyncio.gather(*handlers)
+
+    async def test_acquire_timeout_raises_busy_error(self, pooled_database):
+        pooled_database.gate.acquire_timeout = 0.05
+        in_use = []
+        holders = [asyncio.create_task(handler(pooled_database, in_use, duration=0.3)) for _ in range(POOL_SIZE)]
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(DatabaseBusyError):
+            await pooled_database.fetch_val(select(1))
+
+        await asyncio.gather(*holders)
+        assert pooled_database.pool_stats().timeouts == 1
+        assert await pooled_database.fetch_val(select(1)) == 1
+
+    async def test_prewarm_opens_connections_at_once(self, pooled_database):
+        await pooled_database.prewarm(5)
+
+        stats = pooled_database.pool_stats()
+        assert stats.acquired == POOL_SIZE
+        assert stats.in_use == 0
@@ -0,0 +1,112 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+
+from app.core.database import DatabaseRouter, get_database, use_database
+from app.project.dal import ProjectCrud
+
+
+@pytest_asyncio.fixture
+async def router(sqlite_database):
+    router = DatabaseRouter(sqlite_database("primary"), sqlite_database("replica"))
+    await router.connect()
+    with use_database(router):
+        yield router
+    await router.disconnect()
+
+
+def project(code: str) -> dict:
+    return {"company_id": 1, "name": f"Project {code}", "code": code, "created_at": datetime.now()}
+
+
+@pytest.mark.asyncio
+class TestDatabaseRouter:
+    async def test_reads_go_to_replica_and_writes_to_primary(self, router):
+        await router.replica.execute(ProjectCrud.table.insert().values(project("REP")))
+
+        async with router.read_your_writes():
+            page = await ProjectCrud().get_page(filters={"company_id": 1})
+            assert [p["code"] for p in page.data] == ["REP"]
+            assert await ProjectCrud().count() == 1
+
+        async with router.read_your_writes():
+            await ProjectCrud().create(project("PRI"))
+
+        assert await router.primary.fetch_val("SELECT count(*) FROM project") == 1
+        assert await router.replica.fetch_val("SELECT count(*) FROM project") == 1
+
+    async def test_write_pins_the_rest_of_the_scope_to_primary(self, router):
+        async with router.read_your_writes():
+            assert router.reader() is router.replica
+            project_id = await ProjectCrud().create(project("PRI"))
+
+            assert router.reader() is router.primary
+            assert (await ProjectCrud().get_by_id(project_id))["code"] == "PRI"
+
+        async with router.read_your_writes():
+            assert await ProjectCrud().get_by_id(project_id) is None
+
+    async def test_transaction_pins_to_primary(self, router):
+        async with router.read_your_writes():
+            async with router.transaction():
+                assert router.reader() is router.primary
+
+    async def test_transaction_is_tracked_until_it_ends(self, router):
+        assert not router.in_transaction()
+
+        async with router.transaction():
+            assert router.in_transaction()
+            await ProjectCrud().create(project("PRI"))
+        assert not router.in_transaction()
+
+        with pytest.raises(RuntimeError):
+            async with router.transaction():
+                await ProjectCrud().create(project("RBK"))
+                raise RuntimeError("rolled back")
+        assert not router.in_transaction()
+        assert await router.primary.fetch_val("SELECT count(*) FROM project") == 1
+
+    async def test_select_does_not_pin(self, router):
+        async with router.read_your_writes():
+            await router.fetch_all(ProjectCrud.table.select())
+            await router.fetch_val("SELECT 1")
+
+            assert router.reader() is router.replica
+
+    async def test_without_replica_everything_reads_primary(self, sqlite_database):
+        router = DatabaseRouter(sqlite_database("only"))
+
+        async with router.read_your_writes():
+            assert router.reader() is router.primary
+
+
+@pytest.mark.asyncio
+class TestDatabaseProvider:
+    async def test_concurrent_tasks_use_their_own_database(self, sqlite_database):
+        first = DatabaseRouter(sqlite_database("first"))
+        second = DatabaseRouter(sqlite_database("second"))
+        await first.connect()
+        await second.connect()
+
+        async def create_projects(db: DatabaseRouter, codes: list[str]) -> None:
+            with use_database(db):
+                for code in codes:
+                    await ProjectCrud().create(project(code))
+                    await asyncio.sleep(0)
+
+        await asyncio.gather(create_projects(first, ["AAA", "BBB"]), create_projects(second, ["CCC"]))
+
+        assert [row["code"] for row in await first.fetch_all(ProjectCrud.table.select())] == ["AAA", "BBB"]
+        assert [row["code"] for row in await second.fetch_all(ProjectCrud.table.select())] == ["CCC"]
+        await first.disconnect()
+        await second.disconnect()
+
+    async def test_use_database_restores_the_previous_one(self, db, sqlite_database):
+        other = DatabaseRouter(sqlite_database("other"))
+
+        with use_database(other):
+            assert get_database() is other
+
+        assert get_database() is db
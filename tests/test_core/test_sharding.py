@@ -0,0 +1,141 @@
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from app.company.relocation import move_company
+from app.company.services import company_service
+from app.core.database import DatabaseRouter, get_database
+from app.core.exceptions import ShardRoutingError
+from app.core.sharding import DEFAULT_SHARD, ShardMap, company_shard_table, use_shard_map
+from app.core.types import PaginationParameters
+from app.employee.services import employee_service
+from app.project.dal import ProjectCrud
+from app.project.services import project_service
+from app.task.services import task_service
+from app.time_tracking.services import time_tracking_entry_service
+
+OWNER = 1
+
+
+@pytest_asyncio.fixture
+async def shards(sqlite_database):
+    shards = ShardMap({
+        DEFAULT_SHARD: DatabaseRouter(sqlite_database("default")),
+        "eu": DatabaseRouter(sqlite_database("eu")),
+    })
+    await shards.connect()
+    with use_shard_map(shards):
+        yield shards
+    await shards.disconnect()
+
+
+async def create_company(shards: ShardMap, code: str, shard: str = DEFAULT_SHARD) -> int:
+    shards.new_company_shard = shard
+    with shards.scope():
+        company = await company_service.create_company(f"Company {code}", code, OWNER)
+        await employee_service.create_employee(company.id, OWNER, f"Owner {code}", 10.0, True, OWNER)
+        project = await project_service.create_project(company.id, f"Project {code}", code, OWNER)
+        task = await task_service.create_task(project.id, "Task", "Description", datetime.now(), OWNER, OWNER)
+        employee = await employee_service.get_employee_by_telegram_id_and_company_id(OWNER, company.id)
+        await time_tracking_entry_service.create_time_entry(task.id, employee.id, 30)
+    return company.id
+
+
+async def count(db: DatabaseRouter, table_name: str) -> int:
+    return await db.fetch_val(f"SELECT count(*) FROM {table_name}")
+
+
+@pytest.mark.asyncio
+class TestShardMap:
+    async def test_company_data_goes_to_its_shard(self, shards):
+        company_id = await create_company(shards, "EUR", shard="eu")
+
+        eu, default = shards.shard("eu"), shards.shard(DEFAULT_SHARD)
+        for table_name in ("company", "employee", "project", "task", "time_tracking_entry"):
+            assert await count(eu, table_name) == 1
+            assert await count(default, table_name) == 0
+        directory = await default.fetch_one(select(company_shard_table))
+        assert (directory["company_id"], directory["code"], directory["shard"]) == (company_id, "EUR", "eu")
+
+    async def test_company_scoped_query_pins_the_scope_to_the_shard(self, shards):
+        company_id = await create_company(shards, "EUR", shard="eu")
+
+        with shards.scope():
+            assert get_database() is shards.directory
+            employees = await employee_service.get_employees(company_id)
+
+            assert [e.display_name for e in employees.data] == ["Owner EUR"]
+            assert get_database() is shards.shard("eu")
+
+    async def test_lookup_by_id_alone_finds_the_shard(self, shards):
+        await create_company(shards, "EUR", shard="eu")
+        project_id = (await shards.shard("eu").fetch_one(ProjectCrud.table.select()))["id"]
+
+        with shards.scope():
+            project = await project_service.get_project_details(project_id)
+
+            assert project.code == "EUR"
+            assert get_database() is shards.shard("eu")
+
+    async def test_row_on_several_shards_is_an_error(self, shards):
+        await create_company(shards, "AAA")
+        await create_company(shards, "EUR", shard="eu")
+
+        with shards.scope(), pytest.raises(ShardRoutingError):
+            await ProjectCrud().get_by_id(1)
+
+    async def test_my_companies_are_merged_across_shards(self, shards):
+        for code, shard in [("AAA", DEFAULT_SHARD), ("BBB", "eu"), ("CCC", DEFAULT_SHARD), ("DDD", "eu")]:
+            await create_company(shards, code, shard)
+
+        with shards.scope():
+            first = await company_service.get_my_companies(OWNER, PaginationParameters(page=1, page_size=3))
+            second = await company_service.get_my_companies(OWNER, PaginationParameters(page=2, page_size=3))
+
+        assert [c.code for c in first.data] == ["AAA", "BBB", "CCC"]
+        assert [c.code for c in second.data] == ["DDD"]
+        assert first.total == second.total == 4
+
+    async def test_move_company_to_another_shard(self, shards):
+        company_id = await create_company(shards, "MOV")
+        await create_company(shards, "STA")
+        default, eu = shards.shard(DEFAULT_SHARD), shards.shard("eu")
+
+        moved = await move_company(company_id, "eu", shards)
+
+        assert moved["company"] == moved["project"] == moved["task"] == moved["time_tracking_entry"] == 1
+        assert await shards.shard_of(company_id) == "eu"
+        for table_name in ("company", "employee", "project", "task", "time_tracking_entry"):
+            assert await count(eu, table_name) == 1
+            assert await count(default, table_name) == 1
+        with shards.scope():
+            company = await company_service.get_company_details(company_id)
+            stats = await time_tracking_entry_service.get_project_stats_for_company(company_id)
+
+        assert company.code == "MOV"
+        assert [row["project_code"] for row in stats] == ["MOV"]
+        assert await move_company(company_id, "eu", shards) == {}
+
+    async def test_my_task_counts_are_summed_across_shards(self, shards):
+        await create_company(shards, "AAA")
+        await create_company(shards, "EUR", shard="eu")
+
+        with shards.scope():
+            counts = await task_service.get_my_task_counts(OWNER)
+            open_tasks = await task_service.get_my_tasks(OWNER, open_only=True)
+
+        assert counts["new"] == 2
+        assert open_tasks.total == 2
+
+    async def test_employee_history_is_read_from_the_employee_shard(self, shards):
+        company_id = await create_company(shards, "EUR", shard="eu")
+        with shards.scope():
+            employee = await employee_service.get_employee_by_telegram_id_and_company_id(OWNER, company_id)
+
+        with shards.scope():
+            history = await time_tracking_entry_service.get_employee_history_page(employee.id)
+
+            assert [entry["project_code"] for entry in history.data] == ["EUR"]
+            assert get_database() is shards.shard("eu")
@@ -0,0 +1,90 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import and_, bindparam, select
+
+from app.core.statements import Statement, StatementRegistry
+from app.employee.dal import EmployeeCrud
+from app.employee.tables import employee_table
+
+
+class FakeAsyncpgConnection:
+    def __init__(self):
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    @property
+    def raw_connection(self):
+        return self
+
+    async def fetchrow(self, sql, *args):
+        self.calls.append((sql, args))
+        return (7,)
+
+
+def employee_by_telegram_id() -> Statement:
+    return Statement("employee_by_telegram_id", select(employee_table).where(
+        and_(
+            employee_table.c.company_id == bindparam("company_id"),
+            employee_table.c.telegram_id == bindparam("telegram_id"),
+            employee_table.c.is_active.is_(True),
+        )
+    ))
+
+
+class TestStatement:
+    def test_compiles_once_to_positional_asyncpg_sql(self):
+        statement = employee_by_telegram_id()
+
+        sql = statement.compile()
+
+        assert "employee.company_id = $1::INTEGER AND employee.telegram_id = $2::BIGINT" in sql
+        assert statement.compile() is sql
+        assert statement.args({"telegram_id": 10, "company_id": 3}) == [3, 10]
+
+    @pytest.mark.asyncio
+    async def test_postgresql_runs_compiled_sql_on_raw_connection(self):
+        connection = FakeAsyncpgConnection()
+        database = SimpleNamespace(url=SimpleNamespace(dialect="postgresql"), connection=lambda: connection)
+        statement = employee_by_telegram_id()
+
+        assert await statement.fetch_val(database, company_id=3, telegram_id=10) == 7
+        await statement.fetch_one(database, company_id=4, telegram_id=11)
+
+        assert [args for _, args in connection.calls] == [(3, 10), (4, 11)]
+        assert connection.calls[0][0] == statement.compile()
+
+
+class TestStatementRegistry:
+    def test_builds_each_statement_once(self):
+        registry = StatementRegistry()
+        builds = []
+
+        def build():
+            builds.append(1)
+            return select(employee_table)
+
+        first = registry.get("key", "name", build)
+        second = registry.get("key", "name", build)
+
+        assert first is second
+        assert len(builds) == 1
+        assert len(registry) == 1
+
+    @pytest.mark.asyncio
+    async def test_crud_statement_falls_back_to_databases_on_sqlite(self, db):
+        employee_id = await EmployeeCrud().create({
+            "telegram_id": 10, "company_id": 1, "is_active": True, "is_admin": False,
+            "created_at": datetime.now(), "salary_per_hour": 10.0, "display_name": "E",
+        })
+
+        employee = await EmployeeCrud().get_by_telegram_id_and_company_id(10, 1)
+
+        assert employee["id"] == employee_id
+        assert await EmployeeCrud().get_by_telegram_id_and_company_id(10, 2) is None
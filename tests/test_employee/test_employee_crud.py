@@ -1,7 +1,12 @@
 import pytest
 from datetime import datetime
 
-from app.employee.dal import EmployeeCrud
+from app.employee.dal import EmployeeCrud, EmployeeRepo
+from app.employee.exceptions import EmployeeNotFoundError
+from app.employee.models import Employee
+from app.core.exceptions import ConcurrentUpdateError
+from app.core.serializer import DataclassSerializer
+from app.core.statements import statements
 from app.core.types import PaginationParameters
 
 
@@ -141,7 +146,7 @@ class TestEmployeeCrud:
         }
 
         employee_id = await crud.create(employee_data)
-        updated = await crud.update_display_name(employee_id, "Jane Smith")
+        updated = await crud.patch(employee_id, display_name="Jane Smith")
 
         assert updated["display_name"] == "Jane Smith"
         assert updated["id"] == employee_id
@@ -159,7 +164,7 @@ class TestEmployeeCrud:
         }
 
         employee_id = await crud.create(employee_data)
-        updated = await crud.update_salary_per_hour(employee_id, 30.0)
+        updated = await crud.patch(employee_id, salary_per_hour=30.0)
 
         assert updated["salary_per_hour"] == 30.0
         assert updated["id"] == employee_id
@@ -177,11 +182,84 @@ class TestEmployeeCrud:
         }
 
         employee_id = await crud.create(employee_data)
-        updated = await crud.update_is_active(employee_id, False)
+        updated = await crud.patch(employee_id, is_active=False)
 
         assert updated["is_active"] is False
         assert updated["id"] == employee_id
 
+    async def test_patch_writes_only_the_given_columns(self, db):
+        crud = EmployeeCrud()
+        employee_id = await crud.create({
+            "telegram_id": 123456789,
+            "company_id": 1,
+            "is_active": True,
+            "is_admin": False,
+            "created_at": datetime.now(),
+            "salary_per_hour": 25.0,
+            "display_name": "John Doe"
+        })
+
+        await crud.patch(employee_id, display_name="Jane Smith", is_active=False)
+        cached = len(statements)
+        updated = await crud.patch(employee_id, is_active=True, display_name="John Smith")
+
+        assert len(statements) == cached
+        assert (updated["display_name"], updated["is_active"], updated["salary_per_hour"]) == ("John Smith", True, 25.0)
+        sql = crud.statement("patch(display_name, is_active)", lambda: pytest.fail("not cached")).compile()
+        assert (
+            "UPDATE employee SET is_active=$1::BOOLEAN, display_name=$2::VARCHAR, "
+            "version=(employee.version + $3::INTEGER) WHERE employee.id = $4::INTEGER"
+        ) in sql
+
+    async def test_patch_missing_row(self, db):
+        repo = EmployeeRepo(EmployeeCrud(), DataclassSerializer(Employee))
+
+        assert await repo.crud.patch(999, display_name="Nobody") is None
+        with pytest.raises(EmployeeNotFoundError):
+            await repo.patch(999, display_name="Nobody")
+
+    async def test_patch_with_stale_version_conflicts(self, db):
+        repo = EmployeeRepo(EmployeeCrud(), DataclassSerializer(Employee))
+        employee = await repo.create_and_get(Employee(
+            telegram_id=123456789,
+            company_id=1,
+            is_active=True,
+            is_admin=False,
+            created_at=datetime.now(),
+            salary_per_hour=25.0,
+            display_name="John Doe",
+        ))
+
+        updated = await repo.patch(employee.id, employee.version, is_active=False)
+        with pytest.raises(ConcurrentUpdateError):
+            await repo.patch(employee.id, employee.version, display_name="Jane Smith")
+
+        assert updated.version == employee.version + 1
+        assert (await repo.get_by_id(employee.id)).display_name == "John Doe"
+        assert (await repo.patch(employee.id, updated.version, display_name="Jane Smith")).version == updated.version + 1
+
+    async def test_update_with_stale_version_conflicts(self, db):
+        repo = EmployeeRepo(EmployeeCrud(), DataclassSerializer(Employee))
+        employee = await repo.create_and_get(Employee(
+            telegram_id=123456789,
+            company_id=1,
+            is_active=True,
+            is_admin=False,
+            created_at=datetime.now(),
+            salary_per_hour=25.0,
+            display_name="John Doe",
+        ))
+
+        await repo.patch(employee.id, salary_per_hour=30.0)
+        employee.display_name = "Jane Smith"
+        with pytest.raises(ConcurrentUpdateError):
+            await repo.update_and_get(employee)
+
+        employee = await repo.get_by_id(employee.id)
+        employee.display_name = "Jane Smith"
+        updated = await repo.update_and_get(employee)
+        assert (updated.display_name, updated.salary_per_hour, updated.version) == ("Jane Smith", 30.0, 3)
+
     async def test_delete_employee(self, db):
         crud = EmployeeCrud()
         employee_data = {
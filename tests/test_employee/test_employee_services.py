@@ -271,6 +271,23 @@ class TestEmployeeService:
 
         assert updated.salary_per_hour == 30.0
 
+    async def test_set_salary_per_hour_keeps_rate_history(self, db, employee_service, test_company):
+        owner_tg_id = 111111111
+        created = await employee_service.create_employee(
+            company_id=test_company,
+            telegram_id=222222222,
+            display_name="John Doe",
+            salary_per_hour=25.0,
+            is_admin=False,
+            user_tg_id=owner_tg_id
+        )
+        before_change = datetime.now()
+
+        await employee_service.set_salary_per_hour(created.id, 30.0, owner_tg_id)
+
+        assert await employee_service.get_salary_rate_at(created.id, before_change) == 25.0
+        assert await employee_service.get_salary_rate_at(created.id, datetime.now()) == 30.0
+
     async def test_set_salary_per_hour_unauthorized(self, db, employee_service, test_company):
         company_id = test_company
         owner_tg_id = 111111111
@@ -1,7 +1,17 @@
+import asyncio
+from types import SimpleNamespace
+
 import pytest
 from datetime import datetime
 
-from app.project.dal import ProjectCrud
+from sqlalchemy.dialects import postgresql
+
+from app.core.database import use_database
+from app.core.serializer import DataclassSerializer
+from app.core.settings import settings
+from app.project.dal import ProjectCrud, ProjectRepo
+from app.project.exceptions import ProjectNotFoundError
+from app.project.models import Project, ProjectListItem
 from app.core.types import PaginationParameters
 
 
@@ -198,3 +208,123 @@ class TestProjectCrud:
         page_data = await crud.get_page(filters={"company_id": 2})
         assert page_data.total == 3
         assert all(p["company_id"] == 2 for p in page_data.data)
+
+    async def test_iter_all_reads_in_batches(self, db):
+        crud = ProjectCrud()
+        ids = [
+            await crud.create({"company_id": 1, "name": f"Project {i}", "code": f"P{i:02d}", "created_at": datetime.now()})
+            for i in range(5)
+        ]
+
+        projects = [project async for project in crud.iter_all(fetch_size=2)]
+
+        assert [p["id"] for p in projects] == ids
+
+    async def test_iter_filtered(self, db):
+        crud = ProjectCrud()
+        for i in range(4):
+            await crud.create({
+                "company_id": 1 + i % 2, "name": f"Project {i}", "code": f"P{i:02d}", "created_at": datetime.now()
+            })
+
+        projects = [project async for project in crud.iter_filtered({"company_id": 2}, fetch_size=1)]
+
+        assert [p["code"] for p in projects] == ["P01", "P03"]
+
+    async def test_keyset_iteration_allows_queries_between_rows(self, db):
+        crud = ProjectCrud()
+        for i in range(3):
+            await crud.create({"company_id": 1, "name": f"Project {i}", "code": f"P{i:02d}", "created_at": datetime.now()})
+
+        async def rename_all():
+            async for project in crud.iter_all(fetch_size=2):
+                await crud.update({"id": project["id"], "name": project["name"].upper()})
+
+        await asyncio.wait_for(rename_all(), timeout=5)
+
+        assert {p["name"] for p in await crud.get_all()} == {"PROJECT 0", "PROJECT 1", "PROJECT 2"}
+
+    async def test_repo_iter_filtered_deserializes(self, db):
+        repo = ProjectRepo(ProjectCrud(), DataclassSerializer(Project))
+        await repo.crud.create({"company_id": 1, "name": "Project", "code": "PRJ", "created_at": datetime.now()})
+
+        projects = [project async for project in repo.iter_filtered({"company_id": 1})]
+
+        assert len(projects) == 1
+        assert isinstance(projects[0], Project)
+        assert projects[0].code == "PRJ"
+
+    async def test_get_page_selects_only_requested_columns(self, db):
+        crud = ProjectCrud()
+        await crud.create({"company_id": 1, "name": "Project", "code": "PRJ", "created_at": datetime.now()})
+
+        page_data = await crud.get_page(filters={"company_id": 1}, columns=["id", "code"])
+
+        assert page_data.total == 1
+        assert set(page_data.data[0].keys()) == {"id", "code"}
+
+    async def test_repo_get_page_with_read_model(self, db):
+        repo = ProjectRepo(ProjectCrud(), DataclassSerializer(Project))
+        await repo.crud.create({"company_id": 1, "name": "Project", "code": "PRJ", "created_at": datetime.now()})
+
+        page_data = await repo.get_by_company_id(1, read_model=ProjectListItem)
+
+        assert page_data.total == 1
+        assert page_data.data[0] == ProjectListItem(id=page_data.data[0].id, code="PRJ", name="Project")
+
+    async def test_get_many_by_ids_in_chunks_keeps_input_order(self, db, monkeypatch):
+        monkeypatch.setattr(settings, "DB_IN_CHUNK_SIZE", 2)
+        crud = ProjectCrud()
+        ids = [
+            await crud.create({"company_id": 1, "name": f"Project {i}", "code": f"P{i:02d}", "created_at": datetime.now()})
+            for i in range(5)
+        ]
+        requested = [ids[3], ids[0], 10_000, ids[4], ids[1]]
+
+        projects = await crud.get_many_by_ids(requested)
+
+        assert [p["id"] for p in projects] == [ids[3], ids[0], ids[4], ids[1]]
+
+    async def test_repo_get_many_by_ids_reports_missing(self, db):
+        repo = ProjectRepo(ProjectCrud(), DataclassSerializer(Project))
+        project_id = await repo.crud.create({"company_id": 1, "name": "Project", "code": "PRJ", "created_at": datetime.now()})
+
+        assert [p.id for p in await repo.get_many_by_ids([project_id, 10_000])] == [project_id]
+        with pytest.raises(ProjectNotFoundError, match="10000"):
+            await repo.get_many_by_ids([project_id, 10_000], missing_ok=False)
+
+    async def test_delete_many_in_chunks(self, db, monkeypatch):
+        monkeypatch.setattr(settings, "DB_IN_CHUNK_SIZE", 2)
+        crud = ProjectCrud()
+        ids = [
+            await crud.create({"company_id": 1, "name": f"Project {i}", "code": f"P{i:02d}", "created_at": datetime.now()})
+            for i in range(5)
+        ]
+
+        await crud.delete_many(ids[:4])
+
+        assert [p["id"] for p in await crud.get_all()] == [ids[4]]
+
+    async def test_count_leaves_out_deleted_projects(self, db):
+        crud = ProjectCrud()
+        ids = [
+            await crud.create({"company_id": 1, "name": f"Project {i}", "code": f"P{i:02d}", "created_at": datetime.now()})
+            for i in range(3)
+        ]
+        assert await crud.count() == 3
+
+        await crud.mark_deleted(ids[0])
+
+        assert await crud.count() == 2
+
+    async def test_large_id_sets_bind_one_array_on_postgresql(self, monkeypatch):
+        monkeypatch.setattr(settings, "DB_ANY_ARRAY_THRESHOLD", 3)
+        crud = ProjectCrud()
+
+        with use_database(SimpleNamespace(url=SimpleNamespace(dialect="postgresql"))):
+            small = crud._ids_conditions([1, 2, 3])
+            large = crud._ids_conditions([1, 2, 3, 4])
+
+        assert " IN " in str(small[0].compile(dialect=postgresql.dialect()))
+        assert len(large) == 1
+        assert "= ANY (%(ids)s::INTEGER[])" in str(large[0].compile(dialect=postgresql.dialect()))
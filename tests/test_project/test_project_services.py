@@ -149,7 +149,7 @@ class TestProjectService:
 
         assert page_data.total == 2
         assert len(page_data.data) == 2
-        assert all(p.company_id == company.id for p in page_data.data)
+        assert {p.code for p in page_data.data} == {"AAA", "BBB"}
 
     async def test_get_projects_with_pagination(self, db, project_service):
         company = await company_service.create_company(
@@ -0,0 +1,160 @@
+from datetime import date, datetime
+
+import pytest
+
+from app.company.dal import CompanyCrud
+from app.company.services import company_service
+from app.report.dal import report_job_repo
+from app.report.exceptions import ReportAccessDeniedError, ReportJobAlreadyExistsError
+from app.report.models import ReportJob, ReportJobStatus, ReportType
+from app.report.services import ReportJobService
+
+OWNER_TG_ID = 1
+
+
+@pytest.fixture
+def service():
+    return ReportJobService(report_job_repo)
+
+
+async def create_company(code: str = "CMP") -> int:
+    return await CompanyCrud().create({"name": "Company", "code": code, "owner_tg_id": OWNER_TG_ID})
+
+
+@pytest.mark.asyncio
+class TestReportJobService:
+    async def test_submit_queues_job(self, db, service):
+        company_id = await create_company()
+
+        job, created = await service.submit(company_id, ReportType.PROJECT_STATS, 10, OWNER_TG_ID, 20)
+
+        assert created
+        assert job.status == ReportJobStatus.QUEUED
+        assert job.progress_message_id == 20
+        assert service.submitted.is_set()
+
+    async def test_submit_requires_owner(self, db, service):
+        company_id = await create_company()
+
+        with pytest.raises(ReportAccessDeniedError):
+            await service.submit(company_id, ReportType.PROJECT_STATS, 10, 999)
+
+    async def test_submit_deduplicates_active_job(self, db, service):
+        company_id = await create_company()
+
+        first, _ = await service.submit(company_id, ReportType.PROJECT_STATS, 10, OWNER_TG_ID)
+        second, created = await service.submit(company_id, ReportType.PROJECT_STATS, 11, OWNER_TG_ID)
+        other, other_created = await service.submit(company_id, ReportType.EMPLOYEE_STATS, 10, OWNER_TG_ID)
+
+        assert not created
+        assert second.id == first.id
+        assert other_created
+        assert other.id != first.id
+
+    async def test_submit_deduplicates_per_range(self, db, service):
+        company_id = await create_company()
+        september = {"start_date": date(2026, 9, 1), "end_date": date(2026, 10, 1)}
+
+        whole, _ = await service.submit(company_id, ReportType.PROJECT_STATS, 10, OWNER_TG_ID)
+        ranged, ranged_created = await service.submit(company_id, ReportType.PROJECT_STATS, 10, OWNER_TG_ID, **september)
+        again, again_created = await service.submit(company_id, ReportType.PROJECT_STATS, 10, OWNER_TG_ID, **september)
+
+        assert ranged_created
+        assert ranged.id != whole.id
+        assert ranged.stats_filter.start == date(2026, 9, 1)
+        assert not again_created
+        assert again.id == ranged.id
+
+    async def test_submit_after_data_change_queues_new_job(self, db, service):
+        company_id = await create_company()
+
+        first, _ = await service.submit(company_id, ReportType.PROJECT_STATS, 10, OWNER_TG_ID)
+        await company_service.bump_data_version(company_id)
+        second, created = await service.submit(company_id, ReportType.PROJECT_STATS, 10, OWNER_TG_ID)
+
+        assert created
+        assert second.id != first.id
+
+    async def test_finished_job_is_not_reused(self, db, service):
+        company_id = await create_company()
+
+        first, _ = await service.submit(company_id, ReportType.PROJECT_STATS, 10, OWNER_TG_ID)
+        await service.claim_next()
+        await service.mark_done(first.id, 0)
+        second, created = await service.submit(company_id, ReportType.PROJECT_STATS, 10, OWNER_TG_ID)
+
+        assert created
+        assert (await service.get_job(first.id)).status == ReportJobStatus.DONE
+
+    async def test_claim_next_takes_oldest_queued_job_once(self, db, service):
+        first_company = await create_company("AAA")
+        second_company = await create_company("BBB")
+        first, _ = await service.submit(first_company, ReportType.PROJECT_STATS, 10, OWNER_TG_ID)
+        second, _ = await service.submit(second_company, ReportType.PROJECT_STATS, 10, OWNER_TG_ID)
+
+        claimed = [await service.claim_next(), await service.claim_next(), await service.claim_next()]
+
+        assert [job.id for job in claimed[:2]] == [first.id, second.id]
+        assert claimed[0].status == ReportJobStatus.RUNNING
+        assert claimed[0].started_at is not None
+        assert claimed[2] is None
+
+    async def test_requeue_interrupted(self, db, service):
+        company_id = await create_company()
+        job, _ = await service.submit(company_id, ReportType.PROJECT_STATS, 10, OWNER_TG_ID)
+        await service.claim_next()
+
+        assert await service.requeue_interrupted() == 1
+
+        requeued = await service.get_job(job.id)
+        assert requeued.status == ReportJobStatus.QUEUED
+        assert requeued.started_at is None
+        assert (await service.claim_next()).id == job.id
+
+    async def test_mark_failed_keeps_error(self, db, service):
+        company_id = await create_company()
+        job, _ = await service.submit(company_id, ReportType.PROJECT_STATS, 10, OWNER_TG_ID)
+
+        await service.mark_failed(job.id, "boom")
+
+        failed = await service.get_job(job.id)
+        assert failed.status == ReportJobStatus.FAILED
+        assert failed.error == "boom"
+        assert failed.finished_at is not None
+
+    async def test_concurrent_submit_returns_the_job_that_won(self, db, service, monkeypatch):
+        company_id = await create_company()
+        first, _ = await service.submit(company_id, ReportType.PROJECT_STATS, 10, OWNER_TG_ID)
+        get_active = report_job_repo.get_active
+        calls = 0
+
+        async def missed_by_the_first_check(*args):
+            # The other request inserts between this request's check and its insert
+            nonlocal calls
+            calls += 1
+            return None if calls == 1 else await get_active(*args)
+
+        monkeypatch.setattr(report_job_repo, "get_active", missed_by_the_first_check)
+        second, created = await service.submit(company_id, ReportType.PROJECT_STATS, 11, OWNER_TG_ID)
+
+        assert not created
+        assert second.id == first.id
+        assert calls == 2
+
+    async def test_duplicate_active_job_violates_the_unique_index(self, db):
+        company_id = await create_company()
+        job = ReportJob(
+            company_id=company_id,
+            report_type=ReportType.PROJECT_STATS,
+            status=ReportJobStatus.QUEUED,
+            data_version=0,
+            requested_by_tg_id=OWNER_TG_ID,
+            chat_id=10,
+            created_at=datetime.now(),
+        )
+        await report_job_repo.create(job)
+
+        with pytest.raises(ReportJobAlreadyExistsError) as error:
+            await report_job_repo.create(job)
+
+        assert error.value.constraint_name == "ux_report_job_active"
@@ -0,0 +1,143 @@
+import csv
+import io
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.report.dal import report_job_repo
+from app.report.models import ReportJobStatus, ReportType
+from app.report.services import ReportJobService
+from app.tg_bot.report_worker import ReportWorkerPool
+from app.tg_bot.utils.export_cache import ExportCache
+from app.time_tracking.services import time_tracking_entry_service
+
+OWNER_TG_ID = 1
+CHAT_ID = 10
+PROGRESS_MESSAGE_ID = 20
+
+
+class FakeBot:
+    def __init__(self, fail_send: bool = False):
+        self.fail_send = fail_send
+        self.documents = []
+        self.edits = []
+        self.deleted = []
+
+    async def send_document(self, chat_id, document, caption=None):
+        if self.fail_send:
+            raise RuntimeError("upload failed")
+        chunks = [chunk async for chunk in document.read(None)]
+        self.documents.append((chat_id, document.filename, b"".join(chunks), caption))
+
+    async def edit_message_text(self, text, chat_id, message_id):
+        self.edits.append((chat_id, message_id, text))
+
+    async def delete_message(self, chat_id, message_id):
+        self.deleted.append((chat_id, message_id))
+
+
+@pytest.fixture
+def service():
+    return ReportJobService(report_job_repo)
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        yield executor
+
+
+def make_pool(bot, service, executor, cache=None):
+    return ReportWorkerPool(
+        bot,
+        service,
+        cache or ExportCache(max_memory_size=1024 * 1024, max_disk_size=0),
+        executor=executor,
+        chunk_rows=1,
+        progress_interval=0,
+    )
+
+
+@pytest.mark.asyncio
+class TestReportWorkerPool:
+    async def test_job_sends_document_and_replaces_progress_message(self, service, executor, company_setup):
+        alice, bob = company_setup["employee_ids"]
+        await time_tracking_entry_service.create_time_entry(company_setup["task_id"], alice, 60)
+        await time_tracking_entry_service.create_time_entry(company_setup["task_id"], bob, 120)
+        job, _ = await service.submit(
+            company_setup["company_id"], ReportType.EMPLOYEE_STATS, CHAT_ID, OWNER_TG_ID, PROGRESS_MESSAGE_ID
+        )
+        bot = FakeBot()
+
+        await make_pool(bot, service, executor).process(await service.claim_next())
+
+        [(chat_id, filename, data, caption)] = bot.documents
+        rows = list(csv.DictReader(io.StringIO(data.decode("utf-8"))))
+        assert chat_id == CHAT_ID
+        assert filename == "CMP_employee_stats.csv"
+        assert caption == "📊 Employee statistics for Company (all time)"
+        assert len(rows) == 2
+        assert bot.edits and "rows" in bot.edits[-1][2]
+        assert bot.deleted == [(CHAT_ID, PROGRESS_MESSAGE_ID)]
+        done = await service.get_job(job.id)
+        assert done.status == ReportJobStatus.DONE
+        assert done.rows_done == 2
+
+    async def test_job_without_data_reports_empty_export(self, service, executor, company_setup):
+        job, _ = await service.submit(
+            company_setup["company_id"], ReportType.PROJECT_STATS, CHAT_ID, OWNER_TG_ID, PROGRESS_MESSAGE_ID
+        )
+        bot = FakeBot()
+
+        await make_pool(bot, service, executor).process(await service.claim_next())
+
+        assert bot.documents == []
+        assert bot.edits[-1] == (CHAT_ID, PROGRESS_MESSAGE_ID, "No time tracking data available for export")
+        assert (await service.get_job(job.id)).status == ReportJobStatus.DONE
+
+    async def test_failed_job_is_marked_failed(self, service, executor, company_setup):
+        await time_tracking_entry_service.create_time_entry(
+            company_setup["task_id"], company_setup["employee_ids"][0], 60
+        )
+        job, _ = await service.submit(
+            company_setup["company_id"], ReportType.PROJECT_STATS, CHAT_ID, OWNER_TG_ID, PROGRESS_MESSAGE_ID
+        )
+        bot = FakeBot(fail_send=True)
+
+        await make_pool(bot, service, executor).process(await service.claim_next())
+
+        failed = await service.get_job(job.id)
+        assert failed.status == ReportJobStatus.FAILED
+        assert failed.error == "upload failed"
+        assert bot.edits[-1][2].startswith("❌")
+
+    async def test_unchanged_data_is_served_from_export_cache(self, service, executor, company_setup):
+        await time_tracking_entry_service.create_time_entry(
+            company_setup["task_id"], company_setup["employee_ids"][0], 60
+        )
+        cache = ExportCache(max_memory_size=1024 * 1024, max_disk_size=0)
+        bot = FakeBot()
+        pool = make_pool(bot, service, executor, cache)
+
+        for _ in range(2):
+            job, _ = await service.submit(company_setup["company_id"], ReportType.PROJECT_STATS, CHAT_ID, OWNER_TG_ID)
+            await pool.process(await service.claim_next())
+
+        assert len(bot.documents) == 2
+        assert bot.documents[0][2] == bot.documents[1][2]
+        assert cache.stats().hits == 1
+
+    async def test_ranged_job_exports_only_its_range(self, service, executor, company_setup):
+        await time_tracking_entry_service.create_time_entry(
+            company_setup["task_id"], company_setup["employee_ids"][0], 60
+        )
+        await service.submit(
+            company_setup["company_id"], ReportType.PROJECT_STATS, CHAT_ID, OWNER_TG_ID,
+            start_date=date(2020, 1, 1), end_date=date(2020, 2, 1),
+        )
+        bot = FakeBot()
+
+        await make_pool(bot, service, executor).process(await service.claim_next())
+
+        assert bot.documents == []
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+import pytest
+
+from app.core.types import PaginationParameters
+from app.task.dal import TaskCrud
+from app.task.models import TaskStatus
+from app.task.services import task_service
+
+ASSIGNEE = 111
+
+
+async def create_tasks(project_id: int, statuses: list[TaskStatus], assignee_user_id: int = ASSIGNEE) -> None:
+    crud = TaskCrud()
+    first_code = await crud.get_next_code_for_project(project_id)
+    for code, status in enumerate(statuses, start=first_code):
+        await crud.create({
+            "project_id": project_id,
+            "name": f"Task {code}",
+            "code": code,
+            "description": "Description",
+            "deadline": datetime.now(),
+            "created_at": datetime.now(),
+            "assignee_user_id": assignee_user_id,
+            "status": status.value,
+        })
+
+
+@pytest.mark.asyncio
+class TestOpenTasks:
+    async def test_open_only_lists_leave_out_closed_tasks(self, db, company_setup):
+        project_id = company_setup["project_id"]
+        await create_tasks(project_id, [TaskStatus.DONE, TaskStatus.REVIEW, TaskStatus.CANCELED, TaskStatus.IN_PROGRESS])
+        pagination = PaginationParameters(page_size=2, order_by="id", ascending=False)
+
+        mine = await task_service.get_my_tasks(ASSIGNEE, pagination, open_only=True)
+        project = await task_service.get_tasks(project_id, pagination, open_only=True)
+        everything = await task_service.get_tasks(project_id, pagination)
+
+        assert [t.code for t in mine.data] == [5, 3]
+        assert mine.total == 3
+        assert [t.code for t in project.data] == [5, 3]
+        assert project.total == 3
+        assert everything.total == 5
+
+    async def test_status_counts_include_every_status(self, db, company_setup):
+        project_id = company_setup["project_id"]
+        await create_tasks(project_id, [TaskStatus.DONE, TaskStatus.DONE, TaskStatus.REVIEW])
+        await create_tasks(project_id, [TaskStatus.DONE], assignee_user_id=222)
+
+        assert await task_service.get_my_task_counts(ASSIGNEE) == {
+            "new": 1, "in_progress": 0, "review": 1, "done": 2, "canceled": 0,
+        }
+        assert (await task_service.get_task_counts(project_id))["done"] == 3
+
+    async def test_closed_statuses_are_inlined_for_partial_indexes(self):
+        crud = TaskCrud()
+        query = crud.apply_filters(crud.select_columns(), {"project_id": 1, "open_only": True})
+
+        sql = str(query.compile(compile_kwargs={"render_postcompile": True}))
+
+        assert "task.status NOT IN ('done', 'canceled')" in sql
@@ -0,0 +1,122 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+
+from app.core.types import PaginationParameters
+from app.task.archive import TaskArchiver
+from app.task.dal import TaskCrud
+from app.task.models import TaskStatus
+from app.task.services import task_service
+from app.task.tables import task_archive_table, task_table
+from app.time_tracking.services import time_tracking_entry_service
+from app.time_tracking.tables import (
+    project_cost_rollup_table,
+    time_tracking_entry_archive_table,
+    time_tracking_entry_table,
+)
+
+OLD = datetime.now() - timedelta(days=200)
+
+
+async def create_task(project_id: int, code: int, status: TaskStatus, created_at: datetime) -> int:
+    return await TaskCrud().create({
+        "project_id": project_id,
+        "name": f"Task {code}",
+        "code": code,
+        "description": "Description",
+        "deadline": created_at,
+        "created_at": created_at,
+        "assignee_user_id": 111,
+        "status": status.value,
+    })
+
+
+async def snapshot(db, company_id: int) -> dict:
+    start, end = date.today() - timedelta(days=365), date.today() + timedelta(days=1)
+    reports = {
+        "projects": await time_tracking_entry_service.get_project_stats_for_company(company_id),
+        "employees": await time_tracking_entry_service.get_employee_stats_for_company(company_id),
+        "minutes": await time_tracking_entry_service.get_employee_minutes_between(company_id, start, end),
+        "costs": await time_tracking_entry_service.get_project_costs_between(company_id, start, end),
+        "rollup": await db.fetch_all(select(project_cost_rollup_table)),
+    }
+    # Entries backdated to the same moment tie in the reports' ordering
+    return {name: sorted((dict(row) for row in rows), key=str) for name, rows in reports.items()}
+
+
+async def count(db, table) -> int:
+    return await db.fetch_val(select(func.count()).select_from(table))
+
+
+@pytest_asyncio.fixture
+async def archive_setup(db, company_setup):
+    """An old closed task with old entries next to an old open task and the fixture's fresh task."""
+    alice, bob = company_setup["employee_ids"]
+    closed_id = await create_task(company_setup["project_id"], 2, TaskStatus.DONE, OLD)
+    open_id = await create_task(company_setup["project_id"], 3, TaskStatus.IN_PROGRESS, OLD)
+    for task_id, employee_id, minutes in [
+        (closed_id, alice, 60), (closed_id, bob, 30), (open_id, alice, 15), (company_setup["task_id"], bob, 45)
+    ]:
+        await time_tracking_entry_service.create_time_entry(task_id, employee_id, minutes)
+    await db.execute(
+        time_tracking_entry_table.update()
+        .where(time_tracking_entry_table.c.task_id.in_([closed_id, open_id]))
+        .values(created_at=OLD)
+    )
+    await time_tracking_entry_service.rebuild_time_buckets()
+    return {**company_setup, "closed_id": closed_id, "open_id": open_id}
+
+
+@pytest.mark.asyncio
+class TestTaskArchiver:
+    async def test_only_closed_inactive_tasks_are_archived(self, db, archive_setup):
+        archived = await TaskArchiver(after_days=90, batch_size=1, batch_pause=0).archive()
+
+        assert archived == 1
+        assert await db.fetch_val(select(task_archive_table.c.id)) == archive_setup["closed_id"]
+        assert await count(db, task_table) == 2
+        assert await count(db, time_tracking_entry_archive_table) == 2
+        assert await count(db, time_tracking_entry_table) == 2
+        assert await TaskArchiver(after_days=90, batch_size=1, batch_pause=0).archive() == 0
+
+    async def test_recent_entry_keeps_closed_task_hot(self, db, archive_setup):
+        await time_tracking_entry_service.create_time_entry(
+            archive_setup["closed_id"], archive_setup["employee_ids"][0], 5
+        )
+
+        assert await TaskArchiver(after_days=90).archive() == 0
+
+    async def test_archived_task_is_read_on_request(self, db, archive_setup):
+        await TaskArchiver(after_days=90).archive()
+        project_id = archive_setup["project_id"]
+
+        hot = await task_service.get_tasks(project_id, PaginationParameters())
+        everything = await task_service.get_tasks(project_id, PaginationParameters(), include_archived=True)
+        task = await task_service.get_task_details(archive_setup["closed_id"], include_archived=True)
+
+        assert sorted(t.code for t in hot.data) == [1, 3]
+        assert sorted(t.code for t in everything.data) == [1, 2, 3]
+        assert task.status == TaskStatus.DONE.value
+
+    async def test_stats_are_unchanged_across_the_boundary(self, db, archive_setup):
+        company_id = archive_setup["company_id"]
+        before = await snapshot(db, company_id)
+
+        await TaskArchiver(after_days=90).archive()
+        assert await snapshot(db, company_id) == before
+
+        await time_tracking_entry_service.rebuild_project_rollup(company_id)
+        await time_tracking_entry_service.rebuild_time_buckets()
+        assert await snapshot(db, company_id) == before
+
+    async def test_archived_history_is_shown_on_request(self, db, archive_setup):
+        alice = archive_setup["employee_ids"][0]
+        await TaskArchiver(after_days=90).archive()
+
+        hot = await time_tracking_entry_service.get_employee_history_page(alice)
+        everything = await time_tracking_entry_service.get_employee_history_page(alice, include_archived=True)
+
+        assert [entry["duration_minutes"] for entry in hot.data] == [15]
+        assert sorted(entry["duration_minutes"] for entry in everything.data) == [15, 60]
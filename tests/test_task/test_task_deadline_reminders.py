@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta
+
+import pytest
+from aiogram.exceptions import TelegramNetworkError
+
+from app.core.serializer import DataclassSerializer
+from app.task.dal import TaskCrud, TaskRepo
+from app.task.models import Task, TaskStatus
+from app.task.services import TaskService
+from app.tg_bot.deadline_reminders import DeadlineReminderScheduler
+
+
+class FakeBot:
+    def __init__(self, failing_chat_ids=()):
+        self.messages = []
+        self.failing_chat_ids = set(failing_chat_ids)
+
+    async def send_message(self, chat_id, text, parse_mode=None):
+        if chat_id in self.failing_chat_ids:
+            raise TelegramNetworkError(None, "Connection reset")
+        self.messages.append((chat_id, text))
+
+
+def make_task(code: int, assignee_user_id: int, deadline: datetime, status: str = TaskStatus.NEW.value) -> dict:
+    return {
+        "project_id": 1,
+        "name": f"Task {code}",
+        "code": code,
+        "description": "Description",
+        "deadline": deadline,
+        "created_at": datetime.now(),
+        "assignee_user_id": assignee_user_id,
+        "status": status,
+    }
+
+
+@pytest.fixture
+def task_service():
+    return TaskService(TaskRepo(TaskCrud(), DataclassSerializer(Task)))
+
+
+@pytest.mark.asyncio
+class TestDeadlineReminders:
+    async def test_get_soon_deadlines_skips_closed_and_far_tasks(self, db):
+        crud = TaskCrud()
+        soon = datetime.now() + timedelta(hours=5)
+        await crud.create(make_task(1, 111, soon))
+        await crud.create(make_task(2, 111, soon, TaskStatus.DONE.value))
+        await crud.create(make_task(3, 111, soon, TaskStatus.CANCELED.value))
+        await crud.create(make_task(4, 111, datetime.now() + timedelta(days=30)))
+        await crud.create(make_task(5, 111, datetime.now() - timedelta(hours=1)))
+
+        tasks = await crud.get_soon_deadlines(days=1)
+
+        assert [t["code"] for t in tasks] == [1]
+
+    async def test_get_soon_deadlines_keyset_batches(self, db):
+        crud = TaskCrud()
+        soon = datetime.now() + timedelta(hours=5)
+        for code in range(1, 6):
+            await crud.create(make_task(code, 111, soon + timedelta(minutes=code % 2)))
+
+        seen = []
+        after = None
+        while True:
+            batch = await crud.get_soon_deadlines(days=1, after=after, limit=2)
+            if not batch:
+                break
+            seen.extend(t["code"] for t in batch)
+            after = (batch[-1]["deadline"], batch[-1]["id"])
+
+        assert seen == [2, 4, 1, 3, 5]
+
+    async def test_scan_groups_reminders_per_assignee(self, db, task_service):
+        crud = TaskCrud()
+        soon = datetime.now() + timedelta(hours=5)
+        await crud.create(make_task(1, 111, soon))
+        await crud.create(make_task(2, 111, soon))
+        await crud.create(make_task(3, 222, soon))
+
+        bot = FakeBot()
+        scheduler = DeadlineReminderScheduler(bot, task_service, days=1, batch_pause=0)
+        sent = await scheduler.scan()
+
+        assert sent == 2
+        assert sorted(chat_id for chat_id, _ in bot.messages) == [111, 222]
+        text_111 = next(text for chat_id, text in bot.messages if chat_id == 111)
+        assert "#1 - Task 1" in text_111 and "#2 - Task 2" in text_111
+
+    async def test_scan_does_not_repeat_reminders(self, db, task_service):
+        crud = TaskCrud()
+        soon = datetime.now() + timedelta(hours=5)
+        for code in range(1, 6):
+            await crud.create(make_task(code, 100 + code, soon))
+
+        bot = FakeBot()
+        scheduler = DeadlineReminderScheduler(bot, task_service, days=1, batch_size=2, batch_pause=0)
+
+        assert await scheduler.scan() == 5
+        assert await scheduler.scan() == 0
+        assert len(bot.messages) == 5
+
+    async def test_changed_deadline_is_reminded_again(self, db, task_service):
+        crud = TaskCrud()
+        soon = datetime.now() + timedelta(hours=5)
+        task_id = await crud.create(make_task(1, 111, soon))
+
+        bot = FakeBot()
+        scheduler = DeadlineReminderScheduler(bot, task_service, days=1, batch_pause=0)
+        await scheduler.scan()
+        await crud.patch(task_id, deadline=soon + timedelta(hours=1))
+
+        assert await scheduler.scan() == 1
+
+    async def test_failed_send_does_not_repeat_delivered_reminders(self, db, task_service):
+        crud = TaskCrud()
+        soon = datetime.now() + timedelta(hours=5)
+        await crud.create(make_task(1, 111, soon))
+        await crud.create(make_task(2, 222, soon + timedelta(minutes=1)))
+        await crud.create(make_task(3, 333, soon + timedelta(minutes=2)))
+
+        bot = FakeBot(failing_chat_ids={222})
+        scheduler = DeadlineReminderScheduler(bot, task_service, days=1, batch_pause=0)
+        assert await scheduler.scan() == 2
+
+        bot.failing_chat_ids.clear()
+        assert await scheduler.scan() == 1
+        assert [chat_id for chat_id, _ in bot.messages] == [111, 333, 222]
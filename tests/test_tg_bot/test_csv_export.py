@@ -0,0 +1,100 @@
+import csv
+import gzip
+import io
+
+import pytest
+
+from app.tg_bot.utils.csv_export import export_csv, export_csv_chunked
+
+FIELDNAMES = ["code", "name", "minutes"]
+
+
+async def make_rows(count: int):
+    for i in range(count):
+        yield {"code": f"C{i}", "name": f"Name, {i}", "minutes": i}
+
+
+def read_csv(data: bytes) -> list[dict]:
+    return list(csv.DictReader(io.StringIO(data.decode("utf-8"))))
+
+
+@pytest.mark.asyncio
+class TestExportCsv:
+    async def test_export_rows(self):
+        export = await export_csv(make_rows(3), FIELDNAMES)
+
+        rows = read_csv(export.file.read())
+        export.close()
+
+        assert export.rows == 3
+        assert rows[1] == {"code": "C1", "name": "Name, 1", "minutes": "1"}
+
+    async def test_export_empty(self):
+        export = await export_csv(make_rows(0), FIELDNAMES)
+
+        assert export.rows == 0
+        assert read_csv(export.file.read()) == []
+        export.close()
+
+    async def test_export_gzip(self):
+        export = await export_csv(make_rows(100), FIELDNAMES, compress=True)
+
+        rows = read_csv(gzip.decompress(export.file.read()))
+        export.close()
+
+        assert len(rows) == 100
+        assert export.as_input_file("stats.csv").filename == "stats.csv.gz"
+
+    async def test_large_export_spills_to_disk(self):
+        export = await export_csv(make_rows(5000), FIELDNAMES, max_memory_size=4096)
+
+        assert export.file._rolled
+        assert export.size > 4096
+        assert len(read_csv(export.file.read())) == 5000
+        export.close()
+
+    async def test_input_file_streams_chunks(self):
+        export = await export_csv(make_rows(5000), FIELDNAMES)
+        input_file = export.as_input_file("stats.csv")
+        input_file.chunk_size = 1024
+
+        chunks = [chunk async for chunk in input_file.read(None)]
+        export.close()
+
+        assert len(chunks) > 1
+        assert max(len(chunk) for chunk in chunks) <= 1024
+        assert sum(len(chunk) for chunk in chunks) == export.size
+
+
+@pytest.mark.asyncio
+class TestExportCsvChunked:
+    async def test_chunks_match_single_pass_export(self):
+        single = await export_csv(make_rows(25), FIELDNAMES)
+        progress = []
+
+        async def on_progress(rows: int):
+            progress.append(rows)
+
+        chunked = await export_csv_chunked(make_rows(25), FIELDNAMES, chunk_rows=10, on_progress=on_progress)
+
+        assert chunked.rows == 25
+        assert chunked.file.read() == single.file.read()
+        assert progress == [10, 20]
+        single.close()
+        chunked.close()
+
+    async def test_empty_export_has_header(self):
+        export = await export_csv_chunked(make_rows(0), FIELDNAMES)
+
+        assert export.rows == 0
+        assert export.file.read().decode("utf-8").strip() == "code,name,minutes"
+        export.close()
+
+    async def test_gzip_chunks_form_one_file(self):
+        export = await export_csv_chunked(make_rows(25), FIELDNAMES, compress=True, chunk_rows=10)
+
+        rows = read_csv(gzip.decompress(export.file.read()))
+        export.close()
+
+        assert len(rows) == 25
+        assert rows[24]["code"] == "C24"
@@ -0,0 +1,24 @@
+import pytest
+
+from app.tg_bot.keyboards.inline import build_employee_details_keyboard
+
+
+def button_texts(keyboard) -> list[str]:
+    return [button.text for row in keyboard.inline_keyboard for button in row]
+
+
+@pytest.mark.parametrize("is_admin, is_self, shown", [
+    (True, False, True),
+    (False, True, True),
+    (False, False, False),
+])
+def test_time_history_button(is_admin, is_self, shown):
+    keyboard = build_employee_details_keyboard(1, 2, is_admin, True, is_self=is_self)
+
+    assert ("🕒 Time History" in button_texts(keyboard)) == shown
+
+
+def test_employee_viewing_themself_gets_no_admin_buttons():
+    keyboard = build_employee_details_keyboard(1, 2, False, True, is_self=True)
+
+    assert button_texts(keyboard) == ["🕒 Time History", "◀️ Back to List"]
@@ -0,0 +1,96 @@
+import asyncio
+import os
+
+import pytest
+
+from app.tg_bot.utils.csv_export import export_csv
+from app.tg_bot.utils.export_cache import ExportCache
+
+FIELDNAMES = ["code", "minutes"]
+
+
+def builder(count: int, calls: list):
+    async def rows():
+        for i in range(count):
+            yield {"code": f"C{i}", "minutes": i}
+
+    async def build():
+        calls.append(count)
+        return await export_csv(rows(), FIELDNAMES, max_memory_size=1024)
+
+    return build
+
+
+async def read(cache: ExportCache, key, version: int, build) -> bytes:
+    export = await cache.get_or_create(key, version, build)
+    try:
+        return export.file.read()
+    finally:
+        export.close()
+
+
+@pytest.mark.asyncio
+class TestExportCache:
+    async def test_same_version_is_served_from_cache(self):
+        cache = ExportCache(max_memory_size=1024 * 1024, max_disk_size=0)
+        calls = []
+
+        first = await read(cache, ("project_stats", 1), 1, builder(10, calls))
+        second = await read(cache, ("project_stats", 1), 1, builder(10, calls))
+
+        assert first == second
+        assert calls == [10]
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.hit_rate) == (1, 1, 0.5)
+
+    async def test_new_version_rebuilds_and_replaces_entry(self):
+        cache = ExportCache(max_memory_size=1024 * 1024, max_disk_size=0)
+        calls = []
+
+        await read(cache, ("project_stats", 1), 1, builder(10, calls))
+        rebuilt = await read(cache, ("project_stats", 1), 2, builder(20, calls))
+
+        assert calls == [10, 20]
+        assert rebuilt.count(b"\n") == 21
+        assert cache.stats().memory_entries == 1
+
+    async def test_least_recently_used_entry_is_evicted(self):
+        first_size = len(await read(ExportCache(1024, 0), "probe", 1, builder(10, [])))
+        cache = ExportCache(max_memory_size=first_size * 2, max_disk_size=0)
+        calls = []
+
+        await read(cache, "a", 1, builder(10, calls))
+        await read(cache, "b", 1, builder(10, calls))
+        await read(cache, "a", 1, builder(10, calls))
+        await read(cache, "c", 1, builder(10, calls))
+        await read(cache, "a", 1, builder(10, calls))
+        await read(cache, "b", 1, builder(10, calls))
+
+        assert len(calls) == 4
+        assert cache.stats().evictions == 2
+
+    async def test_large_exports_are_kept_on_disk(self, tmp_path):
+        cache = ExportCache(
+            max_memory_size=1024, max_disk_size=1024 * 1024, max_memory_item_size=100, directory=str(tmp_path)
+        )
+        calls = []
+
+        first = await read(cache, "big", 1, builder(100, calls))
+        second = await read(cache, "big", 1, builder(100, calls))
+
+        assert first == second and calls == [100]
+        stats = cache.stats()
+        assert (stats.memory_entries, stats.disk_entries, stats.disk_size) == (0, 1, len(first))
+        assert len(os.listdir(tmp_path)) == 1
+
+        cache.close()
+        assert os.listdir(tmp_path) == []
+
+    async def test_concurrent_misses_build_once(self):
+        cache = ExportCache(max_memory_size=1024 * 1024, max_disk_size=0)
+        calls = []
+
+        results = await asyncio.gather(*(read(cache, "a", 1, builder(10, calls)) for _ in range(5)))
+
+        assert calls == [10]
+        assert len(set(results)) == 1
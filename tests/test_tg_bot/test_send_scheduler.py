@@ -0,0 +1,124 @@
+import asyncio
+import time
+
+import pytest
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import EditMessageText, SendMessage
+
+from app.tg_bot.middlewares.send_scheduler import SendScheduler
+
+
+class FakeSession(BaseSession):
+    def __init__(self, flood_errors: int = 0):
+        super().__init__()
+        self.calls = []
+        self.flood_errors = flood_errors
+
+    async def make_request(self, bot, method, timeout=None):
+        if self.flood_errors:
+            self.flood_errors -= 1
+            raise TelegramRetryAfter(method=method, message="Too Many Requests", retry_after=0.05)
+        self.calls.append((time.monotonic(), method))
+        return len(self.calls)
+
+    async def stream_content(self, url, headers=None, timeout=30, chunk_size=65536, raise_for_status=True):
+        yield b""
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def session():
+    return FakeSession()
+
+
+def make_bot(session: FakeSession, scheduler: SendScheduler) -> Bot:
+    session.middleware(scheduler)
+    return Bot("42:TEST", session=session)
+
+
+@pytest.mark.asyncio
+class TestSendScheduler:
+    async def test_per_chat_rate_limit(self, session):
+        scheduler = SendScheduler(global_rate=1000, chat_rate=20)
+        bot = make_bot(session, scheduler)
+
+        await asyncio.gather(*(bot(SendMessage(chat_id=1, text=str(i))) for i in range(4)))
+
+        times = [t for t, _ in session.calls]
+        assert len(times) == 4
+        assert times[-1] - times[0] >= 3 / 20 * 0.9
+
+    async def test_different_chats_are_not_throttled_by_each_other(self, session):
+        scheduler = SendScheduler(global_rate=1000, chat_rate=1)
+        bot = make_bot(session, scheduler)
+
+        started = time.monotonic()
+        await asyncio.gather(*(bot(SendMessage(chat_id=chat_id, text="hi")) for chat_id in range(10)))
+
+        assert len(session.calls) == 10
+        assert time.monotonic() - started < 0.5
+
+    async def test_global_rate_limit(self, session):
+        scheduler = SendScheduler(global_rate=20, chat_rate=1000)
+        bot = make_bot(session, scheduler)
+
+        await asyncio.gather(*(bot(SendMessage(chat_id=chat_id, text="hi")) for chat_id in range(25)))
+
+        times = [t for t, _ in session.calls]
+        assert times[-1] - times[0] >= 5 / 20 * 0.9
+
+    async def test_edits_to_same_message_are_coalesced(self, session):
+        scheduler = SendScheduler(global_rate=1000, chat_rate=10)
+        bot = make_bot(session, scheduler)
+
+        await bot(SendMessage(chat_id=1, text="start"))
+        results = await asyncio.gather(
+            *(bot(EditMessageText(chat_id=1, message_id=7, text=f"progress {i}")) for i in range(5))
+        )
+
+        edits = [m for _, m in session.calls if isinstance(m, EditMessageText)]
+        assert len(edits) == 1
+        assert edits[0].text == "progress 4"
+        assert len(set(results)) == 1
+        assert scheduler.stats().coalesced == 4
+
+    async def test_retry_after_is_honored(self):
+        session = FakeSession(flood_errors=2)
+        scheduler = SendScheduler(global_rate=1000, chat_rate=1000)
+        bot = make_bot(session, scheduler)
+
+        started = time.monotonic()
+        await bot(SendMessage(chat_id=1, text="hi"))
+
+        assert len(session.calls) == 1
+        assert time.monotonic() - started >= 0.09
+        assert scheduler.stats().retried == 2
+
+    async def test_retry_after_gives_up_after_max_retries(self):
+        session = FakeSession(flood_errors=5)
+        scheduler = SendScheduler(global_rate=1000, chat_rate=1000, max_retries=1)
+        bot = make_bot(session, scheduler)
+
+        with pytest.raises(TelegramRetryAfter):
+            await bot(SendMessage(chat_id=1, text="hi"))
+
+    async def test_queue_depth_metrics(self, session):
+        scheduler = SendScheduler(global_rate=1000, chat_rate=10)
+        bot = make_bot(session, scheduler)
+
+        tasks = [asyncio.create_task(bot(SendMessage(chat_id=1, text=str(i)))) for i in range(5)]
+        await asyncio.sleep(0.01)
+        stats = scheduler.stats()
+        assert stats.queued >= 3
+        assert stats.queued_per_chat[1] == stats.queued
+
+        await asyncio.gather(*tasks)
+        stats = scheduler.stats()
+        assert stats.queued == 0
+        assert stats.queued_per_chat == {}
+        assert stats.max_queued >= 4
+        assert stats.sent == 5
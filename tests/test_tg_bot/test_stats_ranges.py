@@ -0,0 +1,39 @@
+from datetime import date
+
+import pytest
+
+from app.tg_bot.utils.stats_ranges import STATS_RANGES, format_stats_range, resolve_stats_range
+
+TODAY = date(2026, 10, 21)  # Wednesday
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("all", (None, None)),
+    ("this_week", (date(2026, 10, 19), date(2026, 10, 22))),
+    ("last_week", (date(2026, 10, 12), date(2026, 10, 19))),
+    ("this_month", (date(2026, 10, 1), date(2026, 10, 22))),
+    ("last_month", (date(2026, 9, 1), date(2026, 10, 1))),
+    ("last_30_days", (date(2026, 9, 22), date(2026, 10, 22))),
+])
+def test_resolve_stats_range(name, expected):
+    assert resolve_stats_range(name, TODAY) == expected
+
+
+def test_every_listed_range_resolves():
+    for name in STATS_RANGES:
+        resolve_stats_range(name, TODAY)
+
+
+def test_last_month_crosses_year():
+    assert resolve_stats_range("last_month", date(2026, 1, 10)) == (date(2025, 12, 1), date(2026, 1, 1))
+
+
+def test_unknown_range():
+    with pytest.raises(ValueError):
+        resolve_stats_range("forever", TODAY)
+
+
+def test_format_stats_range_shows_inclusive_end():
+    assert format_stats_range(None, None) == "all time"
+    assert format_stats_range(date(2026, 9, 1), date(2026, 10, 1)) == "2026-09-01 – 2026-09-30"
+    assert format_stats_range(date(2026, 9, 1), date(2026, 10, 1), separator="_") == "2026-09-01_2026-09-30"
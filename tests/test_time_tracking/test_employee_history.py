@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.serializer import DataclassSerializer
+from app.time_tracking.dal import TimeTrackingEntryCrud, TimeTrackingEntryRepo
+from app.time_tracking.models import TimeTrackingEntry
+from app.time_tracking.services import TimeTrackingEntryService
+
+
+@pytest.fixture
+def time_tracking_entry_service():
+    repo = TimeTrackingEntryRepo(TimeTrackingEntryCrud(), DataclassSerializer(TimeTrackingEntry))
+    return TimeTrackingEntryService(repo)
+
+
+async def create_entries(service, task_id: int, employee_id: int, created_at: list[datetime]) -> list[int]:
+    ids = []
+    for minutes, at in enumerate(created_at, start=1):
+        entry = await service.create_time_entry(task_id, employee_id, minutes)
+        await TimeTrackingEntryCrud().update({"id": entry.id, "created_at": at})
+        ids.append(entry.id)
+    return ids
+
+
+@pytest.mark.asyncio
+class TestEmployeeHistory:
+    async def test_recent_entries_per_employee(self, time_tracking_entry_service, company_setup):
+        alice, bob = company_setup["employee_ids"]
+        start = datetime(2026, 10, 1, 9)
+        alice_ids = await create_entries(
+            time_tracking_entry_service, company_setup["task_id"], alice, [start + timedelta(hours=i) for i in range(4)]
+        )
+        bob_ids = await create_entries(time_tracking_entry_service, company_setup["task_id"], bob, [start])
+
+        rows = await time_tracking_entry_service.get_recent_entries_per_employee(company_setup["company_id"], limit=2)
+
+        assert [(row["employee_display_name"], row["id"]) for row in rows] == [
+            ("Alice", alice_ids[3]),
+            ("Alice", alice_ids[2]),
+            ("Bob", bob_ids[0]),
+        ]
+        assert [row["entry_rank"] for row in rows] == [1, 2, 1]
+
+    async def test_history_pages_follow_created_at_then_id(self, time_tracking_entry_service, company_setup):
+        alice = company_setup["employee_ids"][0]
+        start = datetime(2026, 10, 1, 9)
+        # Two entries share a timestamp, the id breaks the tie
+        created_at = [start, start + timedelta(hours=1), start + timedelta(hours=1), start + timedelta(hours=2), start]
+        ids = await create_entries(time_tracking_entry_service, company_setup["task_id"], alice, created_at)
+
+        pages = []
+        cursor = None
+        while True:
+            page = await time_tracking_entry_service.get_employee_history_page(alice, cursor, page_size=2)
+            pages.append([entry["id"] for entry in page.data])
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert pages == [[ids[3], ids[2]], [ids[1], ids[4]], [ids[0]]]
+
+    async def test_history_of_employee_without_entries(self, time_tracking_entry_service, company_setup):
+        page = await time_tracking_entry_service.get_employee_history_page(company_setup["employee_ids"][1])
+
+        assert page.data == []
+        assert page.next_cursor is None
+
+    async def test_rank_filter_is_pushed_into_sql(self):
+        query = TimeTrackingEntryCrud()._recent_entries_per_employee_query(1, 5)
+
+        sql = str(query.compile(compile_kwargs={"literal_binds": True}))
+
+        assert "row_number() OVER (PARTITION BY time_tracking_entry.employee_id" in sql
+        assert "ranked.entry_rank <= 5" in sql
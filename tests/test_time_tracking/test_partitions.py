@@ -0,0 +1,120 @@
+import os
+from datetime import date, datetime
+
+import pytest
+import pytest_asyncio
+from databases import Database
+
+from app.core.database import DatabaseRouter, use_database
+from app.time_tracking.partitions import (
+    DEFAULT_PARTITION,
+    TimeTrackingEntryPartitionManager,
+    add_months,
+    partition_month,
+    partition_name,
+    partitions_between,
+    plan_relations,
+)
+
+
+class TestPartitionNaming:
+    def test_add_months_crosses_years(self):
+        assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+        assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+    def test_partition_name_round_trip(self):
+        assert partition_name(date(2026, 3, 1)) == "time_tracking_entry_y2026m03"
+        assert partition_month("time_tracking_entry_y2026m03") == date(2026, 3, 1)
+        assert partition_month("time_tracking_entry_default") is None
+
+    def test_partitions_between_end_is_exclusive(self):
+        assert partitions_between(date(2026, 2, 15), date(2026, 4, 1)) == [
+            "time_tracking_entry_y2026m02",
+            "time_tracking_entry_y2026m03",
+        ]
+
+    def test_plan_relations_walks_nested_plans(self):
+        plan = {
+            "Node Type": "Hash Join",
+            "Plans": [
+                {"Node Type": "Seq Scan", "Relation Name": "time_tracking_entry_y2026m03"},
+                {"Node Type": "Hash", "Plans": [{"Node Type": "Seq Scan", "Relation Name": "employee"}]},
+            ],
+        }
+        assert plan_relations(plan) == {"time_tracking_entry_y2026m03", "employee"}
+
+
+@pytest.mark.asyncio
+class TestPartitionManagerOnSqlite:
+    async def test_maintenance_is_noop(self, db):
+        manager = TimeTrackingEntryPartitionManager(months_ahead=3, retention_months=1)
+
+        assert await manager.create_partitions() == []
+        assert await manager.detach_partitions() == []
+
+
+# A scratch PostgreSQL database the test may create and drop time_tracking_entry in
+TEST_POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+
+@pytest_asyncio.fixture
+async def postgres():
+    if not TEST_POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    database = DatabaseRouter(Database(TEST_POSTGRES_URL))
+    await database.connect()
+    await database.execute("DROP TABLE IF EXISTS time_tracking_entry CASCADE")
+    await database.execute(
+        "CREATE TABLE time_tracking_entry ("
+        "id INTEGER NOT NULL, task_id INTEGER NOT NULL, employee_id INTEGER NOT NULL, "
+        "duration_minutes INTEGER NOT NULL, created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL, "
+        "cost_cents BIGINT NOT NULL, PRIMARY KEY (id, created_at)"
+        ") PARTITION BY RANGE (created_at)"
+    )
+    await database.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF time_tracking_entry DEFAULT")
+    with use_database(database):
+        yield database
+    await database.execute("DROP TABLE IF EXISTS time_tracking_entry CASCADE")
+    await database.execute('DROP TABLE IF EXISTS "time_tracking_entry_y2026m01"')
+    await database.disconnect()
+
+
+async def add_entry(database, entry_id: int, created_at: datetime) -> None:
+    await database.execute(
+        "INSERT INTO time_tracking_entry (id, task_id, employee_id, duration_minutes, created_at, cost_cents) "
+        "VALUES (:id, 1, 1, 30, :created_at, 500)",
+        {"id": entry_id, "created_at": created_at},
+    )
+
+
+async def rows_in(database, relation: str) -> list[int]:
+    return [row[0] for row in await database.fetch_all(f'SELECT id FROM "{relation}" ORDER BY id')]
+
+
+@pytest.mark.asyncio
+class TestPartitionManagerOnPostgres:
+    async def test_creates_and_detaches_monthly_partitions(self, postgres):
+        manager = TimeTrackingEntryPartitionManager(months_ahead=1, retention_months=1)
+
+        created = await manager.create_partitions(date(2026, 1, 10))
+        await add_entry(postgres, 1, datetime(2026, 1, 15))
+        detached = await manager.detach_partitions(date(2026, 3, 5))
+
+        assert created == ["time_tracking_entry_y2026m01", "time_tracking_entry_y2026m02"]
+        assert detached == ["time_tracking_entry_y2026m01"]
+        assert sorted(await manager.get_partitions()) == [DEFAULT_PARTITION, "time_tracking_entry_y2026m02"]
+        assert await rows_in(postgres, "time_tracking_entry_y2026m01") == [1]
+
+    async def test_rows_in_the_default_partition_move_to_the_new_partition(self, postgres):
+        manager = TimeTrackingEntryPartitionManager(months_ahead=1)
+        await add_entry(postgres, 1, datetime(2026, 1, 15))
+        await add_entry(postgres, 2, datetime(2026, 2, 3))
+        await add_entry(postgres, 3, datetime(2027, 6, 1))
+
+        created = await manager.create_partitions(date(2026, 1, 10))
+
+        assert created == ["time_tracking_entry_y2026m01", "time_tracking_entry_y2026m02"]
+        assert await rows_in(postgres, "time_tracking_entry_y2026m01") == [1]
+        assert await rows_in(postgres, "time_tracking_entry_y2026m02") == [2]
+        assert await rows_in(postgres, DEFAULT_PARTITION) == [3]
+        assert await rows_in(postgres, "time_tracking_entry") == [1, 2, 3]
@@ -0,0 +1,73 @@
+from datetime import datetime
+
+import pytest
+
+from app.core.serializer import DataclassSerializer
+from app.task.dal import TaskCrud
+from app.time_tracking.dal import ProjectCostRollupCrud, TimeTrackingEntryCrud, TimeTrackingEntryRepo
+from app.time_tracking.models import TimeTrackingEntry
+from app.time_tracking.services import TimeTrackingEntryService
+from app.time_tracking.tables import project_cost_rollup_table
+
+
+@pytest.fixture
+def time_tracking_entry_service():
+    repo = TimeTrackingEntryRepo(TimeTrackingEntryCrud(), DataclassSerializer(TimeTrackingEntry))
+    return TimeTrackingEntryService(repo)
+
+
+async def get_rollup(db, project_id: int) -> dict | None:
+    row = await db.fetch_one(
+        project_cost_rollup_table.select().where(project_cost_rollup_table.c.project_id == project_id)
+    )
+    return dict(row._mapping) if row is not None else None
+
+
+@pytest.mark.asyncio
+class TestProjectCostRollup:
+    async def test_create_time_entry_updates_rollup(self, db, time_tracking_entry_service, company_setup):
+        alice, bob = company_setup["employee_ids"]
+        await time_tracking_entry_service.create_time_entry(company_setup["task_id"], alice, 60)
+        await time_tracking_entry_service.create_time_entry(company_setup["task_id"], bob, 30)
+
+        rollup = await get_rollup(db, company_setup["project_id"])
+
+        assert rollup == {
+            "project_id": company_setup["project_id"],
+            "total_minutes": 90,
+            "total_cost_cents": 7500,
+            "entry_count": 2,
+        }
+
+    async def test_delete_time_entry_updates_rollup(self, db, time_tracking_entry_service, company_setup):
+        alice, bob = company_setup["employee_ids"]
+        await time_tracking_entry_service.create_time_entry(company_setup["task_id"], alice, 60)
+        entry = await time_tracking_entry_service.create_time_entry(company_setup["task_id"], bob, 30)
+
+        await time_tracking_entry_service.delete_time_entry(entry.id)
+
+        rollup = await get_rollup(db, company_setup["project_id"])
+        assert rollup["total_minutes"] == 60
+        assert rollup["total_cost_cents"] == 6000
+        assert rollup["entry_count"] == 1
+
+    async def test_removed_task_entries_leave_no_stats(self, db, time_tracking_entry_service, company_setup):
+        alice, _ = company_setup["employee_ids"]
+        await time_tracking_entry_service.create_time_entry(company_setup["task_id"], alice, 60)
+
+        await time_tracking_entry_service.remove_task_entries_from_rollup(company_setup["task_id"])
+        await TaskCrud().delete(company_setup["task_id"])
+
+        rows = await time_tracking_entry_service.get_project_stats_for_company(company_setup["company_id"])
+        assert rows == []
+
+    async def test_rebuild_matches_incremental(self, db, time_tracking_entry_service, company_setup):
+        alice, bob = company_setup["employee_ids"]
+        await time_tracking_entry_service.create_time_entry(company_setup["task_id"], alice, 45)
+        await time_tracking_entry_service.create_time_entry(company_setup["task_id"], bob, 15)
+        incremental = await get_rollup(db, company_setup["project_id"])
+
+        await db.execute(project_cost_rollup_table.update().values(total_minutes=0, total_cost_cents=0))
+        await ProjectCostRollupCrud().rebuild(company_setup["company_id"])
+
+        assert await get_rollup(db, company_setup["project_id"]) == incremental
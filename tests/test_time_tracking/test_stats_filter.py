@@ -0,0 +1,100 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+
+from app.core.serializer import DataclassSerializer
+from app.project.dal import ProjectCrud
+from app.task.dal import TaskCrud
+from app.time_tracking.dal import TimeTrackingEntryCrud, TimeTrackingEntryRepo
+from app.time_tracking.models import StatsFilter, TimeTrackingEntry
+from app.time_tracking.services import TimeTrackingEntryService
+
+
+@pytest.fixture
+def time_tracking_entry_service():
+    repo = TimeTrackingEntryRepo(TimeTrackingEntryCrud(), DataclassSerializer(TimeTrackingEntry))
+    return TimeTrackingEntryService(repo)
+
+
+async def backdate(entry_id: int, created_at: datetime) -> None:
+    await TimeTrackingEntryCrud().update({"id": entry_id, "created_at": created_at})
+
+
+@pytest_asyncio.fixture
+async def second_task(company_setup):
+    project_id = await ProjectCrud().create({
+        "company_id": company_setup["company_id"], "name": "Other", "code": "OTH", "created_at": datetime.now()
+    })
+    return await TaskCrud().create({
+        "project_id": project_id,
+        "name": "Other task",
+        "code": 1,
+        "description": "Description",
+        "deadline": datetime.now(),
+        "created_at": datetime.now(),
+        "assignee_user_id": 111,
+    })
+
+
+@pytest.mark.asyncio
+class TestStatsFilter:
+    async def test_project_stats_limited_to_range(self, time_tracking_entry_service, company_setup):
+        alice, bob = company_setup["employee_ids"]
+        old = await time_tracking_entry_service.create_time_entry(company_setup["task_id"], alice, 60)
+        await backdate(old.id, datetime(2026, 9, 15, 12))
+        await time_tracking_entry_service.create_time_entry(company_setup["task_id"], bob, 120)
+        today = date.today()
+
+        ranged = await time_tracking_entry_service.get_project_stats_for_company(
+            company_setup["company_id"], StatsFilter(start=today, end=today + timedelta(days=1))
+        )
+        september = await time_tracking_entry_service.get_project_stats_for_company(
+            company_setup["company_id"], StatsFilter(start=date(2026, 9, 1), end=date(2026, 10, 1))
+        )
+        whole = await time_tracking_entry_service.get_project_stats_for_company(company_setup["company_id"])
+
+        assert [(row["total_hours_spent"], row["total_money_spent"]) for row in ranged] == [(2.0, 60.0)]
+        assert [(row["total_hours_spent"], row["total_money_spent"]) for row in september] == [(1.0, 60.0)]
+        assert [(row["total_hours_spent"], row["total_money_spent"]) for row in whole] == [(3.0, 120.0)]
+
+    async def test_project_filter(self, time_tracking_entry_service, company_setup, second_task):
+        alice = company_setup["employee_ids"][0]
+        await time_tracking_entry_service.create_time_entry(company_setup["task_id"], alice, 60)
+        await time_tracking_entry_service.create_time_entry(second_task, alice, 30)
+
+        rollup_rows = await time_tracking_entry_service.get_project_stats_for_company(
+            company_setup["company_id"], StatsFilter(project_ids=(company_setup["project_id"],))
+        )
+        employee_rows = await time_tracking_entry_service.get_employee_stats_for_company(
+            company_setup["company_id"], StatsFilter(project_ids=(company_setup["project_id"],))
+        )
+
+        assert [row["project_code"] for row in rollup_rows] == ["PRJ"]
+        assert [row["project_code"] for row in employee_rows] == ["PRJ"]
+
+    async def test_employee_filter(self, time_tracking_entry_service, company_setup):
+        alice, bob = company_setup["employee_ids"]
+        await time_tracking_entry_service.create_time_entry(company_setup["task_id"], alice, 60)
+        await time_tracking_entry_service.create_time_entry(company_setup["task_id"], bob, 120)
+        stats_filter = StatsFilter(employee_ids=(bob,))
+
+        employee_rows = await time_tracking_entry_service.get_employee_stats_for_company(
+            company_setup["company_id"], stats_filter
+        )
+        project_rows = await time_tracking_entry_service.get_project_stats_for_company(
+            company_setup["company_id"], stats_filter
+        )
+
+        assert [row["employee_display_name"] for row in employee_rows] == ["Bob"]
+        assert employee_rows[0]["employee_total_minutes"] == 120
+        assert [(row["total_hours_spent"], row["total_money_spent"]) for row in project_rows] == [(2.0, 60.0)]
+
+    async def test_range_is_pushed_into_sql(self):
+        crud = TimeTrackingEntryCrud()
+        stats_filter = StatsFilter(start=date(2026, 9, 1), end=date(2026, 10, 1))
+
+        for query in (crud._project_stats_query(1, stats_filter), crud._employee_stats_query(1, stats_filter)):
+            sql = str(query.compile(compile_kwargs={"literal_binds": True}))
+            assert "time_tracking_entry.created_at >= '2026-09-01 00:00:00'" in sql
+            assert "time_tracking_entry.created_at < '2026-10-01 00:00:00'" in sql
@@ -0,0 +1,118 @@
+from datetime import date, datetime
+
+import pytest
+
+from app.core.serializer import DataclassSerializer
+from app.time_tracking.dal import TimeBucketCrud, TimeTrackingEntryCrud, TimeTrackingEntryRepo
+from app.time_tracking.models import TimeTrackingEntry
+from app.time_tracking.services import TimeTrackingEntryService, calculate_cost_cents
+from app.time_tracking.tables import time_tracking_bucket_delta_table, time_tracking_daily_bucket_table
+
+
+@pytest.fixture
+def time_tracking_entry_service():
+    repo = TimeTrackingEntryRepo(TimeTrackingEntryCrud(), DataclassSerializer(TimeTrackingEntry))
+    return TimeTrackingEntryService(repo)
+
+
+async def record_entry(
+    task_id: int, employee_id: int, minutes: int, created_at: datetime, salary_per_hour: float = 60.0
+) -> int:
+    entry_id = await TimeTrackingEntryCrud().create({
+        "task_id": task_id,
+        "employee_id": employee_id,
+        "duration_minutes": minutes,
+        "created_at": created_at,
+        "cost_cents": calculate_cost_cents(minutes, salary_per_hour),
+    })
+    await TimeBucketCrud().add_entry_delta(entry_id)
+    return entry_id
+
+
+async def count_rows(db, table) -> int:
+    return len(await db.fetch_all(table.select()))
+
+
+@pytest.mark.asyncio
+class TestTimeBuckets:
+    async def test_create_time_entry_appends_delta(self, db, time_tracking_entry_service, company_setup):
+        alice, _ = company_setup["employee_ids"]
+        await time_tracking_entry_service.create_time_entry(company_setup["task_id"], alice, 30)
+
+        assert await count_rows(db, time_tracking_bucket_delta_table) == 1
+        assert await count_rows(db, time_tracking_daily_bucket_table) == 0
+
+    async def test_compact_merges_deltas_per_day(self, db, company_setup):
+        alice, _ = company_setup["employee_ids"]
+        task_id = company_setup["task_id"]
+        await record_entry(task_id, alice, 30, datetime(2026, 3, 2, 9))
+        await record_entry(task_id, alice, 60, datetime(2026, 3, 2, 17))
+        await record_entry(task_id, alice, 15, datetime(2026, 3, 3, 9))
+
+        assert await TimeBucketCrud().compact(batch_size=2) == 3
+
+        buckets = await db.fetch_all(
+            time_tracking_daily_bucket_table.select().order_by(time_tracking_daily_bucket_table.c.day)
+        )
+        assert [(b["day"], b["total_minutes"], b["total_cost_cents"], b["entry_count"]) for b in buckets] == [
+            (date(2026, 3, 2), 90, 9000, 2),
+            (date(2026, 3, 3), 15, 1500, 1),
+        ]
+        assert await count_rows(db, time_tracking_bucket_delta_table) == 0
+
+    async def test_deleted_entry_bucket_is_dropped_on_compaction(
+        self, db, time_tracking_entry_service, company_setup
+    ):
+        alice, _ = company_setup["employee_ids"]
+        entry = await time_tracking_entry_service.create_time_entry(company_setup["task_id"], alice, 30)
+        await time_tracking_entry_service.compact_time_buckets()
+
+        await time_tracking_entry_service.delete_time_entry(entry.id)
+        await time_tracking_entry_service.compact_time_buckets()
+
+        assert await count_rows(db, time_tracking_daily_bucket_table) == 0
+
+    async def test_employee_minutes_for_week(self, db, time_tracking_entry_service, company_setup):
+        alice, bob = company_setup["employee_ids"]
+        task_id = company_setup["task_id"]
+        await record_entry(task_id, alice, 30, datetime(2026, 3, 2, 9))        # Monday of week 10
+        await record_entry(task_id, alice, 45, datetime(2026, 3, 8, 23))       # Sunday of week 10
+        await record_entry(task_id, bob, 20, datetime(2026, 3, 9, 0), 30.0)    # Monday of week 11
+        await time_tracking_entry_service.compact_time_buckets()
+        await record_entry(task_id, bob, 10, datetime(2026, 3, 4, 12), 30.0)   # not compacted yet
+
+        rows = await time_tracking_entry_service.get_employee_minutes_for_week(company_setup["company_id"], 2026, 10)
+
+        assert [(r["employee_display_name"], r["total_minutes"]) for r in rows] == [("Alice", 75), ("Bob", 10)]
+
+    async def test_project_costs_for_month_match_raw_entries(self, db, time_tracking_entry_service, company_setup):
+        alice, bob = company_setup["employee_ids"]
+        task_id = company_setup["task_id"]
+        await record_entry(task_id, alice, 60, datetime(2026, 2, 28, 23, 59))
+        await record_entry(task_id, alice, 90, datetime(2026, 3, 1))
+        await record_entry(task_id, bob, 60, datetime(2026, 3, 31, 23, 59), 30.0)
+        await record_entry(task_id, bob, 60, datetime(2026, 4, 1), 30.0)
+        await time_tracking_entry_service.compact_time_buckets()
+
+        rows = await time_tracking_entry_service.get_project_costs_for_month(company_setup["company_id"], 2026, 3)
+        raw = await TimeTrackingEntryCrud().get_project_costs_from_entries(
+            company_setup["company_id"], date(2026, 3, 1), date(2026, 4, 1)
+        )
+
+        assert [dict(r._mapping) for r in rows] == [{"project_code": "PRJ", "total_minutes": 150, "total_cost_cents": 12000}]
+        assert [dict(r._mapping) for r in raw] == [dict(r._mapping) for r in rows]
+
+    async def test_rebuild_matches_compacted_buckets(self, db, company_setup):
+        alice, bob = company_setup["employee_ids"]
+        task_id = company_setup["task_id"]
+        await record_entry(task_id, alice, 30, datetime(2026, 3, 2, 9))
+        await record_entry(task_id, bob, 45, datetime(2026, 3, 2, 10), 30.0)
+        await record_entry(task_id, bob, 15, datetime(2026, 3, 5, 10), 30.0)
+        crud = TimeBucketCrud()
+        await crud.compact()
+        compacted = [dict(b._mapping) for b in await db.fetch_all(time_tracking_daily_bucket_table.select())]
+
+        await crud.rebuild()
+
+        rebuilt = [dict(b._mapping) for b in await db.fetch_all(time_tracking_daily_bucket_table.select())]
+        assert sorted(rebuilt, key=str) == sorted(compacted, key=str)
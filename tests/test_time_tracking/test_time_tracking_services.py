@@ -0,0 +1,91 @@
+from datetime import datetime
+
+import pytest
+
+from app.company.services import company_service
+from app.core.serializer import DataclassSerializer
+from app.employee.dal import EmployeeCrud
+from app.time_tracking.dal import TimeTrackingEntryCrud, TimeTrackingEntryRepo
+from app.time_tracking.models import TimeTrackingEntry
+from app.time_tracking.services import TimeTrackingEntryService, calculate_cost_cents
+
+
+@pytest.fixture
+def time_tracking_entry_service():
+    repo = TimeTrackingEntryRepo(TimeTrackingEntryCrud(), DataclassSerializer(TimeTrackingEntry))
+    return TimeTrackingEntryService(repo)
+
+
+def test_calculate_cost_cents_rounds_half_up():
+    assert calculate_cost_cents(1, 0.3) == 1
+    assert calculate_cost_cents(7, 25.5) == 298
+    assert calculate_cost_cents(0, 25.5) == 0
+
+
+@pytest.mark.asyncio
+class TestTimeTrackingEntryService:
+    async def test_create_time_entry(self, time_tracking_entry_service, company_setup):
+        entry = await time_tracking_entry_service.create_time_entry(
+            company_setup["task_id"], company_setup["employee_ids"][0], 30
+        )
+
+        assert entry.id is not None
+        assert entry.duration_minutes == 30
+
+        total = await time_tracking_entry_service.get_total_minutes_by_task_and_employee(
+            company_setup["task_id"], company_setup["employee_ids"][0]
+        )
+        assert total == 30
+
+    async def test_project_stats(self, time_tracking_entry_service, company_setup):
+        alice, bob = company_setup["employee_ids"]
+        await time_tracking_entry_service.create_time_entry(company_setup["task_id"], alice, 60)
+        await time_tracking_entry_service.create_time_entry(company_setup["task_id"], bob, 120)
+
+        rows = await time_tracking_entry_service.get_project_stats_for_company(company_setup["company_id"])
+
+        assert rows == [{
+            "company_code": "CMP",
+            "project_code": "PRJ",
+            "total_hours_spent": 3.0,
+            "total_money_spent": 120.0,
+        }]
+
+    async def test_employee_stats_stream_matches_list(self, time_tracking_entry_service, company_setup):
+        alice, bob = company_setup["employee_ids"]
+        await time_tracking_entry_service.create_time_entry(company_setup["task_id"], alice, 60)
+        await time_tracking_entry_service.create_time_entry(company_setup["task_id"], alice, 30)
+        await time_tracking_entry_service.create_time_entry(company_setup["task_id"], bob, 120)
+
+        company_id = company_setup["company_id"]
+        rows = await time_tracking_entry_service.get_employee_stats_for_company(company_id)
+        streamed = [row async for row in time_tracking_entry_service.iter_employee_stats_for_company(company_id)]
+
+        assert streamed == rows
+        assert [row["employee_display_name"] for row in rows] == ["Alice", "Alice", "Bob"]
+        assert rows[0]["employee_total_minutes"] == 90
+        assert rows[2]["salary"] == 60.0
+
+    async def test_entry_cost_is_fixed_at_insert_time(self, time_tracking_entry_service, company_setup):
+        alice, _ = company_setup["employee_ids"]
+        first = await time_tracking_entry_service.create_time_entry(company_setup["task_id"], alice, 60)
+
+        employee_crud = EmployeeCrud()
+        await employee_crud.add_salary_rate(alice, 90.0, datetime.now())
+        await employee_crud.patch(alice, salary_per_hour=90.0)
+        second = await time_tracking_entry_service.create_time_entry(company_setup["task_id"], alice, 60)
+
+        assert (first.cost_cents, second.cost_cents) == (6000, 9000)
+        rows = await time_tracking_entry_service.get_project_stats_for_company(company_setup["company_id"])
+        assert rows[0]["total_money_spent"] == 150.0
+
+    async def test_time_entry_changes_bump_company_data_version(self, time_tracking_entry_service, company_setup):
+        company_id = company_setup["company_id"]
+        entry = await time_tracking_entry_service.create_time_entry(
+            company_setup["task_id"], company_setup["employee_ids"][0], 30
+        )
+        assert await company_service.get_data_version(company_id) == 1
+
+        await time_tracking_entry_service.delete_time_entry(entry.id)
+
+        assert await company_service.get_data_version(company_id) == 2